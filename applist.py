@@ -0,0 +1,443 @@
+"""
+Lijst met apps als model/view. Elke app, instance en losse sessie is één rij in
+een QStandardItemModel met kolommen voor het statusbolletje, de naam, CPU/geheugen
+en de knoppen; tekst, kleur, lettertype en tooltip staan als data roles in de
+cellen. AppListView tekent alleen de zichtbare rijen met de standaard delegate
+en de stylesheet, zonder widgets per app.
+
+Bewust zonder Python code per getekende rij (geen eigen data(), paint() of
+sizeHint()): PySide6 6.12 op Python 3.11 verliest bij elke aanroep van een in
+Python overschreven virtual een referentie naar None, en tekenen roept die per
+rij en per role aan. Updates gaan via setItemData (een bool als resultaat) en
+alleen voor cellen die echt veranderen.
+
+Met een filter krijgen de matches uit een fuzzy.FuzzyIndex over apps en losse
+tmux sessies een rang; AppListModel (een QSortFilterProxyModel) toont alleen
+rijen met een rang, beste match eerst.
+"""
+
+from PySide6.QtCore import Qt, QSize, QSortFilterProxyModel
+from PySide6.QtGui import QColor, QFont, QStandardItemModel
+from PySide6.QtWidgets import QAbstractItemView, QApplication, QHeaderView, QTreeView
+
+from styles import ColorScheme, Icons
+import classifier
+import core
+import fuzzy
+import procfs
+import tracing
+
+ATTACH = "attach"
+KILL = "kill"
+START = "start"
+LOGS = "logs"
+
+
+class AppEntry:
+    """Status van één rij; blijft bestaan tussen verversingen.
+    
+    Een losse sessie (niet van een app) heeft als app alleen {"name": sessie};
+    stop_app en attach werken daar ook mee.
+    """
+    
+    __slots__ = ("app", "is_session", "is_active", "conflicts", "exits", "output")
+    
+    def __init__(self, app, is_session=False):
+        self.app = app
+        self.is_session = is_session
+        self.is_active = None
+        self.conflicts = None
+        self.exits = None
+        self.output = None
+    
+    @property
+    def name(self):
+        return self.app["name"]
+    
+    @property
+    def search_text(self):
+        """Tekst naast de naam waarop het filter ook matcht: de commando's."""
+        return " ".join(self.app.get("commands", []))
+    
+    def set_state(self, is_active, conflicts=None, exits=None, output=None):
+        """Neemt de status over; geeft False terug als er niets veranderd is.
+        
+        conflicts: {poort: PIDs} voor poorten die bezet zijn terwijl de app niet draait.
+        exits: {pane index: exit code} voor panes waarvan het commando gestopt is.
+        output: classifier.AppOutput met de toestand uit de pane output.
+        """
+        conflicts = conflicts or {}
+        exits = exits or {}
+        output = output or classifier.AppOutput({})
+        if (is_active, conflicts, exits, output) == (self.is_active, self.conflicts, self.exits, self.output):
+            return False
+        self.is_active = is_active
+        self.conflicts = conflicts
+        self.exits = exits
+        self.output = output
+        return True
+    
+    def indicator(self):
+        """(icoon, kleur, tooltip) van het statusbolletje."""
+        if self.exits:
+            icon = Icons.STATUS_EXITED
+            tooltip = f"Actief, commando gestopt in {core.describe_exits(self.exits)}"
+        elif self.conflicts:
+            icon = Icons.STATUS_CONFLICT
+            tooltip = "\n".join(
+                self._describe_conflict(port, pids) for port, pids in sorted(self.conflicts.items())
+            )
+        elif self.is_session:
+            icon = Icons.STATUS_ACTIVE
+            tooltip = "Losse tmux sessie (geen app)"
+        elif self.output:
+            # Zonder actieve app komt de output van de backend sessie (alleen als dependency)
+            icon = Icons.STATUS_BUILDING if self.output.state == classifier.BUILDING else Icons.STATUS_ACTIVE
+            running = "Actief" if self.is_active else "Draait als dependency"
+            tooltip = f"{running}, {self.output.label}\n{self.output.describe()}"
+        else:
+            icon = Icons.STATUS_ACTIVE if self.is_active else Icons.STATUS_INACTIVE
+            tooltip = "Actief" if self.is_active else "Niet actief"
+        
+        # Conflict gaat boven exited, exited boven de output, de output boven actief
+        if self.conflicts:
+            color = ColorScheme.STATUS_CONFLICT
+        elif self.exits:
+            color = ColorScheme.STATUS_EXITED
+        elif self.output.state == classifier.BUILDING:
+            color = ColorScheme.STATUS_BUILDING
+        elif self.output.state in (classifier.ERROR, classifier.PORT_CONFLICT):
+            color = ColorScheme.STATUS_CONFLICT
+        elif self.is_active:
+            color = ColorScheme.STATUS_ACTIVE
+        else:
+            color = ColorScheme.STATUS_INACTIVE
+        return icon, color, tooltip
+    
+    @staticmethod
+    def _describe_conflict(port, pids):
+        if not pids:
+            return f"Poort {port} bezet"
+        owners = ", ".join(f"{procfs.process_name(pid) or '?'} (PID {pid})" for pid in sorted(pids))
+        return f"Poort {port} bezet door {owners}"
+
+
+# Kolommen van een rij
+INDICATOR = 0
+NAME = 1
+METRICS = 2
+# Knoppen: verbinden of starten, stoppen, logs
+BUTTON_COLUMNS = (3, 4, 5)
+COLUMN_COUNT = 6
+
+# Actie van een knopcel ("" voor andere cellen) en de rang van een rij (kolom INDICATOR)
+ActionRole = Qt.UserRole + 1
+RankRole = Qt.UserRole + 2
+
+# Actie: (icoon, tooltip, kleur, tekengrootte in px)
+BUTTONS = {
+    ATTACH: (Icons.ATTACH, "Verbinden met sessie", ColorScheme.PRIMARY, 16),
+    KILL: (Icons.KILL, "Stop app", ColorScheme.TEXT_SECONDARY, 18),
+    START: (Icons.PLAY, "Start app", ColorScheme.SUCCESS, 16),
+    LOGS: (Icons.LOGS, "Logs bekijken", ColorScheme.TEXT_SECONDARY, 16),
+}
+
+
+def actions(entry):
+    """Actie per knopkolom (None voor een lege cel)."""
+    # Actief: verbinden en stoppen, anders starten; logs blijven na het stoppen bestaan
+    if entry.is_session:
+        return (ATTACH, KILL, None)
+    if entry.is_active:
+        return (ATTACH, KILL, LOGS)
+    return (START, None, LOGS)
+
+
+class AppListModel(QSortFilterProxyModel):
+    """De zichtbare rijen: apps en instances in configuratievolgorde, of de matches van het filter.
+    
+    De rijen zelf staan in `source` (één rij per app, instance en losse sessie);
+    dit model toont alleen rijen met een rang en sorteert daarop. Zonder filter
+    hebben alleen de apps een rang. De fuzzy index wordt pas bij de eerste
+    zoekopdracht na een wijziging van de configuratie of de sessies opgebouwd.
+    Gebruik, opstarttijden en bezette apps staan per naam in het model zelf en
+    blijven dus bewaard als rijen verdwijnen en terugkomen.
+    """
+    
+    ROW_HEIGHT = 48
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source = QStandardItemModel(0, COLUMN_COUNT, self)
+        self.setSourceModel(self.source)
+        self.setFilterKeyColumn(INDICATOR)
+        self.setFilterRole(RankRole)
+        # Rijen zonder rang ("") vallen weg
+        self.setFilterRegularExpression(".")
+        self.setSortRole(RankRole)
+        # Na een nieuwe rangorde één keer invalidate() in plaats van per rij
+        self.setDynamicSortFilter(False)
+        self.sort(INDICATOR)
+        
+        # Alle apps/instances (configuratievolgorde) en losse sessies, en {naam: entry}
+        self.apps = []
+        self.sessions = []
+        self._entries = {}
+        # {naam: rij in source}, {naam: getoonde cellen}, {naam: rang}
+        self._rows = {}
+        self._cells = {}
+        self._ranks = {}
+        self.query = ""
+        self._index = None
+        self._version = None
+        # {naam: procfs usage}, {naam: opstarttijden}, namen met een lopende operatie
+        self.usage = {}
+        self.ready_stats = {}
+        self.busy = set()
+        
+        base = QApplication.font()
+        self.name_font = QFont(base)
+        self.name_font.setPointSize(13)
+        self.name_font.setWeight(QFont.Weight.Medium)
+        self.metrics_font = QFont(base)
+        self.metrics_font.setPointSize(9)
+        self.icon_fonts = {}
+        for size in {button[3] for button in BUTTONS.values()} | {16}:
+            font = QFont(base)
+            font.setPixelSize(size)
+            font.setBold(True)
+            self.icon_fonts[size] = font
+    
+    def entry(self, name):
+        return self._entries.get(name)
+    
+    def entry_at(self, index):
+        """AppEntry van een (zichtbare) index, of None."""
+        if not index.isValid():
+            return None
+        return self._entries.get(index.siblingAtColumn(NAME).data())
+    
+    def action_at(self, index):
+        """Actie van de knop op index, of None buiten een knop."""
+        if not index.isValid() or index.column() not in BUTTON_COLUMNS:
+            return None
+        return index.data(ActionRole) or None
+    
+    def row(self, name):
+        """Zichtbare rij van een app of sessie, of None."""
+        source_row = self._rows.get(name)
+        if source_row is None:
+            return None
+        row = self.mapFromSource(self.source.index(source_row, INDICATOR)).row()
+        return row if row >= 0 else None
+    
+    def set_statuses(self, statuses, sessions=(), version=None):
+        """Neemt de status van alle apps (core.AppStatus) en de losse sessies over.
+        
+        version: versie van de configuratie; bij een andere versie of andere
+        namen is de fuzzy index verouderd. Alleen als de namen wijzigen wordt
+        source opnieuw gevuld; anders krijgen alleen de gewijzigde cellen (van
+        apps met een andere status of configuratie) nieuwe data. Geeft het
+        aantal gewijzigde apps terug.
+        """
+        names = [status.name for status in statuses]
+        sessions = list(sessions)
+        rebuild = (
+            names != [entry.name for entry in self.apps]
+            or sessions != [entry.name for entry in self.sessions]
+        )
+        if version != self._version:
+            self._version = version
+            self._index = None
+        if rebuild:
+            previous = {entry.name: entry for entry in self.apps + self.sessions}
+            self.apps = [
+                previous[status.name] if status.name in previous and not previous[status.name].is_session
+                else AppEntry(status.app)
+                for status in statuses
+            ]
+            self.sessions = [
+                previous[name] if name in previous and previous[name].is_session
+                else AppEntry({"name": name}, is_session=True)
+                for name in sessions
+            ]
+            for entry in self.sessions:
+                entry.set_state(True)
+            self._index = None
+        
+        changed = []
+        for entry, status in zip(self.apps, statuses):
+            reconfigured = entry.app != status.app
+            entry.app = status.app
+            # Actief betekent de volledige app, niet alleen de backend
+            if entry.set_state(status.is_active, status.conflicts, status.exits, status.output) or reconfigured:
+                changed.append(entry)
+        if rebuild:
+            self._rebuild()
+        else:
+            for entry in changed:
+                self._update(entry)
+        # Na de status: het filter kan op de commando's matchen
+        self._apply_filter()
+        return len(changed)
+    
+    def _rebuild(self):
+        entries = self.apps + self.sessions
+        self.source.removeRows(0, self.source.rowCount())
+        self.source.insertRows(0, len(entries))
+        self._entries = {entry.name: entry for entry in entries}
+        self._rows = {entry.name: row for row, entry in enumerate(entries)}
+        self._cells = {}
+        self._ranks = {}
+        for entry in entries:
+            self._update(entry)
+    
+    def set_filter(self, query):
+        """Toont alleen de matches van query (leeg: alle apps, zonder losse sessies)."""
+        self.query = query
+        self._apply_filter()
+    
+    def _visible(self):
+        if not self.query.strip():
+            return self.apps
+        if self._index is None:
+            candidates = self.apps + self.sessions
+            with tracing.span("fuzzy_index", entries=len(candidates)):
+                self._index = (fuzzy.FuzzyIndex([(entry.name, entry.search_text) for entry in candidates]), candidates)
+        index, candidates = self._index
+        return [candidates[position] for position in index.search(self.query)]
+    
+    def _apply_filter(self):
+        # Rang per zichtbare rij; alleen gewijzigde rangen schrijven, daarna één keer sorteren
+        ranks = {entry.name: rank for rank, entry in enumerate(self._visible())}
+        changed = False
+        for name, source_row in self._rows.items():
+            rank = ranks.get(name, "")
+            if self._ranks.get(name) != rank:
+                self._ranks[name] = rank
+                self.source.setData(self.source.index(source_row, INDICATOR), rank, RankRole)
+                changed = True
+        if changed:
+            self.invalidate()
+    
+    def set_usage(self, usage):
+        """{naam: usage} van de laatste meting; rijen zonder meting tonen niets."""
+        self.usage = usage
+        for entry in self._entries.values():
+            self._update(entry, (METRICS,))
+    
+    def set_ready_stats(self, name, stats):
+        self.ready_stats[name] = stats
+        self._changed(name, (NAME,))
+    
+    def set_busy(self, name, busy):
+        if busy:
+            self.busy.add(name)
+        else:
+            self.busy.discard(name)
+        self._changed(name, BUTTON_COLUMNS)
+    
+    def _changed(self, name, columns):
+        entry = self._entries.get(name)
+        if entry is not None:
+            self._update(entry, columns)
+    
+    def _update(self, entry, columns=range(COLUMN_COUNT)):
+        """Schrijft de cellen van een rij die anders zijn dan wat er nu staat."""
+        cells = self._cells.setdefault(entry.name, [None] * COLUMN_COUNT)
+        source_row = self._rows[entry.name]
+        for column in columns:
+            data = self._cell(entry, column)
+            if data != cells[column]:
+                cells[column] = data
+                self.source.setItemData(self.source.index(source_row, column), data)
+    
+    def _cell(self, entry, column):
+        """{role: waarde} van een cel; elke role heeft een waarde (geen None)."""
+        if column == INDICATOR:
+            icon, color, tooltip = entry.indicator()
+            return {
+                Qt.DisplayRole: icon,
+                Qt.ForegroundRole: QColor(color),
+                Qt.FontRole: self.icon_fonts[16],
+                Qt.TextAlignmentRole: Qt.AlignCenter,
+                Qt.ToolTipRole: tooltip,
+                ActionRole: "",
+                RankRole: self._ranks.get(entry.name, ""),
+            }
+        if column == NAME:
+            stats = self.ready_stats.get(entry.name)
+            return {
+                Qt.DisplayRole: entry.name,
+                Qt.ForegroundRole: QColor(ColorScheme.TEXT_SECONDARY if entry.is_session else ColorScheme.TEXT_PRIMARY),
+                Qt.FontRole: self.name_font,
+                Qt.TextAlignmentRole: Qt.AlignLeft | Qt.AlignVCenter,
+                Qt.ToolTipRole: stats.describe() if stats is not None else "",
+                Qt.SizeHintRole: QSize(0, self.ROW_HEIGHT),
+                ActionRole: "",
+            }
+        if column == METRICS:
+            usage = self.usage.get(entry.name)
+            processes = usage.processes if usage is not None else 0
+            return {
+                Qt.DisplayRole: usage.describe() if processes else "",
+                Qt.ForegroundRole: QColor(ColorScheme.TEXT_SECONDARY),
+                Qt.FontRole: self.metrics_font,
+                Qt.TextAlignmentRole: Qt.AlignRight | Qt.AlignVCenter,
+                Qt.ToolTipRole: f"{processes} {'proces' if processes == 1 else 'processen'}" if processes else "",
+                ActionRole: "",
+            }
+        action = actions(entry)[BUTTON_COLUMNS.index(column)]
+        if action is None:
+            return {Qt.DisplayRole: "", Qt.ToolTipRole: "", ActionRole: ""}
+        icon, tooltip, color, size = BUTTONS[action]
+        foreground = QColor(color)
+        if entry.name in self.busy:
+            foreground.setAlphaF(0.35)
+        return {
+            Qt.DisplayRole: icon,
+            Qt.ForegroundRole: foreground,
+            Qt.FontRole: self.icon_fonts[size],
+            Qt.TextAlignmentRole: Qt.AlignCenter,
+            Qt.ToolTipRole: tooltip,
+            ActionRole: action,
+        }
+
+
+class AppListView(QTreeView):
+    """Tabel zonder kop met uniforme rijen; hover en selectie komen uit de stylesheet."""
+    
+    INDICATOR_WIDTH = 36
+    METRICS_WIDTH = 110
+    BUTTON_WIDTH = 40
+    
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setObjectName("appsList")
+        self.setModel(model)
+        self.setHeaderHidden(True)
+        self.setRootIsDecorated(False)
+        self.setItemsExpandable(False)
+        self.setUniformRowHeights(True)
+        # Voor :hover in de stylesheet
+        self.setMouseTracking(True)
+        # Eén geselecteerde rij voor de toetsenbordnavigatie vanuit het filter
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setAllColumnsShowFocus(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QTreeView.NoFrame)
+        
+        header = self.header()
+        header.setStretchLastSection(False)
+        header.setMinimumSectionSize(0)
+        widths = {INDICATOR: self.INDICATOR_WIDTH, METRICS: self.METRICS_WIDTH}
+        widths.update((column, self.BUTTON_WIDTH) for column in BUTTON_COLUMNS)
+        for column in range(COLUMN_COUNT):
+            if column == NAME:
+                header.setSectionResizeMode(column, QHeaderView.Stretch)
+            else:
+                header.setSectionResizeMode(column, QHeaderView.Fixed)
+                header.resizeSection(column, widths[column])
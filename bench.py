@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Benchmark van de GUI: refresh_apps, start_app, kill_app en create_new_branch
+met 5, 50 en 500 geconfigureerde apps.
+
+Elke schaal draait in een eigen proces met een eigen tijdelijke omgeving:
+configuratie, state en runtime in een tijdelijke map, een eigen tmux server
+(`tmux -L`) en nep `lsof`, `git` en `gh` op PATH. Alle vier zijn kleine shims
+die elke aanroep in een logbestand zetten (`tool_calls`, ook aanroepen vanuit
+panes en hooks); de processen die het GUI-proces zelf start worden met een
+audit hook geteld (`spawns`). MainWindow draait offscreen (QT_QPA_PLATFORM=offscreen).
+    
+    python3 bench.py                          # 5, 50 en 500 apps, JSON naar stdout
+    python3 bench.py --apps 5 50 -o new.json  # andere schalen, naar een bestand
+    python3 bench.py -o new.json --compare old.json
+
+Per fase: wandkloktijd (gemiddelde, p50, max in ms) en aantal spawns per tool;
+per schaal ook het piekgeheugen (RSS) van het GUI-proces.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Eigen tmux server naast die van de gebruiker
+TMUX_SOCKET = "woddex-bench"
+
+# Poorten van de benchmark-apps: BASE_PORT + index
+BASE_PORT = 41000
+
+# Vertraging waarboven --compare een fase markeert (relatief en absoluut)
+REGRESSION = 0.2
+REGRESSION_MS = 1.0
+
+
+class BenchError(Exception):
+    """Een fase is mislukt of liep niet af binnen de timeout."""
+
+
+def write_tools(bin_dir, spawn_log, real_tmux):
+    """Shims op PATH: tmux naar de eigen server, lsof/git/gh als nep (altijd gelukt, geen output)."""
+    bin_dir.mkdir(parents=True)
+    log = shlex.quote(str(spawn_log))
+    tools = {
+        "tmux": f'exec {shlex.quote(real_tmux)} -L {TMUX_SOCKET} "$@"',
+        # Geen proces op de poort
+        "lsof": "exit 1",
+        # diff --cached --quiet: geen staged changes; de rest lukt zonder output
+        "git": "exit 0",
+        "gh": 'echo "https://github.com/bench/bench/pull/1"',
+    }
+    for name, body in tools.items():
+        path = bin_dir / name
+        path.write_text(f'#!/bin/sh\nprintf "%s\\n" "{name} $*" >> {log}\n{body}\n')
+        path.chmod(0o755)
+
+
+def write_config(config_dir, count, base_port):
+    """apps.json met `count` apps; elke app is een http server op een eigen poort."""
+    config_dir.mkdir(parents=True)
+    apps = [
+        {
+            "name": f"app{index:03d}",
+            "ports": [base_port + index],
+            "commands": [f"exec {shlex.quote(sys.executable)} -m http.server {base_port + index} --bind 127.0.0.1"],
+            "mode": "direct",
+            "ready_timeout": 20,
+        }
+        for index in range(count)
+    ]
+    (config_dir / "apps.json").write_text(json.dumps({"apps": apps}, indent=2))
+
+
+def environment(directory, real_tmux):
+    """Omgeving voor het meetproces: alles in `directory`, shims vooraan op PATH."""
+    directory = Path(directory)
+    env = dict(os.environ)
+    env.pop("TMUX", None)
+    env.update({
+        "PATH": f"{directory / 'bin'}{os.pathsep}{env.get('PATH', '')}",
+        "TMUX_TMPDIR": str(directory),
+        "XDG_CONFIG_HOME": str(directory / "config"),
+        "XDG_STATE_HOME": str(directory / "state"),
+        "XDG_RUNTIME_DIR": str(directory / "run"),
+        "QT_QPA_PLATFORM": "offscreen",
+        "WODDEX_BENCH_SPAWNS": str(directory / "spawns.log"),
+    })
+    write_tools(directory / "bin", directory / "spawns.log", real_tmux)
+    (directory / "run").mkdir(mode=0o700)
+    (directory / "project").mkdir()
+    return env
+
+
+def run_scale(count, args, real_tmux):
+    """Meet één schaal in een eigen proces en tmux server; geeft het resultaat terug."""
+    with tempfile.TemporaryDirectory(prefix="woddex-bench-") as directory:
+        env = environment(directory, real_tmux)
+        write_config(Path(directory) / "config" / "woddex-control", count, args.base_port)
+        result_path = Path(directory) / "result.json"
+        command = [
+            sys.executable, os.path.abspath(__file__), "--measure", str(count),
+            "--workdir", directory, "--sample", str(args.sample), "--repeat", str(args.repeat),
+        ]
+        try:
+            process = subprocess.run(command, env=env, capture_output=True, text=True, timeout=args.timeout)
+        except subprocess.TimeoutExpired:
+            raise BenchError(f"{count} apps: geen resultaat binnen {args.timeout} s")
+        finally:
+            subprocess.run([real_tmux, "-L", TMUX_SOCKET, "kill-server"], env=env, capture_output=True)
+        # Begin (bijv. "Fatal Python error") en einde (traceback) van de uitvoer
+        lines = process.stderr.strip().splitlines()
+        details = "\n".join(lines if len(lines) <= 20 else lines[:5] + ["..."] + lines[-15:])
+        if not result_path.exists():
+            raise BenchError(f"{count} apps: meting mislukt\n{details}")
+        result = json.loads(result_path.read_text())
+        if process.returncode != 0:
+            # De meting is compleet (result.json wordt atomair geschreven); een
+            # crash daarna komt apart in het resultaat
+            print(f"{count} apps: proces eindigde met {process.returncode} na de meting", file=sys.stderr)
+            result["exit_error"] = {"returncode": process.returncode, "stderr": details}
+        return result
+
+
+class SpawnCounter:
+    """Telt de processen die dit proces zelf start (audit event subprocess.Popen)."""
+    
+    def __init__(self):
+        self.programs = []
+        self.offset = 0
+        sys.addaudithook(self._audit)
+    
+    def _audit(self, event, args):
+        if event == "subprocess.Popen":
+            executable, argv = args[0], args[1]
+            program = executable or (argv[0] if isinstance(argv, (list, tuple)) else str(argv).split()[0])
+            self.programs.append(os.path.basename(str(program)))
+    
+    def mark(self):
+        self.offset = len(self.programs)
+    
+    def since_mark(self):
+        """{programma: aantal} voor de spawns sinds mark()."""
+        counts = {}
+        for program in self.programs[self.offset:]:
+            counts[program] = counts.get(program, 0) + 1
+        return counts
+
+
+class ToolLog:
+    """Telt de aanroepen van de shims sinds de vorige mark()."""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self.offset = 0
+    
+    def mark(self):
+        self.offset = self._size()
+    
+    def _size(self):
+        try:
+            return self.path.stat().st_size
+        except OSError:
+            return 0
+    
+    def since_mark(self):
+        """{tool: aantal} voor de aanroepen sinds mark()."""
+        counts = {}
+        try:
+            with open(self.path, "rb") as handle:
+                handle.seek(self.offset)
+                data = handle.read()
+        except OSError:
+            return counts
+        for line in data.decode("utf-8", "replace").splitlines():
+            tool = line.partition(" ")[0]
+            counts[tool] = counts.get(tool, 0) + 1
+        return counts
+
+
+def summarize(durations, spawns, tool_calls):
+    """Statistiek van een fase (ms) met de spawns en tool-aanroepen over alle runs."""
+    return {
+        "runs": len(durations),
+        "mean_ms": round(statistics.fmean(durations), 2),
+        "p50_ms": round(statistics.median(durations), 2),
+        "max_ms": round(max(durations), 2),
+        "spawns": spawns,
+        "spawns_per_run": round(sum(spawns.values()) / len(durations), 2),
+        "tool_calls": tool_calls,
+    }
+
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux geeft KB, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(count, workdir, sample, repeat):
+    """Meetproces: draait MainWindow offscreen en meet elke fase."""
+    from PySide6.QtCore import QEventLoop, QTimer
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    
+    import core
+    import main
+    from styles import Styles
+    
+    spawns = SpawnCounter()
+    tool_calls = ToolLog(os.environ["WODDEX_BENCH_SPAWNS"])
+    core.PROJECT_DIR = Path(workdir) / "project"
+    messages = []
+    
+    # Bevestigingen automatisch met Ja; meldingen worden bewaard in plaats van getoond
+    main.QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    main.QMessageBox.warning = staticmethod(lambda parent, title, text, *rest: messages.append(text))
+    main.QMessageBox.information = staticmethod(lambda parent, title, text, *rest: messages.append(text))
+    
+    application = QApplication([sys.argv[0]])
+    application.setStyle("Fusion")
+    application.setStyleSheet(Styles.get_application())
+    
+    def wait_idle(timeout=60.0):
+        # Tot alle achtergrondoperaties (en hun vervolgstappen) klaar zijn. Een
+        # eigen event loop met een timer in plaats van processEvents() in een
+        # lus: PySide6 6.12 op Python 3.11 verliest per processEvents() een
+        # referentie naar None, en de lus draait duizend keer per seconde.
+        deadline = time.monotonic() + timeout
+        loop = QEventLoop()
+        timer = QTimer()
+        timer.setInterval(1)
+        
+        def check():
+            if not window._workers or time.monotonic() > deadline:
+                loop.quit()
+        
+        timer.timeout.connect(check)
+        timer.start()
+        loop.exec()
+        timer.stop()
+        if window._workers:
+            raise BenchError(f"Operaties niet klaar binnen {timeout:.0f} s")
+        application.processEvents()
+    
+    def phase(action, runs):
+        durations = []
+        spawns.mark()
+        tool_calls.mark()
+        for run in range(runs):
+            started = time.perf_counter()
+            action(run)
+            durations.append((time.perf_counter() - started) * 1000)
+        return summarize(durations, spawns.since_mark(), tool_calls.since_mark())
+    
+    results = {"apps": count}
+    
+    def create_window(run):
+        nonlocal window
+        window = main.MainWindow()
+        window.show()
+        application.processEvents()
+    
+    window = None
+    results["startup"] = phase(create_window, 1)
+    
+    def refresh(run):
+        # refresh_apps neemt altijd een verse sessie-snapshot (geen cache)
+        window.refresh_apps()
+    
+    results["refresh_apps"] = phase(refresh, repeat)
+    
+    apps = window.core.apps[:sample]
+    
+    def start(run):
+        window.start_app(apps[run])
+        wait_idle()
+        if not window.sessions.refresh().is_active(apps[run]["name"]):
+            raise BenchError(f"'{apps[run]['name']}' is niet gestart: {messages}")
+    
+    results["start_app"] = phase(start, len(apps))
+    results["refresh_apps_active"] = phase(refresh, repeat)
+    
+    def kill(run):
+        window.kill_app(apps[run])
+        wait_idle()
+    
+    results["kill_app"] = phase(kill, len(apps))
+    
+    def create_branch(run):
+        window.new_branch_input.setText(f"bench/branch-{run}")
+        window.create_new_branch()
+        wait_idle()
+    
+    results["create_new_branch"] = phase(create_branch, 3)
+    results["peak_rss_kb"] = peak_rss_kb()
+    results["messages"] = messages
+    
+    # Atomair: result.json bestaat alleen als de meting compleet is
+    result_path = Path(workdir, "result.json")
+    result_path.with_suffix(".tmp").write_text(json.dumps(results))
+    os.replace(result_path.with_suffix(".tmp"), result_path)
+    window.tmux.close()
+    # Het afbreken van Qt hoort niet bij de meting en kan het resultaat niet meer kwijtraken
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)
+
+
+def environment_info(real_tmux):
+    def output(argv):
+        try:
+            return subprocess.run(argv, capture_output=True, text=True, check=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {
+        "commit": output(["git", "rev-parse", "--short", "HEAD"]),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "tmux": output([real_tmux, "-V"]),
+        "platform": platform.platform(),
+    }
+
+
+PHASES = (
+    "startup", "refresh_apps", "start_app", "refresh_apps_active",
+    "kill_app", "create_new_branch",
+)
+
+
+def compare(baseline, current):
+    """Tabel met de gemiddelde tijd per fase en schaal: baseline -> huidig."""
+    lines = [f"Vergelijking met {baseline.get('commit') or '?'} -> {current.get('commit') or '?'}"]
+    old_scales = {scale["apps"]: scale for scale in baseline.get("scales", [])}
+    for scale in current["scales"]:
+        old = old_scales.get(scale["apps"])
+        if old is None or "error" in old or "error" in scale:
+            continue
+        lines.append(f"{scale['apps']} apps:")
+        for name in PHASES:
+            if name not in scale or name not in old:
+                continue
+            before, after = old[name]["mean_ms"], scale[name]["mean_ms"]
+            change = (after - before) / before if before else 0.0
+            marker = "  <- trager" if change > REGRESSION and after - before > REGRESSION_MS else ""
+            lines.append(f"  {name:<22} {before:>9.1f} -> {after:>9.1f} ms  ({change:+.0%}){marker}")
+        lines.append(f"  {'peak_rss_kb':<22} {old['peak_rss_kb']:>9} -> {scale['peak_rss_kb']:>9} KB")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench.py", description="Benchmark van de GUI tegen een eigen tmux server")
+    parser.add_argument("--apps", type=int, nargs="+", default=[5, 50, 500], help="aantallen geconfigureerde apps")
+    parser.add_argument("--sample", type=int, default=5, help="aantal apps dat gestart en gestopt wordt")
+    parser.add_argument("--repeat", type=int, default=20, help="aantal runs per refresh fase")
+    parser.add_argument("--base-port", type=int, default=BASE_PORT)
+    parser.add_argument("--timeout", type=float, default=600, help="maximale duur per schaal (s)")
+    parser.add_argument("-o", "--output", help="schrijf het resultaat (JSON) naar dit bestand")
+    parser.add_argument("--compare", metavar="JSON", help="vergelijk met een eerder resultaat")
+    parser.add_argument("--measure", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.measure is not None:
+        return measure(args.measure, args.workdir, args.sample, args.repeat)
+    
+    real_tmux = shutil.which("tmux")
+    if real_tmux is None:
+        print("tmux niet gevonden", file=sys.stderr)
+        return 1
+    
+    report = environment_info(real_tmux)
+    report["scales"] = []
+    failed = False
+    for count in args.apps:
+        print(f"{count} apps...", file=sys.stderr, flush=True)
+        try:
+            report["scales"].append(run_scale(count, args, real_tmux))
+        except BenchError as e:
+            # Andere schalen wel meten; de fout komt in het resultaat
+            print(e, file=sys.stderr)
+            report["scales"].append({"apps": count, "error": str(e)})
+            failed = True
+    
+    data = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(data + "\n")
+    else:
+        print(data)
+    if args.compare:
+        print(compare(json.loads(Path(args.compare).read_text()), report), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Toestand van een app afgeleid uit de output van zijn panes.
+De pipe-pane schrijver (panelogs.py) voert elke chunk output door een
+OutputClassifier: één voorgecompileerde regex met een groep per toestand,
+direct op bytes. Bij een wijziging wordt de toestand naast het log bewaard
+(pane-<n>.state) zodat GUI en CLI hem kunnen lezen zonder zelf output te scannen.
+
+Een regex met veel alternatieven probeert op elke positie in de output elk
+alternatief; daarom zoekt de classifier eerst met bytes.find naar het vaste
+begin van de patronen (ANCHORS) en draait de regex alleen op die regels.
+"""
+
+import json
+import os
+import re
+import time
+
+BUILDING = "building"
+READY = "ready"
+ERROR = "error"
+PORT_CONFLICT = "port-conflict"
+
+# Zwaarste toestand eerst: één pane met een fout maakt de hele app "error"
+PRIORITY = (PORT_CONFLICT, ERROR, BUILDING, READY)
+
+# Patronen per toestand (nx serve, Angular CLI, webpack, tsc -w, NestJS, Vite)
+PATTERNS = {
+    "port_conflict": rb"EADDRINUSE|address already in use|Port \d+ is already in use",
+    "error": rb"error TS\d+|ERROR in |Failed to compile|Found [1-9]\d* errors?\b",
+    "ready": (
+        rb"compiled successfully|Found 0 errors|listening on|"
+        rb"application successfully started|Local:\s+https?://"
+    ),
+    "building": (
+        rb"Compiling|File change detected|Changes detected|Starting compilation|"
+        rb"Generating browser application bundles|Building\.\.\."
+    ),
+}
+STATES = {"port_conflict": PORT_CONFLICT, "error": ERROR, "ready": READY, "building": BUILDING}
+
+MATCHER = re.compile(
+    b"|".join(b"(?P<%s>%s)" % (name.encode(), pattern) for name, pattern in PATTERNS.items()),
+    re.IGNORECASE,
+)
+
+
+def _anchors(patterns):
+    # Vast begin van elk alternatief (tot het eerste regex-teken), in kleine letters
+    anchors = set()
+    for pattern in patterns:
+        for alternative in pattern.split(b"|"):
+            anchors.add(re.split(rb"[\\\[(.?*+{]", alternative, maxsplit=1)[0].lower())
+    if b"" in anchors:
+        raise ValueError("Elk patroon moet met een vaste tekst beginnen")
+    return tuple(sorted(anchors))
+
+
+ANCHORS = _anchors(PATTERNS.values())
+
+# Door de tool zelf gemelde duur: "compiled successfully in 2345 ms", "Time: 1234ms"
+DURATION = re.compile(rb"(?:\bin|Time:)\s*(\d+(?:\.\d+)?)\s*(ms|s)\b", re.IGNORECASE)
+
+ANSI = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+
+# Zoveel van een onvolledige laatste regel wordt bewaard tot de volgende chunk
+MAX_CARRY = 4096
+
+# Aantal bewaarde builds per pane
+MAX_BUILDS = 20
+
+
+class OutputClassifier:
+    """Volgt de toestand van één pane uit zijn output.
+    
+    feed() werkt op hele regels (een onvolledige laatste regel wacht op de
+    volgende chunk) en geeft True terug als de toestand of de builds veranderd zijn.
+    """
+    
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.state = None
+        self.since = None
+        self.detail = ""
+        self.build_started = None
+        # [duur in ms, gelukt] per afgeronde build, oudste eerst
+        self.builds = []
+        self._carry = b""
+    
+    def feed(self, data):
+        data = self._carry + data
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._carry = data[-MAX_CARRY:]
+            return False
+        self._carry = data[end + 1:][-MAX_CARRY:]
+        chunk = ANSI.sub(b"", data[:end + 1])
+        changed = False
+        for start in self._candidate_lines(chunk):
+            line = chunk[start:chunk.index(b"\n", start)]
+            for match in MATCHER.finditer(line):
+                changed |= self._event(STATES[match.lastgroup], line.strip())
+        return changed
+    
+    @staticmethod
+    def _candidate_lines(chunk):
+        """Begin van elke regel met een anchor, in volgorde (chunk eindigt op een newline)."""
+        lowered = chunk.lower()
+        starts = set()
+        for anchor in ANCHORS:
+            position = lowered.find(anchor)
+            while position >= 0:
+                starts.add(lowered.rfind(b"\n", 0, position) + 1)
+                position = lowered.find(anchor, lowered.index(b"\n", position) + 1)
+        return sorted(starts)
+    
+    def _event(self, state, line):
+        now = self.clock()
+        if state == BUILDING:
+            if self.state == BUILDING:
+                return False
+            self.build_started = now
+        elif state in (READY, ERROR) and self.build_started is not None:
+            self.builds.append([self._duration(line, now), state == READY])
+            del self.builds[:-MAX_BUILDS]
+            self.build_started = None
+        elif state == self.state:
+            return False
+        self.state = state
+        self.since = now
+        self.detail = line.decode("utf-8", "replace")[:200]
+        return True
+    
+    def _duration(self, line, now):
+        reported = DURATION.search(line)
+        if reported:
+            value = float(reported.group(1))
+            return round(value if reported.group(2).lower() == b"ms" else value * 1000)
+        return round((now - self.build_started) * 1000)
+    
+    def snapshot(self):
+        return {
+            "state": self.state,
+            "since": self.since,
+            "detail": self.detail,
+            "building_since": self.build_started,
+            "builds": self.builds,
+        }
+
+
+def state_path(log_path):
+    """pane-0.log -> pane-0.state"""
+    return log_path[:-4] + ".state" if log_path.endswith(".log") else log_path + ".state"
+
+
+def write_state(path, state):
+    """Schrijft de toestand atomair (tijdelijk bestand + rename)."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as handle:
+        json.dump(state, handle)
+    os.replace(temporary, path)
+
+
+def read_state(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+class AppOutput:
+    """Gecombineerde toestand van de panes van een app."""
+    
+    LABELS = {
+        BUILDING: "bouwen",
+        READY: "klaar",
+        ERROR: "fout",
+        PORT_CONFLICT: "poort bezet",
+    }
+    
+    def __init__(self, pane_states):
+        # {pane index: toestand (dict uit read_state)}
+        self.panes = {index: state for index, state in pane_states.items() if state and state.get("state")}
+        states = {state["state"] for state in self.panes.values()}
+        self.state = next((state for state in PRIORITY if state in states), None)
+    
+    def __eq__(self, other):
+        return isinstance(other, AppOutput) and self.panes == other.panes
+    
+    def __bool__(self):
+        return self.state is not None
+    
+    @property
+    def label(self):
+        return self.LABELS.get(self.state, "")
+    
+    def builds(self):
+        """Duur (ms) van alle bewaarde builds van de panes, oudste eerst."""
+        builds = [build for state in self.panes.values() for build in state.get("builds", [])]
+        return [duration for duration, _ in builds]
+    
+    def describe(self, now=None):
+        """Tooltip: toestand per pane plus de laatste buildduur."""
+        now = now or time.time()
+        lines = []
+        for index, state in sorted(self.panes.items()):
+            label = self.LABELS.get(state["state"], state["state"])
+            if state["state"] == BUILDING and state.get("building_since"):
+                label += f" ({now - state['building_since']:.0f} s)"
+            elif state["state"] in (ERROR, PORT_CONFLICT) and state.get("detail"):
+                label += f": {state['detail']}"
+            builds = state.get("builds") or []
+            if builds and state["state"] != BUILDING:
+                duration, ok = builds[-1]
+                label += f" · laatste build {duration / 1000:.1f} s{'' if ok else ' (mislukt)'}"
+            lines.append(f"pane {index}: {label}")
+        return "\n".join(lines)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Command line voor woddex-control, zonder Qt (bijv. voor Hyprland keybinds).
+    
+    woddex-control status [--json]
+    woddex-control start <app> [<app> ...] [--wait] [--worktree <branch|map>] [--instance <naam>]
+    woddex-control start <sessie> -c <commando> [-c <commando> ...]
+    woddex-control stop <app|sessie> [--ports <poort> ...]
+    woddex-control attach <app|sessie>
+    woddex-control logs <app|sessie> [--pane <n>] [-f]
+    woddex-control config
+    woddex-control plan <app> [--dependency] [--worktree <branch|map>]
+    woddex-control worktrees
+    woddex-control --trace <bestand> <commando> ...   (Chrome trace van het commando)
+
+Installeren als commando: ln -s "$PWD/cli.py" ~/.local/bin/woddex-control
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import commandlog
+import config
+import core
+import deps
+import panelogs
+import tracing
+
+
+def print_progress(message):
+    print(message, file=sys.stderr)
+
+
+def cmd_status(controller, args):
+    statuses = controller.status()
+    if args.json:
+        print(json.dumps([
+            {
+                "name": status.name,
+                "instance_of": status.app.get("instance_of"),
+                "state": status.describe(),
+                "ports": status.app.get("ports", []),
+                "conflicts": {str(port): sorted(pids) for port, pids in status.conflicts.items()},
+                "exited": {str(index): code for index, code in status.exits.items()},
+                "output": status.output.state,
+                "builds": status.output.builds(),
+            }
+            for status in statuses
+        ], indent=2))
+        return 0
+    
+    width = max((len(status.name) for status in statuses), default=0)
+    for status in statuses:
+        ports = ", ".join(str(port) for port in status.app.get("ports", []))
+        line = f"{status.name:<{width}}  {status.describe():<13}  {ports}"
+        if status.conflicts:
+            occupied = ", ".join(str(port) for port in sorted(status.conflicts))
+            line += f"  (bezet: {occupied})"
+        if status.exits:
+            line += f"  (gestopt: {status.describe_exits()})"
+        if status.output:
+            line += f"  ({status.output.label})"
+        print(line)
+    return 0
+
+
+def cmd_start(controller, args):
+    if args.command:
+        # Losse sessie zonder configuratie (zoals scripts/tmux-create.sh)
+        if len(args.names) != 1:
+            raise core.OperationError("Met -c kan maar één sessie gestart worden")
+        session_name = args.names[0]
+        if controller.is_session_active(session_name):
+            raise core.OperationError(f"Sessie '{session_name}' bestaat al")
+        ok, error = controller.create_session(session_name, args.command)
+        if not ok:
+            raise core.OperationError(f"Kon sessie '{session_name}' niet starten:\n{error}")
+        print(f"Sessie '{session_name}' gestart")
+        return 0
+    
+    for name in args.names:
+        app = controller.find_app(name)
+        if app is None:
+            raise core.OperationError(f"Onbekende app '{name}'")
+        if not app.get("commands"):
+            raise core.OperationError(f"Geen commando's geconfigureerd voor '{name}'")
+    
+    worktree = controller.find_worktree(args.worktree) if args.worktree else None
+    layers = controller.start_layers(args.names)
+    pending = controller.start_apps(layers, set(args.names), worktree, args.instance, progress=print_progress)
+    print(f"Gestart: {', '.join(pending) or ', '.join(args.names)}" + (f" vanuit {worktree}" if worktree else ""))
+    
+    if args.wait and pending:
+        results = controller.wait_ready(list(pending), pending, progress=print_progress)
+        not_ready = [name for name, result in results.items() if not result.ready]
+        for name, result in results.items():
+            if result.ready:
+                print(f"'{name}' klaar na {result.ready_at - pending[name][0]:.1f} s")
+            else:
+                ports = ", ".join(str(port) for port in result.pending)
+                print(f"'{name}' luistert niet op {ports}", file=sys.stderr)
+        if not_ready:
+            return 1
+    return 0
+
+
+def cmd_stop(controller, args):
+    app = controller.find_app(args.name) or controller.instance_app(args.name)
+    if app is None:
+        # Losse sessie (zoals scripts/tmux-kill.sh), optioneel met poorten
+        if not controller.is_session_active(args.name):
+            raise core.OperationError(f"Sessie '{args.name}' bestaat niet")
+        app = {"name": args.name, "ports": args.ports}
+    result = controller.stop_app(app, progress=print_progress)
+    print(f"'{args.name}' gestopt: {result.summary()}")
+    return 0
+
+
+def cmd_attach(controller, args):
+    session_name = args.name
+    if not controller.is_session_active(session_name):
+        raise core.OperationError(f"Sessie '{session_name}' bestaat niet")
+    
+    # Exacte target: "-t name" matcht ook sessies die met name beginnen
+    target = f"={session_name}:"
+    if os.environ.get("TMUX"):
+        # Al in tmux: wissel de huidige client van sessie
+        return commandlog.run(["tmux", "switch-client", "-t", target], check=False).returncode
+    if sys.stdin.isatty() and sys.stdout.isatty():
+        # In een terminal: attach direct in deze terminal
+        controller.close()
+        os.execvp("tmux", ["tmux", "attach-session", "-t", target])
+    # Zonder terminal (keybind): open een terminal emulator
+    controller.open_terminal(session_name)
+    return 0
+
+
+def cmd_logs(controller, args):
+    logs = controller.pane_logs(args.name)
+    if args.pane is not None:
+        logs = [(label, path) for label, path in logs if label.endswith(f"pane-{args.pane}")][:1]
+    if not logs:
+        raise core.OperationError(f"Geen logs voor '{args.name}'")
+    
+    tails = [(label, panelogs.LogTail(path)) for label, path in logs]
+    output = sys.stdout.buffer
+    try:
+        while True:
+            for label, tail in tails:
+                data = tail.read_new()
+                if data:
+                    if len(tails) > 1:
+                        output.write(f"\n==> {label} <==\n".encode())
+                    output.write(data)
+            output.flush()
+            if not args.follow:
+                return 0
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        return 0
+
+
+def cmd_config(controller, args):
+    path = controller.loader.current_path()
+    if path is None:
+        path = f"ingebouwde apps (geen {config.config_dir() / config.FILENAMES[0]})"
+    print(f"Configuratie: {path}")
+    print(f"{len(controller.apps)} apps: {', '.join(app['name'] for app in controller.apps)}")
+    return 0
+
+
+def cmd_plan(controller, args):
+    session_name = core.backend_session(args.name) if args.dependency else args.name
+    worktree = controller.find_worktree(args.worktree) if args.worktree else None
+    print(controller.plan(args.name, session_name, worktree).script(), end="")
+    return 0
+
+
+def cmd_worktrees(controller, args):
+    for worktree in controller.worktrees():
+        print(worktree.describe() + ("  (hoofdmap)" if worktree.is_main else ""))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="woddex-control",
+        description="Start, stop en bekijk de tmux sessies van de geconfigureerde apps.",
+    )
+    parser.add_argument(
+        "--trace", metavar="bestand",
+        help="schrijf de spans van het commando als Chrome trace (JSON) naar dit bestand",
+    )
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    
+    status_parser = subparsers.add_parser("status", help="status van alle apps")
+    status_parser.add_argument("--json", action="store_true", help="output als JSON")
+    status_parser.set_defaults(handler=cmd_status)
+    
+    start_parser = subparsers.add_parser("start", help="start apps inclusief dependencies")
+    start_parser.add_argument("names", nargs="+", metavar="app")
+    start_parser.add_argument("--wait", action="store_true", help="wacht tot de poorten luisteren")
+    start_parser.add_argument(
+        "--worktree", metavar="branch",
+        help="start vanuit de git worktree van deze branch (of map)",
+    )
+    start_parser.add_argument(
+        "--instance", metavar="naam",
+        help="start als extra instance (<app>@<naam>) met eigen poorten; standaard bij --worktree",
+    )
+    start_parser.add_argument(
+        "-c", "--command", action="append",
+        help="start een losse sessie met dit commando (per pane één -c)",
+    )
+    start_parser.set_defaults(handler=cmd_start)
+    
+    stop_parser = subparsers.add_parser("stop", help="stop een app of sessie met alle processen")
+    stop_parser.add_argument("name", metavar="app")
+    stop_parser.add_argument(
+        "--ports", nargs="+", type=int, default=[],
+        help="poorten van een losse sessie die ook vrijgemaakt worden",
+    )
+    stop_parser.set_defaults(handler=cmd_stop)
+    
+    attach_parser = subparsers.add_parser("attach", help="verbind met de sessie van een app")
+    attach_parser.add_argument("name", metavar="app")
+    attach_parser.set_defaults(handler=cmd_attach)
+    
+    logs_parser = subparsers.add_parser("logs", help="toon de pane logs van een app (ook na het stoppen)")
+    logs_parser.add_argument("name", metavar="app")
+    logs_parser.add_argument("--pane", type=int, help="alleen deze pane (index)")
+    logs_parser.add_argument("-f", "--follow", action="store_true", help="blijf nieuwe output tonen")
+    logs_parser.set_defaults(handler=cmd_logs)
+    
+    config_parser = subparsers.add_parser("config", help="toon en valideer het configuratiebestand")
+    config_parser.set_defaults(handler=cmd_config)
+    
+    plan_parser = subparsers.add_parser("plan", help="toon het launch plan van een app als tmux script")
+    plan_parser.add_argument("name", metavar="app")
+    plan_parser.add_argument("--dependency", action="store_true", help="plan voor de <app>-backend sessie")
+    plan_parser.add_argument("--worktree", metavar="branch", help="plan vanuit de git worktree van deze branch")
+    plan_parser.set_defaults(handler=cmd_plan)
+    
+    worktrees_parser = subparsers.add_parser("worktrees", help="toon de git worktrees van het project")
+    worktrees_parser.set_defaults(handler=cmd_worktrees)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    controller = core.Controller()
+    if controller.config_error:
+        print(f"Fout: {controller.config_error}", file=sys.stderr)
+        return 1
+    try:
+        with tracing.span(args.action, "cli"):
+            return args.handler(controller, args)
+    except (core.OperationError, deps.DependencyError) as e:
+        print(f"Fout: {e}", file=sys.stderr)
+        return 1
+    finally:
+        controller.close()
+        if args.trace:
+            write_trace(args.trace)
+
+
+def write_trace(path):
+    try:
+        with open(path, "w") as handle:
+            json.dump(tracing.TRACER.chrome_trace(), handle)
+    except OSError as e:
+        print(f"Fout: kon trace niet schrijven: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
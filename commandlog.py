@@ -0,0 +1,263 @@
+"""
+Eén plek waarlangs externe commando's gestart worden.
+run() en popen() vervangen subprocess.run/Popen en leggen per aanroep argv,
+duur, exit code en de operatie vast die het commando startte (zie operation()).
+Commando's over de tmux control-mode verbinding worden ook geteld (via
+"control") zodat zichtbaar is hoeveel forks caching en batching besparen. Het
+debug paneel in de GUI (Ctrl+Shift+D) en export() lezen de statistiek. Elke
+spawn is ook een span (zie tracing.py).
+"""
+
+import contextlib
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+
+import tracing
+
+SPAWN = "spawn"
+CONTROL = "control"
+
+# Exit code van een commando dat niet gestart kon worden (OSError)
+NOT_STARTED = -1
+
+# Bovengrenzen (ms) van de histogram-buckets; de laatste bucket is alles daarboven
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Aantal bewaarde losse aanroepen; de statistiek per soort telt alles
+MAX_RECORDS = 1000
+
+# Tools waarvan het subcommando bij de soort hoort ("git diff", "tmux list-panes")
+SUBCOMMAND_TOOLS = ("git", "gh", "tmux")
+
+
+def command_type(argv, via=SPAWN):
+    """Soort van een commando voor de statistiek: "git diff", "lsof", "tmux list-panes"."""
+    if via == CONTROL:
+        return f"tmux {argv[0]}" if argv else "tmux"
+    tool = os.path.basename(str(argv[0])) if argv else "?"
+    if tool in SUBCOMMAND_TOOLS:
+        subcommand = next((str(arg) for arg in argv[1:] if not str(arg).startswith("-")), None)
+        # `tmux -C ...` is de control-mode verbinding zelf
+        if tool == "tmux" and "-C" in argv[1:2]:
+            return "tmux -C"
+        if subcommand:
+            return f"{tool} {subcommand}"
+    return tool
+
+
+class Record:
+    """Eén uitgevoerd commando."""
+    
+    __slots__ = ("argv", "via", "operation", "started", "duration", "exit_code")
+    
+    def __init__(self, argv, via, operation, started, duration, exit_code):
+        self.argv = argv
+        self.via = via
+        self.operation = operation
+        # Wandkloktijd van de start (time.time) en duur in seconden
+        self.started = started
+        self.duration = duration
+        # None: loopt nog (popen); NOT_STARTED: kon niet gestart worden
+        self.exit_code = exit_code
+    
+    @property
+    def kind(self):
+        return command_type(self.argv, self.via)
+    
+    def to_dict(self):
+        return {
+            "argv": self.argv,
+            "via": self.via,
+            "type": self.kind,
+            "operation": self.operation,
+            "started": round(self.started, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            "exit_code": self.exit_code,
+        }
+
+
+class Stats:
+    """Aantal, fouten en latency-histogram van één soort commando."""
+    
+    __slots__ = ("count", "errors", "total", "max", "buckets")
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+    
+    def add(self, duration_ms, ok):
+        self.count += 1
+        self.errors += not ok
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        index = next((i for i, bound in enumerate(BUCKETS) if duration_ms <= bound), len(BUCKETS))
+        self.buckets[index] += 1
+    
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, fraction):
+        """Bovengrens (ms) van de bucket waarin het percentiel valt (None boven de laatste grens)."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return BUCKETS[index] if index < len(BUCKETS) else None
+        return None
+    
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in BUCKETS] + [f">{BUCKETS[-1]}ms"]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.mean, 3),
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+class CommandLog:
+    """Thread-safe boekhouding van alle uitgevoerde commando's."""
+    
+    def __init__(self, max_records=MAX_RECORDS):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.records = deque(maxlen=max_records)
+        # {(via, soort): Stats}
+        self.stats = {}
+        self.since = time.time()
+    
+    @contextlib.contextmanager
+    def operation(self, name):
+        """Commando's binnen dit blok (op deze thread) horen bij operatie `name`."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        try:
+            yield
+        finally:
+            stack.pop()
+    
+    def current_operation(self):
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else threading.current_thread().name
+    
+    def record(self, argv, via, started, duration, exit_code):
+        record = Record([str(arg) for arg in argv], via, self.current_operation(), started, duration, exit_code)
+        # popen() kent de exit code nog niet; dan telt alleen een gefaalde start als fout
+        ok = exit_code in (0, None)
+        with self._lock:
+            self.records.append(record)
+            key = (via, record.kind)
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = Stats()
+            stats.add(duration * 1000, ok)
+        return record
+    
+    def reset(self):
+        with self._lock:
+            self.records.clear()
+            self.stats = {}
+            self.since = time.time()
+    
+    def summary(self):
+        """[(via, soort, Stats)] gesorteerd op totale tijd (duurste eerst)."""
+        with self._lock:
+            items = [(via, kind, stats) for (via, kind), stats in self.stats.items()]
+        return sorted(items, key=lambda item: item[2].total, reverse=True)
+    
+    def recent(self, limit=None):
+        with self._lock:
+            records = list(self.records)
+        return records[-limit:] if limit else records
+    
+    def totals(self):
+        """{via: aantal} over alle soorten."""
+        totals = {}
+        for via, _, stats in self.summary():
+            totals[via] = totals.get(via, 0) + stats.count
+        return totals
+    
+    def export(self):
+        """Alles als dict (voor JSON): statistiek per soort, per operatie en de recente aanroepen."""
+        records = self.recent()
+        operations = {}
+        for record in records:
+            counts = operations.setdefault(record.operation, {})
+            counts[record.via] = counts.get(record.via, 0) + 1
+        return {
+            "since": round(self.since, 3),
+            "exported": round(time.time(), 3),
+            "buckets_ms": list(BUCKETS),
+            "commands": [
+                {"via": via, "type": kind, **stats.to_dict()}
+                for via, kind, stats in self.summary()
+            ],
+            "operations": operations,
+            "recent": [record.to_dict() for record in records],
+        }
+
+
+LOG = CommandLog()
+
+
+def operation(name):
+    """Contextmanager (of decorator) die commando's aan een operatie koppelt."""
+    return LOG.operation(name)
+
+
+def bind(fn):
+    """fn met de operatie van de aanroeper, voor uitvoering op een andere thread (executor)."""
+    name = LOG.current_operation()
+    
+    def bound(*args, **kwargs):
+        with LOG.operation(name):
+            return fn(*args, **kwargs)
+    return bound
+
+
+def run(argv, **kwargs):
+    """subprocess.run met boekhouding; zelfde argumenten en resultaat."""
+    started = time.time()
+    start = time.perf_counter()
+    with tracing.span(command_type(argv), "command"):
+        try:
+            result = subprocess.run(argv, **kwargs)
+        except (OSError, subprocess.SubprocessError):
+            LOG.record(argv, SPAWN, started, time.perf_counter() - start, NOT_STARTED)
+            raise
+    LOG.record(argv, SPAWN, started, time.perf_counter() - start, result.returncode)
+    return result
+
+
+def popen(argv, **kwargs):
+    """subprocess.Popen met boekhouding van de start (het proces loopt door)."""
+    started = time.time()
+    start = time.perf_counter()
+    with tracing.span(command_type(argv), "command"):
+        try:
+            process = subprocess.Popen(argv, **kwargs)
+        except OSError:
+            LOG.record(argv, SPAWN, started, time.perf_counter() - start, NOT_STARTED)
+            raise
+    LOG.record(argv, SPAWN, started, time.perf_counter() - start, None)
+    return process
+
+
+def record_control(commands, results, started, duration):
+    """Commando's over de control-mode verbinding (duur: round-trip van de batch)."""
+    for args, result in zip(commands, results):
+        LOG.record(args, CONTROL, started, duration, 0 if result.ok else 1)
@@ -0,0 +1,226 @@
+"""
+App-configuratie uit de gebruikersconfiguratie.
+$XDG_CONFIG_HOME/woddex-control/apps.toml (of apps.json) bevat de apps met hun
+poorten, commando's en dependencies. Zonder bestand worden de ingebouwde apps
+gebruikt. Het bestand wordt één keer gevalideerd bij het laden in plaats van
+pas bij het starten van een app.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import deps
+import instances
+from plans import LaunchPlan
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+FILENAMES = ("apps.toml", "apps.json")
+
+# Toegestane velden per app met hun type(s)
+FIELDS = {
+    "name": str,
+    "ports": list,
+    "commands": list,
+    "depends_on": (str, list),
+    "probe": str,
+    "ready_timeout": (int, float),
+    "env": dict,
+    "layout": str,
+    "mode": str,
+    "remain_on_exit": bool,
+}
+
+# Soorten readiness probes (zie readiness.PROBES; niet geïmporteerd vanwege asyncio)
+PROBE_KINDS = ("tcp", "http")
+
+
+class ConfigError(Exception):
+    """Configuratiebestand kan niet gelezen worden of is ongeldig."""
+    
+    def __init__(self, path, problems):
+        self.path = path
+        self.problems = list(problems)
+        details = "\n".join(f"- {problem}" for problem in self.problems)
+        super().__init__(f"Ongeldige configuratie {path}:\n{details}")
+
+
+def config_dir():
+    """$XDG_CONFIG_HOME/woddex-control (standaard ~/.config/woddex-control)."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(config_home) / "woddex-control"
+
+
+def find_path(directory=None):
+    """Eerste bestaande configuratiebestand (apps.toml gaat voor apps.json), of None."""
+    directory = Path(directory) if directory else config_dir()
+    for filename in FILENAMES:
+        path = directory / filename
+        if path.is_file():
+            return path
+    return None
+
+
+def parse(data, path):
+    """Parse de inhoud van een TOML of JSON bestand naar een lijst met apps."""
+    path = Path(path)
+    try:
+        if path.suffix == ".toml":
+            if tomllib is None:
+                raise ConfigError(path, ["TOML vereist Python 3.11 of het pakket tomli"])
+            document = tomllib.loads(data.decode("utf-8"))
+        else:
+            document = json.loads(data.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError) as e:
+        # tomllib.TOMLDecodeError en json.JSONDecodeError zijn ValueErrors
+        raise ConfigError(path, [str(e)])
+    
+    # {"apps": [...]} of (JSON) direct een lijst
+    apps = document.get("apps") if isinstance(document, dict) else document
+    if not isinstance(apps, list):
+        raise ConfigError(path, ["Verwacht een lijst 'apps' ([[apps]] in TOML)"])
+    return apps
+
+
+def validate(apps):
+    """Controleert de apps tegen het schema; geeft een lijst met problemen terug."""
+    problems = []
+    names = set()
+    port_owners = {}
+    for index, app in enumerate(apps):
+        if not isinstance(app, dict):
+            problems.append(f"App {index + 1} is geen tabel")
+            continue
+        name = app.get("name")
+        if not isinstance(name, str) or not name:
+            problems.append(f"App {index + 1} heeft geen naam")
+            continue
+        if name in names:
+            problems.append(f"App '{name}' komt meerdere keren voor")
+        if instances.SEPARATOR in name:
+            problems.append(f"App '{name}': '{instances.SEPARATOR}' is gereserveerd voor instances")
+        names.add(name)
+        
+        for key, value in app.items():
+            expected = FIELDS.get(key)
+            if expected is None:
+                problems.append(f"'{name}': onbekend veld '{key}'")
+            elif not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                problems.append(f"'{name}': '{key}' heeft een ongeldig type")
+        
+        ports = app.get("ports", [])
+        if isinstance(ports, list):
+            for port in ports:
+                if not isinstance(port, int) or isinstance(port, bool) or not 0 < port < 65536:
+                    problems.append(f"'{name}': ongeldige poort {port!r}")
+                elif port_owners.get(port) == name:
+                    problems.append(f"'{name}': poort {port} staat er dubbel in")
+                elif port in port_owners:
+                    problems.append(f"Poort {port} staat bij zowel '{port_owners[port]}' als '{name}'")
+                else:
+                    port_owners[port] = name
+        
+        commands = app.get("commands", [])
+        if isinstance(commands, list) and not all(isinstance(command, str) for command in commands):
+            problems.append(f"'{name}': 'commands' moet een lijst met strings zijn")
+        
+        depends_on = app.get("depends_on")
+        if isinstance(depends_on, list) and not all(isinstance(dep, str) for dep in depends_on):
+            problems.append(f"'{name}': 'depends_on' moet een naam of lijst met namen zijn")
+        
+        env = app.get("env")
+        if isinstance(env, dict) and not all(isinstance(value, str) for value in env.values()):
+            problems.append(f"'{name}': 'env' moet alleen strings bevatten")
+        
+        if "mode" in app and app["mode"] not in LaunchPlan.MODES:
+            problems.append(f"'{name}': 'mode' moet een van {', '.join(LaunchPlan.MODES)} zijn")
+        
+        if "probe" in app and app["probe"] not in PROBE_KINDS:
+            problems.append(f"'{name}': 'probe' moet een van {', '.join(PROBE_KINDS)} zijn")
+        
+        timeout = app.get("ready_timeout")
+        if isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout <= 0:
+            problems.append(f"'{name}': 'ready_timeout' moet positief zijn")
+    
+    # Onbekende dependencies en cycli (alleen als de apps zelf in orde zijn)
+    if not problems:
+        try:
+            deps.validate(apps)
+        except deps.DependencyError as e:
+            problems.append(str(e))
+    return problems
+
+
+class Config:
+    """Geladen en gevalideerde configuratie; version stijgt bij elke wijziging."""
+    
+    def __init__(self, apps, path=None, digest=None, version=0):
+        self.apps = apps
+        self.path = path
+        self.digest = digest
+        self.version = version
+
+
+class ConfigLoader:
+    """Laadt de configuratie en houdt het resultaat vast.
+    
+    Een ongewijzigd bestand (zelfde mtime en grootte) wordt niet opnieuw
+    gelezen; een bestand met dezelfde inhoud (zelfde hash) niet opnieuw
+    geparsed of gevalideerd.
+    """
+    
+    def __init__(self, path=None, defaults=()):
+        # Vast pad (bijv. voor tests); anders wordt het pad bij elke load gezocht
+        self.path = Path(path) if path else None
+        self.defaults = list(defaults)
+        self._config = None
+        self._stamp = None
+        self._version = 0
+    
+    def current_path(self):
+        """Pad van het configuratiebestand dat gebruikt wordt (of None: ingebouwd)."""
+        return self.path or find_path()
+    
+    def load(self):
+        """Geeft de actuele Config terug; gooit ConfigError bij een ongeldig bestand."""
+        path = self.current_path()
+        if path is None:
+            # Geen bestand (meer): ingebouwde apps
+            if self._config is None or self._config.path is not None:
+                self._stamp = None
+                self._config = self._new_config(self.defaults, None, None)
+            return self._config
+        
+        try:
+            stat = os.stat(path)
+            stamp = (str(path), stat.st_mtime_ns, stat.st_size)
+            if self._config is not None and stamp == self._stamp:
+                return self._config
+            data = Path(path).read_bytes()
+        except OSError as e:
+            raise ConfigError(path, [str(e)])
+        
+        digest = hashlib.sha1(data).hexdigest()
+        if self._config is not None and (self._config.path, self._config.digest) == (path, digest):
+            self._stamp = stamp
+            return self._config
+        
+        apps = parse(data, path)
+        problems = validate(apps)
+        if problems:
+            raise ConfigError(path, problems)
+        self._stamp = stamp
+        self._config = self._new_config(apps, path, digest)
+        return self._config
+    
+    def _new_config(self, apps, path, digest):
+        self._version += 1
+        return Config(apps, path, digest, self._version)
@@ -0,0 +1,826 @@
+"""
+Kern van woddex-control zonder Qt: apps starten, stoppen en hun status bepalen.
+Zowel de GUI (main.py) als de command line (cli.py) gebruiken deze module, zodat
+er één implementatie is van sessies, dependencies, poorten en teardown.
+
+Importeert bewust geen PySide6; asyncio (readiness) en concurrent.futures worden
+pas geladen als er gestart wordt, zodat `cli.py status` snel blijft.
+"""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import classifier
+import commandlog
+import config
+import deps
+import instances
+import panelogs
+import procfs
+from history import History
+from plans import LaunchPlan
+from sessions import SessionCache
+from teardown import Teardown
+from tmux_control import TmuxControlClient
+import tracing
+import worktrees
+
+# Ingebouwde apps; gebruikt als er geen configuratiebestand is (zie config.py)
+APPS = [
+    {
+        "name": "hakon",
+        "ports": [3000, 8010],
+        "commands": [
+            "cd ~/dev/nea && nx run hakon-app:serve",
+            "cd ~/dev/nea && nx run hakon-backend:serve",
+        ],
+        "depends_on": "avicii",
+    },
+    {
+        "name": "hakon-enq",
+        "ports": [4211, 3011],
+        "commands": [
+            "cd ~/dev/nea && nx run hakon-enq-app:serve",
+            "cd ~/dev/nea && nx run hakon-enq-backend:serve",
+        ],
+    },
+    {
+        "name": "avicii",
+        "ports": [4200, 8000],
+        "commands": [
+            "cd ~/dev/nea && nx run avicii-app:serve",
+            "cd ~/dev/nea && nx run avicii-backend:serve",
+        ],
+    },
+    {
+        "name": "avicii-enq",
+        "ports": [4201, 3001],
+        "commands": [
+            "cd ~/dev/nea && nx run avicii-enq-app:serve",
+            "cd ~/dev/nea && nx run avicii-enq-backend:serve",
+        ],
+    },
+    {
+        "name": "alice",
+        "ports": [4220, 8001, 3020],
+        "commands": [
+            "cd ~/dev/nea && nx run alice-app:serve",
+            "cd ~/dev/nea && nx run alice-backend:serve",
+            "cd ~/dev/nea && nx run alice-v2-backend:serve"
+        ],
+    }
+]
+
+# Repository voor nieuwe branches en PR's
+PROJECT_DIR = Path("/home/woddex/dev/nea")
+PR_REPO = "onderzoekdoen-nl/nea"
+
+# Terminal emulators in volgorde van voorkeur, met het commando om te attachen
+TERMINALS = [
+    ("kitty", ["kitty", "tmux", "attach-session", "-t"]),
+    ("alacritty", ["alacritty", "-e", "tmux", "attach-session", "-t"]),
+    ("foot", ["foot", "tmux", "attach-session", "-t"]),
+    ("gnome-terminal", ["gnome-terminal", "--", "tmux", "attach-session", "-t"]),
+    ("xterm", ["xterm", "-e", "tmux", "attach-session", "-t"]),
+]
+
+
+class OperationError(Exception):
+    """Fout die als melding aan de gebruiker getoond wordt."""
+
+
+def no_progress(message):
+    """Standaard progress callback: voortgang negeren."""
+
+
+def backend_session(app_name):
+    """Naam van de sessie waarin een app als dependency draait."""
+    return f"{app_name}-backend"
+
+
+def detect_terminal_emulator():
+    """Detecteert welke terminal emulator beschikbaar is."""
+    for name, cmd in TERMINALS:
+        if shutil.which(name):
+            return cmd
+    return None
+
+
+def run_git(args, project_dir, error_message):
+    """Voert een git/gh commando uit; gooit OperationError bij een fout."""
+    result = commandlog.run(
+        args,
+        cwd=str(project_dir),
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise OperationError(f"{error_message}:\n{result.stderr}")
+    return result
+
+
+def describe_exits(exits):
+    """Bijv. "pane 1: exit 1, pane 2: signaal" voor {pane index: exit code}."""
+    return ", ".join(
+        f"pane {index}: {'signaal' if code is None else f'exit {code}'}"
+        for index, code in sorted(exits.items())
+    )
+
+
+class AppStatus:
+    """Status van één app zoals de GUI en `cli.py status` die tonen."""
+    
+    def __init__(self, app, is_active, as_dependency=False, conflicts=None, exits=None, output=None):
+        self.app = app
+        self.is_active = is_active
+        # Draait alleen als dependency (sessie <app>-backend)
+        self.as_dependency = as_dependency
+        # {poort: PIDs} voor poorten die bezet zijn terwijl de app niet draait
+        self.conflicts = conflicts or {}
+        # {pane index: exit code} voor panes waarvan het commando gestopt is
+        self.exits = exits or {}
+        # Toestand uit de pane output (bouwen/klaar/fout/poort bezet) van de app of,
+        # als die alleen als dependency draait, van zijn backend sessie
+        self.output = output or classifier.AppOutput({})
+    
+    @property
+    def name(self):
+        return self.app["name"]
+    
+    def describe_exits(self):
+        return describe_exits(self.exits)
+    
+    def describe(self):
+        if self.is_active:
+            return "actief"
+        if self.as_dependency:
+            return "backend"
+        if self.conflicts:
+            return "poortconflict"
+        return "gestopt"
+
+
+class Controller:
+    """Bediening van alle apps via één tmux control-mode verbinding.
+    
+    Methodes die lang kunnen duren nemen een `progress` callback en gooien
+    OperationError met een melding voor de gebruiker; ze mogen vanaf
+    achtergrond-threads aangeroepen worden.
+    """
+    
+    def __init__(self, apps=None, tmux=None, history=None, loader=None):
+        self.tmux = tmux or TmuxControlClient()
+        self.sessions = SessionCache(self.tmux)
+        self.history = history or History()
+        # Gezet bij afsluiten: breekt wachten op poorten af
+        self.closing = threading.Event()
+        # Poortblokken van instances worden één voor één toegewezen
+        self._allocation_lock = threading.Lock()
+        # pipe-pane commando waarmee elke pane naar een logbestand schrijft
+        self.log_capture = panelogs.capture_command()
+        
+        # Vaste apps, of apps uit het configuratiebestand (met hot reload)
+        self.apps = []
+        self.config_version = None
+        # Gememoiseerde LaunchPlans voor de huidige configuratieversie
+        self._plans = {}
+        self._plans_version = None
+        self.config_error = None
+        self.loader = None
+        if apps is not None:
+            self.apps = apps
+        else:
+            self.loader = loader or config.ConfigLoader(defaults=APPS)
+            try:
+                self.reload_config()
+            except config.ConfigError as e:
+                # Zonder geldige configuratie geen apps; de aanroeper toont de fout
+                self.config_error = e
+    
+    def reload_config(self):
+        """Neemt een gewijzigde configuratie over; True als de apps veranderd zijn.
+        
+        Gooit ConfigError bij een ongeldig bestand; de vorige apps blijven dan actief.
+        """
+        if self.loader is None:
+            return False
+        try:
+            loaded = self.loader.load()
+        except config.ConfigError as e:
+            self.config_error = e
+            raise
+        self.config_error = None
+        if loaded.version == self.config_version:
+            return False
+        # Nieuwe lijst in plaats van aanpassen: threads die nog itereren zien de oude
+        self.apps = loaded.apps
+        self.config_version = loaded.version
+        return True
+    
+    def close(self):
+        """Breekt lopende wachttijden af en sluit de tmux verbinding."""
+        self.closing.set()
+        self.tmux.close()
+    
+    def find_app(self, app_name):
+        """Vind een app configuratie op basis van naam."""
+        for app in self.apps:
+            if app["name"] == app_name:
+                return app
+        return None
+    
+    def is_session_active(self, session_name):
+        """Leest de sessie-status uit de gecachte snapshot (geen fork per check)."""
+        return self.sessions.is_active(session_name)
+    
+    def pane_pids(self, app_name, snapshot=None):
+        """PIDs van de panes van een app, als volledige app of als dependency."""
+        snapshot = snapshot or self.sessions.get()
+        return snapshot.pane_pids(app_name) + snapshot.pane_pids(backend_session(app_name))
+    
+    @tracing.span("port_index")
+    def port_index(self, ports):
+        """Index van wie er op de opgegeven poorten luistert (één scan voor alle poorten)."""
+        if procfs.available():
+            return procfs.PortIndex.scan(ports)
+        # Fallback zonder /proc (bijv. macOS): één lsof aanroep per poort
+        owners = {}
+        for port in ports:
+            try:
+                result = commandlog.run(
+                    ["lsof", "-t", "-sTCP:LISTEN", "-i", f"tcp:{port}"],
+                    capture_output=True,
+                    text=True,
+                    check=False
+                )
+            except Exception:
+                continue
+            pids = {int(pid) for pid in result.stdout.split() if pid.isdigit()}
+            if pids:
+                owners[port] = pids
+        return procfs.PortIndex(owners)
+    
+    def instance_app(self, name, snapshot=None):
+        """App configuratie van een instance sessie (<app>@<instance>), of None.
+        
+        Een kopie van de app met de sessie als naam en de toegewezen poorten,
+        zodat readiness en stop_app dezelfde code gebruiken als voor een app.
+        """
+        snapshot = snapshot or self.sessions.get()
+        tag = snapshot.instance(name) or snapshot.instance(backend_session(name))
+        if tag is None:
+            return None
+        app_name, instance, ports, worktree = tag
+        return {
+            **(self.find_app(app_name) or {}),
+            "name": name,
+            "ports": ports,
+            "instance_of": app_name,
+            "instance": instance,
+            "worktree": worktree,
+        }
+    
+    def extra_sessions(self, snapshot=None):
+        """Sessies die niet bij een app, dependency of instance horen (bijv. zelf gestart)."""
+        snapshot = snapshot or self.sessions.get()
+        known = set()
+        for name in [app["name"] for app in self.apps] + list(snapshot.instances):
+            known.update((name, backend_session(name)))
+        return sorted(snapshot.sessions - known)
+    
+    @tracing.span("status")
+    def status(self, snapshot=None):
+        """Status van alle apps: één sessie-snapshot en één poortscan.
+        
+        Poortconflicten worden alleen bepaald voor apps die niet actief zijn.
+        Draaiende instances volgen direct op hun app.
+        """
+        snapshot = snapshot or self.sessions.refresh()
+        inactive_ports = [
+            port
+            for app in self.apps if not snapshot.is_active(app["name"])
+            for port in app.get("ports", [])
+        ]
+        port_index = self.port_index(inactive_ports) if inactive_ports else procfs.PortIndex()
+        instance_names = {}
+        for app_name, instance, _, _ in snapshot.instances.values():
+            instance_names.setdefault(app_name, set()).add(instances.session_name(app_name, instance))
+        
+        def output(name, is_active, as_dependency):
+            # Een app die alleen als dependency draait, heeft de output van zijn backend sessie
+            if is_active:
+                return self.output(name)
+            if as_dependency:
+                return self.output(backend_session(name))
+            return None
+        
+        statuses = []
+        for app in self.apps:
+            is_active = snapshot.is_active(app["name"])
+            as_dependency = snapshot.is_active(backend_session(app["name"]))
+            statuses.append(AppStatus(
+                app,
+                is_active,
+                as_dependency=as_dependency,
+                conflicts={} if is_active else port_index.conflicts(app.get("ports", [])),
+                exits=snapshot.exit_statuses(app["name"]),
+                output=output(app["name"], is_active, as_dependency),
+            ))
+            for name in sorted(instance_names.get(app["name"], ())):
+                is_active = snapshot.is_active(name)
+                as_dependency = snapshot.is_active(backend_session(name))
+                statuses.append(AppStatus(
+                    self.instance_app(name, snapshot),
+                    is_active,
+                    as_dependency=as_dependency,
+                    exits=snapshot.exit_statuses(name),
+                    output=output(name, is_active, as_dependency),
+                ))
+        return statuses
+    
+    def plan(self, app_name, session_name=None, worktree=None):
+        """LaunchPlan voor een app (standaard in een sessie met de app naam).
+        
+        Plans worden één keer per configuratieversie gecompileerd; een gewijzigde
+        configuratie begint met een lege cache. Met worktree draait een werkmap
+        binnen PROJECT_DIR in dezelfde map van die worktree.
+        """
+        if self._plans_version != self.config_version:
+            self._plans = {}
+            self._plans_version = self.config_version
+        session_name = session_name or app_name
+        key = (app_name, session_name, worktree and str(worktree))
+        plan = self._plans.get(key)
+        if plan is None:
+            if worktree is not None:
+                base = self.plan(app_name, session_name)
+                plan = base.replace(workdir=worktrees.rebase_dir(base.workdir, PROJECT_DIR, worktree))
+                self._plans[key] = plan
+                return plan
+            app = self.find_app(app_name)
+            if app is None:
+                raise OperationError(f"Onbekende app '{app_name}'")
+            plan = LaunchPlan.compile(
+                session_name,
+                app.get("commands", []),
+                env=self.port_env(app, app.get("ports", []), self.configured_ports),
+                layout=app.get("layout"),
+                mode=app.get("mode", "shell"),
+                remain_on_exit=app.get("remain_on_exit", False),
+                capture=self.log_capture,
+            )
+            self._plans[key] = plan
+        return plan
+    
+    def configured_ports(self, app_name):
+        return (self.find_app(app_name) or {}).get("ports", [])
+    
+    def port_env(self, app, ports, ports_of):
+        """Omgeving van een app: eigen poorten, poorten van zijn dependencies en `env`.
+        
+        ports_of(dependency) geeft de poorten van een dependency (geconfigureerd,
+        of die van de instance). `env` uit de configuratie gaat voor.
+        """
+        env = instances.port_env(ports)
+        for dependency in deps.dependencies_of(app):
+            env.update(instances.port_env(ports_of(dependency), dependency))
+        env.update(app.get("env") or {})
+        return env
+    
+    def allocate_ports(self, app, snapshot):
+        """Vrij poortblok voor een nieuwe instance; gooit OperationError als er geen is."""
+        reserved = {port for other in self.apps for port in other.get("ports", [])}
+        for _, _, ports, _ in snapshot.instances.values():
+            reserved.update(ports)
+        ports = instances.allocate_ports(app.get("ports", []), reserved)
+        if ports is None:
+            raise OperationError(f"Geen vrij poortblok voor een instance van '{app['name']}'")
+        return ports
+    
+    @tracing.span("run_plan")
+    def run_plan(self, plan):
+        """Maakt de tmux sessie van een plan.
+        
+        Alle tmux commando's gaan als één commandolijst over de control-mode
+        verbinding. Geeft (gelukt, foutmelding) terug.
+        """
+        if not plan.panes:
+            return False, "Geen geldige commando's"
+        if plan.capture:
+            panelogs.clear_states(plan.session_name)
+        tmux_commands = plan.tmux_commands()
+        results = self.tmux.run_list(tmux_commands)
+        self.sessions.invalidate()
+        if not self.tmux.list_ok(tmux_commands, results):
+            return False, self.tmux.list_error(results)
+        return True, ""
+    
+    def create_session(self, session_name, commands, project_dir=None):
+        """Maakt een losse sessie (zonder app configuratie) met de commando's in panes."""
+        return self.run_plan(LaunchPlan.compile(session_name, commands, project_dir, capture=self.log_capture))
+    
+    @tracing.span("kill_session")
+    def kill_session(self, session_name):
+        """Beëindigt een tmux sessie (exacte naam). Geeft het CommandResult terug."""
+        # '=naam:' in plaats van '=naam': tmux leest '=app@instance' anders als venster-id
+        result = self.tmux.run("kill-session", "-t", f"={session_name}:")
+        self.sessions.invalidate()
+        return result
+    
+    def start_dependency(self, dependency_app_name, worktree=None):
+        """Start een dependency (volledige app). Maakt sessie met naam app_name-backend."""
+        if not self.find_app(dependency_app_name):
+            return False
+        
+        session_name = backend_session(dependency_app_name)
+        ok, _ = self.run_plan(self.plan(dependency_app_name, session_name, worktree))
+        return ok
+    
+    def start_layers(self, app_names):
+        """Startvolgorde (lagen) voor de apps inclusief dependencies; gooit DependencyError."""
+        return deps.start_layers(self.apps, app_names)
+    
+    def start_apps(self, layers, targets, worktree=None, instance=None, progress=no_progress):
+        """Start de lagen uit start_layers; targets zijn de apps die volledig starten.
+        
+        Een laag met dependents wordt pas als klaar beschouwd als al zijn poorten
+        luisteren. Geeft {app: (monotonic, wall) starttijd} terug voor de apps
+        uit de laatste laag; daarop kan daarna met wait_ready gewacht worden.
+        Met worktree (pad van een git worktree) starten de apps vanuit die worktree,
+        als instance met de naam van de worktree (tenzij instance opgegeven is);
+        de sleutels zijn dan de instance sessies (<app>@<instance>).
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if worktree is not None and instance is None:
+            instance = instances.for_worktree(worktree)
+        
+        def key(name):
+            return instances.session_name(name, instance) if instance else name
+        
+        if instance:
+            # Zonder $WODDEX_PORT_<n> in de commando's zou de instance op de
+            # geconfigureerde poorten starten; weiger dat vóór er iets draait
+            for name in (name for layer in layers for name in layer):
+                app = self.find_app(name) or {}
+                unused = instances.unused_ports(app.get("commands", []), app.get("ports", []))
+                if unused:
+                    raise OperationError(
+                        f"'{name}' kan niet als instance draaien: de commando's gebruiken "
+                        f"{', '.join('$' + variable for variable in unused)} niet"
+                    )
+        
+        # Commando's uit de executor-threads tellen mee onder deze operatie
+        start_node = commandlog.bind(self.start_node)
+        started = {}
+        for index, layer in enumerate(layers):
+            progress(f"Starten: {', '.join(layer)}...")
+            with tracing.span(f"layer {index}", apps=", ".join(layer)):
+                with ThreadPoolExecutor(max_workers=len(layer)) as executor:
+                    futures = {
+                        name: executor.submit(start_node, name, name not in targets, worktree, instance)
+                        for name in layer
+                    }
+                    errors = []
+                    for name, future in futures.items():
+                        try:
+                            started_at = future.result()
+                        except OperationError as e:
+                            errors.append(str(e))
+                        else:
+                            if started_at is not None:
+                                started[key(name)] = started_at
+            # Volgende laag hangt van deze af: stop bij fouten
+            if errors:
+                raise OperationError("\n".join(errors))
+            
+            # Dependents (bijv. hakon op avicii) wachten tot deze laag luistert
+            if index < len(layers) - 1:
+                results = self.wait_ready([key(name) for name in layer], started, progress)
+                not_ready = [result.name for result in results.values() if not result.ready]
+                if not_ready:
+                    raise OperationError(
+                        f"Dependency {', '.join(not_ready)} niet klaar; "
+                        f"{', '.join(layers[index + 1])} niet gestart"
+                    )
+        return {key(name): started[key(name)] for name in layers[-1] if key(name) in started}
+    
+    @tracing.span("wait_ready")
+    def wait_ready(self, app_names, started, progress=no_progress):
+        """Wacht tot de poorten van de apps luisteren en slaat de opstarttijd op.
+        
+        started: {app: (monotonic, wall)} voor apps die net gestart zijn; alleen
+        die krijgen een time-to-ready meting. Geeft {app: AppReadiness} terug.
+        Namen mogen ook instance sessies zijn; die wachten op hun eigen poorten.
+        """
+        import readiness
+        
+        apps = [self.find_app(app_name) or self.instance_app(app_name) for app_name in app_names]
+        apps = [app for app in apps if app is not None]
+        probes = {app["name"]: readiness.app_probes(app) for app in apps if app.get("ports")}
+        if not probes:
+            return {}
+        timeout = max(app.get("ready_timeout", readiness.DEFAULT_TIMEOUT) for app in apps)
+        progress(f"Wachten tot {', '.join(probes)} luistert...")
+        results = readiness.wait_for_apps(probes, timeout=timeout, cancel=self.closing)
+        
+        for app_name, result in results.items():
+            if result.ready and app_name in started:
+                started_monotonic, started_wall = started[app_name]
+                # Instances tellen mee in de historie van hun app
+                history_name = app_name.split(instances.SEPARATOR, 1)[0]
+                try:
+                    self.history.record(history_name, result.ready_at - started_monotonic, started_wall)
+                except sqlite3.Error:
+                    pass
+        return results
+    
+    @tracing.span("start_node")
+    def start_node(self, app_name, as_dependency, worktree=None, instance=None):
+        """Start één app uit de DAG, als volledige app of als dependency.
+        
+        Geeft de starttijd (monotonic, wall) terug, of None als er niets gestart is.
+        """
+        if instance:
+            return self.start_instance(app_name, as_dependency, worktree, instance)
+        if as_dependency:
+            # Dependency draait al (volledig of als backend-only sessie)
+            if self.is_session_active(app_name) or self.is_session_active(backend_session(app_name)):
+                return None
+            # Start de dependency (alleen backend)
+            started_at = (time.monotonic(), time.time())
+            if not self.start_dependency(app_name, worktree):
+                raise OperationError(f"Kon dependency '{app_name}' niet starten")
+            return started_at
+        
+        # Check eerst of er een backend-only sessie draait (gemaakt door dependency)
+        # Stop die automatisch als die bestaat, zodat we de volledige app kunnen starten
+        if self.is_session_active(backend_session(app_name)):
+            self.kill_session(backend_session(app_name))
+        
+        # Controleer nu of de volledige app al actief is
+        if self.is_session_active(app_name):
+            raise OperationError(f"App '{app_name}' is al actief")
+        
+        plan = self.plan(app_name, worktree=worktree)
+        started_at = (time.monotonic(), time.time())
+        ok, error_msg = self.run_plan(plan)
+        if not ok:
+            raise OperationError(f"Kon app '{app_name}' niet starten:\n{error_msg}")
+        return started_at
+    
+    def start_instance(self, app_name, as_dependency, worktree, instance):
+        """Start een instance van een app (of zijn backend) met een eigen poortblok.
+        
+        Dependencies van een instance zijn instances met dezelfde naam; hun
+        poorten komen via WODDEX_<APP>_PORT_<n> in de omgeving.
+        """
+        name = instances.session_name(app_name, instance)
+        if as_dependency:
+            if self.is_session_active(name) or self.is_session_active(backend_session(name)):
+                return None
+            session_name = backend_session(name)
+        else:
+            if self.is_session_active(backend_session(name)):
+                self.kill_session(backend_session(name))
+            if self.is_session_active(name):
+                raise OperationError(f"Instance '{name}' is al actief")
+            session_name = name
+        
+        app = self.find_app(app_name)
+        # De poorten staan pas na run_plan in tmux: één toewijzing tegelijk
+        with self._allocation_lock:
+            snapshot = self.sessions.refresh()
+            ports = self.allocate_ports(app, snapshot)
+            
+            def instance_ports(dependency):
+                dependency_app = self.instance_app(instances.session_name(dependency, instance), snapshot)
+                return dependency_app["ports"] if dependency_app else self.configured_ports(dependency)
+            
+            tags = [
+                (instances.OPTION_APP, app_name),
+                (instances.OPTION_INSTANCE, instances.normalize(instance)),
+                (instances.OPTION_PORTS, instances.format_ports(ports)),
+            ]
+            if worktree is not None:
+                tags.append((instances.OPTION_WORKTREE, str(worktree)))
+            plan = self.plan(app_name, session_name, worktree).replace(
+                env=sorted(self.port_env(app, ports, instance_ports).items()),
+                tags=tags,
+            )
+            started_at = (time.monotonic(), time.time())
+            ok, error_msg = self.run_plan(plan)
+        if not ok:
+            raise OperationError(f"Kon '{session_name}' niet starten:\n{error_msg}")
+        return started_at
+    
+    def stop_app(self, app, progress=no_progress):
+        """Stopt een app inclusief de volledige procesboom onder zijn panes.
+        
+        Verzamelt de processen onder alle panes van de sessie(s) plus de
+        processen op de poorten van de app, stuurt SIGTERM, killt de tmux
+        sessie(s) en escaleert na een begrensde wachttijd naar SIGKILL.
+        `app` mag ook een losse sessie zijn ({"name": ..., "ports": [...]}) of
+        een instance (zie instance_app). Geeft een TeardownResult terug.
+        """
+        app_name = app["name"]
+        ports = app.get("ports", [])
+        instance = app.get("instance")
+        
+        def session_of(name):
+            return instances.session_name(name, instance) if instance else name
+        
+        snapshot = self.sessions.refresh()
+        sessions = [app_name]
+        
+        # Kill dependency backend sessies ook als die bestaan, behalve als een
+        # andere actieve app (van dezelfde instance) ze nog nodig heeft
+        base_name = app.get("instance_of", app_name)
+        other_active = [
+            other["name"] for other in self.apps
+            if other["name"] != base_name and snapshot.is_active(session_of(other["name"]))
+        ]
+        still_needed = deps.closure(self.apps, other_active)
+        for dependency in sorted(deps.closure(self.apps, [base_name]) - still_needed):
+            sessions.append(backend_session(session_of(dependency)))
+        sessions = [name for name in sessions if snapshot.is_active(name)]
+        
+        # Procesboom onder de panes + processen op de poorten van de app
+        progress(f"Processen van '{app_name}' verzamelen...")
+        with tracing.span("collect_processes"):
+            table = procfs.ProcessTable.scan()
+            pane_pids = [pid for name in sessions for pid in snapshot.pane_pids(name)]
+            pids = table.descendants(pane_pids)
+            # Poorteigenaren buiten de boom: alleen per pid, niet hun procesgroep
+            foreign = self.port_index(ports).pids_for(ports) - pids if ports else set()
+        
+        teardown = Teardown(pids, table, foreign)
+        with tracing.span("terminate", processes=len(pids) + len(foreign)):
+            teardown.terminate()
+        
+        # Kill tmux sessie(s); pane shells verdwijnen via SIGHUP
+        for session_name in sessions:
+            result = self.kill_session(session_name)
+            # Een direct gestart commando sluit zijn sessie zelf al na SIGTERM
+            if not result.ok and session_name == app_name and self.sessions.refresh().is_active(app_name):
+                raise OperationError(f"Kon sessie '{app_name}' niet beëindigen:\n{result.output}")
+        
+        progress(f"Wachten tot processen van '{app_name}' gestopt zijn...")
+        with tracing.span("teardown"):
+            return teardown.finish()
+    
+    def output(self, session_name):
+        """Toestand van een sessie volgens de classifier in de pipe-pane schrijvers.
+        
+        De output zelf wordt hier niet gelezen; alleen de kleine .state bestanden.
+        """
+        return classifier.AppOutput(panelogs.pane_states(session_name))
+    
+    def pane_logs(self, app_name):
+        """Logbestanden van de panes van een app (of instance), ook na het stoppen.
+        
+        Geeft (label, pad) paren terug: eerst de sessie van de app, dan die als dependency.
+        """
+        logs = []
+        for session_name in (app_name, backend_session(app_name)):
+            for path in panelogs.list_logs(session_name):
+                logs.append((f"{session_name} · {os.path.basename(path)[:-4]}", path))
+        return logs
+    
+    def open_terminal(self, session_name):
+        """Opent een terminal die aan de sessie attacht (of attacht direct zonder terminal)."""
+        if not self.is_session_active(session_name):
+            raise OperationError(f"Sessie '{session_name}' bestaat niet")
+        
+        terminal_cmd = detect_terminal_emulator()
+        try:
+            if terminal_cmd:
+                # Start terminal met tmux attach
+                commandlog.popen(
+                    terminal_cmd + [session_name],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+            else:
+                # Fallback: direct tmux attach (als terminal niet beschikbaar)
+                commandlog.popen(
+                    ["tmux", "attach-session", "-t", session_name],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+        except OSError as e:
+            raise OperationError(f"Kon niet verbinden met sessie '{session_name}':\n{str(e)}")
+    
+    def worktrees(self, project_dir=None, progress=no_progress):
+        """Git worktrees van de repository (hoofdmap eerst)."""
+        try:
+            return worktrees.list_worktrees(project_dir or PROJECT_DIR.expanduser())
+        except (worktrees.WorktreeError, OSError) as e:
+            raise OperationError(str(e))
+    
+    def find_worktree(self, name, project_dir=None):
+        """Pad van de worktree met deze branch of dit pad; None voor de hoofdmap."""
+        for worktree in self.worktrees(project_dir):
+            if name == worktree.branch or Path(name).expanduser().resolve() == worktree.path:
+                return None if worktree.is_main else worktree.path
+        raise OperationError(f"Geen worktree voor '{name}'")
+    
+    def prepare_branch(self, project_dir, branch_name, create_branch, worktree=False,
+                       progress=no_progress):
+        """develop bijwerken en de branch aanmaken.
+        
+        Zonder worktree wordt de branch in project_dir uitgecheckt; met worktree
+        krijgt hij een eigen git worktree en blijft project_dir (en de sessies
+        die daarin draaien) op de huidige branch. Geeft (staged changes, map van
+        de branch) terug.
+        """
+        if worktree:
+            work_dir = worktrees.worktree_path(project_dir, branch_name)
+            if create_branch:
+                progress("git fetch origin develop...")
+                run_git(["git", "fetch", "origin", "develop"], project_dir, "Kon niet fetch origin develop")
+                
+                progress(f"Worktree voor '{branch_name}' aanmaken...")
+                try:
+                    worktrees.add_worktree(project_dir, branch_name)
+                except (worktrees.WorktreeError, OSError) as e:
+                    raise OperationError(str(e))
+            return self._has_staged_changes(work_dir), work_dir
+        
+        # Checkout develop (alleen als we niet retryen)
+        if create_branch:
+            progress("git checkout develop...")
+            run_git(["git", "checkout", "develop"], project_dir, "Kon niet checkout develop")
+            
+            # Pull origin develop
+            progress("git pull origin develop...")
+            run_git(["git", "pull", "origin", "develop"], project_dir, "Kon niet pull origin develop")
+            
+            # Checkout nieuwe branch
+            progress(f"Branch '{branch_name}' aanmaken...")
+            run_git(
+                ["git", "checkout", "-b", branch_name],
+                project_dir,
+                f"Kon niet branch '{branch_name}' aanmaken"
+            )
+        
+        return self._has_staged_changes(project_dir), project_dir
+    
+    @staticmethod
+    def _has_staged_changes(project_dir):
+        # Check voor staged changes
+        result = commandlog.run(
+            ["git", "diff", "--cached", "--quiet"],
+            cwd=str(project_dir),
+            capture_output=True,
+            check=False
+        )
+        return result.returncode != 0
+    
+    def publish_branch(self, project_dir, branch_name, commit_message, allow_empty, progress=no_progress):
+        """Commit, push en PR aanmaken. Geeft de PR-fout terug (of None)."""
+        progress("Committen...")
+        if allow_empty:
+            # Maak empty commit
+            run_git(
+                ["git", "commit", "--allow-empty", "-m", commit_message],
+                project_dir,
+                "Kon niet empty commit aanmaken"
+            )
+        else:
+            run_git(["git", "commit", "-m", commit_message], project_dir, "Kon niet committen")
+        
+        # Push branch
+        progress(f"Branch '{branch_name}' pushen...")
+        run_git(
+            ["git", "push", "--set-upstream", "origin", branch_name],
+            project_dir,
+            "Kon niet branch pushen"
+        )
+        
+        # Maak PR aan met gh
+        progress("PR aanmaken...")
+        result = commandlog.run(
+            [
+                "gh", "pr", "create",
+                "--repo", PR_REPO,
+                "--title", branch_name,
+                "--body", "",
+                "--base", "develop",
+                "--head", branch_name
+            ],
+            cwd=str(project_dir),
+            capture_output=True,
+            text=True,
+            check=False
+        )
+        if result.returncode != 0:
+            return result.stderr
+        return None
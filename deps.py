@@ -0,0 +1,70 @@
+"""
+Dependencies tussen apps als DAG.
+`depends_on` mag een string of een lijst zijn; starten gebeurt in lagen waarbij
+alle apps binnen één laag onafhankelijk van elkaar zijn.
+"""
+
+
+class DependencyError(Exception):
+    """Onbekende dependency of circulaire afhankelijkheid."""
+
+
+def dependencies_of(app):
+    """Directe dependencies van een app als lijst (depends_on: None, str of lijst)."""
+    depends_on = app.get("depends_on")
+    if not depends_on:
+        return []
+    if isinstance(depends_on, str):
+        return [depends_on]
+    return list(depends_on)
+
+
+def closure(apps, names):
+    """Alle (transitieve) dependencies van de gegeven apps, exclusief de apps zelf."""
+    apps_by_name = {app["name"]: app for app in apps}
+    seen = set()
+    stack = list(names)
+    while stack:
+        app = apps_by_name.get(stack.pop())
+        if app is None:
+            continue
+        for dependency in dependencies_of(app):
+            if dependency not in apps_by_name:
+                raise DependencyError(f"Onbekende dependency '{dependency}' voor '{app['name']}'")
+            if dependency not in seen:
+                seen.add(dependency)
+                stack.append(dependency)
+    return seen - set(names)
+
+
+def start_layers(apps, names):
+    """Startvolgorde als lijst van lagen (topologisch gesorteerd, Kahn).
+    
+    Laag 0 bevat apps zonder dependencies binnen de selectie; elke volgende laag
+    hangt alleen af van eerdere lagen. Gooit DependencyError bij een cyclus.
+    """
+    apps_by_name = {app["name"]: app for app in apps}
+    for name in names:
+        if name not in apps_by_name:
+            raise DependencyError(f"Onbekende app '{name}'")
+    
+    nodes = set(names) | closure(apps, names)
+    remaining = {name: set(dependencies_of(apps_by_name[name])) & nodes for name in nodes}
+    layers = []
+    while remaining:
+        layer = sorted(name for name, pending in remaining.items() if not pending)
+        if not layer:
+            cycle = ", ".join(sorted(remaining))
+            raise DependencyError(f"Circulaire dependency tussen: {cycle}")
+        layers.append(layer)
+        for name in layer:
+            del remaining[name]
+        for pending in remaining.values():
+            pending.difference_update(layer)
+    return layers
+
+
+def validate(apps):
+    """Controleert alle dependencies van de configuratie in één keer."""
+    start_layers(apps, [app["name"] for app in apps])
+
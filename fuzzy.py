@@ -0,0 +1,205 @@
+"""
+Fuzzy zoeken over apps en losse tmux sessies (filter boven de lijst in de GUI).
+FuzzyIndex wordt één keer opgebouwd, als de configuratie of de sessielijst
+verandert; daarna is elke toetsaanslag een paar bitmask-operaties op n-gram
+postings in plaats van een scan over alle namen en commando's. Een posting is
+een int met één bit per entry, dus AND/OR over duizenden entries kost
+microseconden.
+
+Per zoekterm, van beste naar slechtste match:
+    0. naam begint met de term
+    1. term komt in de naam voor
+    2. term komt in de commando's voor (vanaf 3 tekens)
+    3. tekens van de term komen in volgorde in de naam voor ("hkn" -> "hakon")
+Voor termen tot 3 tekens zijn de masks exact. Langere termen selecteren eerst
+de entries die al hun trigrams bevatten, subsequences de entries waarin elk
+opeenvolgend tekenpaar in volgorde voorkomt; die kandidaten worden daarna per
+entry exact nagecontroleerd (substring, subsequence), zodat "aba" niet "baab"
+vindt. Meerdere termen (gescheiden door spaties) moeten allemaal matchen; de
+slechtste term bepaalt de rang. Een query die de vorige verlengt zoekt alleen
+binnen de vorige kandidaten.
+"""
+
+# Langste n-gram in de index
+GRAM = 3
+
+PREFIX = 0
+NAME = 1
+TEXT = 2
+SUBSEQUENCE = 3
+
+# Bitposities per bytewaarde, voor het uitpakken van een mask
+_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _grams(text, sizes):
+    return {text[i:i + size] for size in sizes for i in range(len(text) - size + 1)}
+
+
+def _pairs(text):
+    """Geordende tekenparen: "ab" als a ergens vóór b staat."""
+    first = {}
+    last = {}
+    for position, char in enumerate(text):
+        first.setdefault(char, position)
+        last[char] = position
+    return {a + b for a, start in first.items() for b, end in last.items() if start < end}
+
+
+def _is_subsequence(term, text):
+    """True als de tekens van term in volgorde in text voorkomen."""
+    rest = iter(text)
+    return all(char in rest for char in term)
+
+
+def _masks(keys_per_entry):
+    """{key: mask} uit een set keys per entry."""
+    postings = {}
+    for index, keys in enumerate(keys_per_entry):
+        for key in keys:
+            postings.setdefault(key, []).append(index)
+    masks = {}
+    for key, ids in postings.items():
+        data = bytearray(ids[-1] // 8 + 1)
+        for index in ids:
+            data[index >> 3] |= 1 << (index & 7)
+        masks[key] = int.from_bytes(data, "little")
+    return masks
+
+
+def positions(mask):
+    """Posities van de gezette bits, oplopend."""
+    result = []
+    for offset, value in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, "little")):
+        if value:
+            base = offset * 8
+            result.extend([base + bit for bit in _BITS[value]])
+    return result
+
+
+class FuzzyIndex:
+    """Index over [(naam, commando's)]; search() geeft posities in die lijst terug."""
+    
+    def __init__(self, entries):
+        names = [name.lower() for name, _ in entries]
+        # Voor de nacontrole van kandidaten
+        self.names = names
+        self.texts = [text.lower() for _, text in entries]
+        self.size = len(names)
+        self.all = (1 << self.size) - 1
+        # Namen: 1-, 2- en 3-grams, het begin van de naam en geordende tekenparen
+        self.name_grams = _masks(_grams(name, range(1, GRAM + 1)) for name in names)
+        self.name_prefixes = _masks(
+            {name[:size] for size in range(1, min(GRAM, len(name)) + 1)} for name in names
+        )
+        self.name_pairs = _masks(_pairs(name) for name in names)
+        # Commando's: alleen 3-grams; kortere termen matchen daar te veel
+        self.text_grams = _masks(_grams(text, (GRAM,)) for text in self.texts)
+        self._previous = None
+    
+    def __len__(self):
+        return self.size
+    
+    def search(self, query):
+        """Posities van de matches, beste eerst (binnen een rang in de oorspronkelijke volgorde).
+        
+        None voor een lege query (geen filter).
+        """
+        query = " ".join(query.lower().split())
+        if not query:
+            self._previous = None
+            return None
+        candidates = self.all
+        if self._previous is not None and self._narrows(self._previous[0], query):
+            candidates = self._previous[1]
+        
+        # Per rang: entries waarvan alle termen minstens zo goed matchen
+        terms = query.split(" ")
+        at_most = [candidates] * 4
+        for term in terms:
+            seen = 0
+            for tier, mask in enumerate(self._match(term)):
+                seen |= mask
+                at_most[tier] &= seen
+        
+        self._previous = (query, at_most[-1])
+        # Rangen onder `exact` komen uit exacte masks; de rest wordt nagecontroleerd
+        exact = min(self._exact_tiers(term) for term in terms)
+        ranked = []
+        better = 0
+        for mask in at_most[:exact]:
+            ranked.extend(positions(mask & ~better))
+            better = mask
+        if exact < len(at_most):
+            tiers = [[] for _ in at_most]
+            for position in positions(at_most[-1] & ~better):
+                tier = self._rank(position, terms)
+                if tier is not None:
+                    tiers[tier].append(position)
+            for matches in tiers:
+                ranked.extend(matches)
+        return ranked
+    
+    @staticmethod
+    def _narrows(previous, query):
+        """True als elke match van query ook een match van previous is."""
+        if query == previous:
+            return True
+        if not query.startswith(previous):
+            return False
+        # Een term van 3 tekens zoekt ook in de commando's, een kortere vorige term niet
+        return query[len(previous)] == " " or len(previous.rsplit(" ", 1)[-1]) >= GRAM
+    
+    def _match(self, term):
+        """Masks per rang (PREFIX, NAME, TEXT, SUBSEQUENCE); een entry kan in meerdere zitten."""
+        in_name = self._all_grams(self.name_grams, term)
+        prefix = self.name_prefixes.get(term[:GRAM], 0)
+        if len(term) > GRAM:
+            prefix &= in_name
+        in_text = self._all_grams(self.text_grams, term) if len(term) >= GRAM else 0
+        subsequence = 0
+        if len(term) > 1:
+            subsequence = self.all
+            for i in range(len(term) - 1):
+                subsequence &= self.name_pairs.get(term[i:i + 2], 0)
+                if not subsequence:
+                    break
+        return prefix, in_name, in_text, subsequence
+    
+    @staticmethod
+    def _exact_tiers(term):
+        """Aantal rangen (vanaf PREFIX) waarvoor de masks van _match exact zijn."""
+        if len(term) <= 2:
+            return SUBSEQUENCE + 1
+        if len(term) == GRAM:
+            # Twee geordende tekenparen zeggen niet dat alle drie in volgorde staan
+            return SUBSEQUENCE
+        return 0
+    
+    def _rank(self, position, terms):
+        """Exacte rang van een entry voor alle termen (de slechtste), of None."""
+        name = self.names[position]
+        worst = PREFIX
+        for term in terms:
+            if name.startswith(term):
+                tier = PREFIX
+            elif term in name:
+                tier = NAME
+            elif len(term) >= GRAM and term in self.texts[position]:
+                tier = TEXT
+            elif len(term) > 1 and _is_subsequence(term, name):
+                tier = SUBSEQUENCE
+            else:
+                return None
+            worst = max(worst, tier)
+        return worst
+    
+    def _all_grams(self, masks, term):
+        if len(term) <= GRAM:
+            return masks.get(term, 0)
+        mask = self.all
+        for i in range(len(term) - GRAM + 1):
+            mask &= masks.get(term[i:i + GRAM], 0)
+            if not mask:
+                break
+        return mask
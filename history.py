@@ -0,0 +1,90 @@
+"""
+Lokale historie van opstarttijden (time-to-ready) in SQLite.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+RECENT = 20  # aantal recente metingen voor p50/p95
+
+
+def default_path():
+    """$XDG_STATE_HOME/woddex-control/history.sqlite3 (standaard ~/.local/state)."""
+    state_home = os.environ.get("XDG_STATE_HOME") or str(Path.home() / ".local" / "state")
+    return Path(state_home) / "woddex-control" / "history.sqlite3"
+
+
+def percentile(values, fraction):
+    """Percentiel met lineaire interpolatie over een gesorteerde kopie."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class ReadyStats:
+    """p50/p95 over de recente opstarttijden van een app."""
+    
+    def __init__(self, samples):
+        self.count = len(samples)
+        self.p50 = percentile(samples, 0.5)
+        self.p95 = percentile(samples, 0.95)
+    
+    def describe(self):
+        if not self.count:
+            return "Nog geen opstarttijden gemeten"
+        return f"Klaar na: p50 {self.p50:.1f} s · p95 {self.p95:.1f} s (laatste {self.count})"
+
+
+class History:
+    """Opslag van time-to-ready metingen per app.
+    
+    Elke aanroep opent een eigen verbinding, zodat de opslag vanuit
+    achtergrond-threads gebruikt kan worden.
+    """
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_path()
+    
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=5)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS ready_times ("
+            " app TEXT NOT NULL,"
+            " started_at REAL NOT NULL,"
+            " seconds REAL NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ready_times_app ON ready_times (app, started_at)"
+        )
+        return connection
+    
+    def record(self, app_name, seconds, started_at=None):
+        """Slaat één time-to-ready meting op."""
+        started_at = time.time() if started_at is None else started_at
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO ready_times (app, started_at, seconds) VALUES (?, ?, ?)",
+                (app_name, started_at, seconds)
+            )
+        connection.close()
+    
+    def stats(self, app_names, limit=RECENT):
+        """{app: ReadyStats} voor meerdere apps (één verbinding)."""
+        stats = {}
+        with self._connect() as connection:
+            for app_name in app_names:
+                # Alleen de laatste `limit` metingen, nieuwste eerst
+                rows = connection.execute(
+                    "SELECT seconds FROM ready_times WHERE app = ? ORDER BY started_at DESC LIMIT ?",
+                    (app_name, limit)
+                ).fetchall()
+                stats[app_name] = ReadyStats([row[0] for row in rows])
+        connection.close()
+        return stats
@@ -0,0 +1,80 @@
+"""
+tmux hooks die wijzigingen aan sessies direct naar de GUI pushen.
+tmux roept dit script aan (`python3 -S hooks.py notify ...`), het script stuurt
+één regel naar de Unix socket waar de GUI op luistert. Bewust zonder andere
+imports zodat het in een paar milliseconden start.
+"""
+
+import os
+import shlex
+import socket
+import sys
+
+HOOKS = ("session-created", "session-closed", "pane-died")
+
+# Eigen index in de hook-array zodat hooks van de gebruiker intact blijven
+HOOK_INDEX = 42
+
+
+def runtime_dir():
+    """$XDG_RUNTIME_DIR/woddex-control (of een map in /tmp) voor sockets."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/woddex-control-{os.getuid()}"
+    directory = os.path.join(base, "woddex-control")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    return directory
+
+
+def socket_path():
+    """Socket waarop de GUI tmux events ontvangt."""
+    return os.path.join(runtime_dir(), "events.sock")
+
+
+def install_commands(path, python=None):
+    """tmux commando's (argumentenlijsten) die de hooks registreren."""
+    python = python or sys.executable
+    script = os.path.abspath(__file__)
+    commands = []
+    for hook in HOOKS:
+        notify = " ".join(shlex.quote(part) for part in (python, "-S", script, "notify", path))
+        # tmux vult #{hook} en #{hook_session_name} in voordat de shell het ziet;
+        # #{q:} escapet ze zodat een sessienaam met quotes of $() letterlijk blijft
+        shell_command = f"{notify} #{{q:hook}} #{{q:hook_session_name}}"
+        commands.append([
+            "set-hook", "-g", f"{hook}[{HOOK_INDEX}]",
+            f"run-shell -b {shlex.quote(shell_command)}",
+        ])
+    return commands
+
+
+def uninstall_commands():
+    """tmux commando's die onze hooks weer verwijderen."""
+    return [["set-hook", "-gu", f"{hook}[{HOOK_INDEX}]"] for hook in HOOKS]
+
+
+def notify(path, event, session_name=""):
+    """Stuurt een event naar de GUI; stil als die niet draait."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(1.0)
+            client.connect(path)
+            client.sendall(f"{event} {session_name}\n".encode("utf-8"))
+    except OSError:
+        pass
+
+
+def parse_events(data):
+    """Parse ontvangen regels naar een lijst van (event, sessienaam)."""
+    events = []
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        event, _, session_name = line.strip().partition(" ")
+        if event:
+            events.append((event, session_name))
+    return events
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "notify":
+        notify(sys.argv[2], sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else "")
+    else:
+        print("Gebruik: hooks.py notify <socket> <event> [sessie]", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Eén resident GUI-proces per gebruiker.
+De eerste launch blijft draaien en verbergt het venster bij sluiten; latere
+launches vragen via een Unix socket het bestaande venster om zich te tonen.
+Bewust zonder Qt, zodat een warme launch geen PySide6 import kost. De GUI
+luistert met QLocalServer op hetzelfde pad.
+
+    instance.py show [--profile-startup]   # exit 0 als een resident venster getoond is
+    instance.py quit                        # stopt het resident proces
+"""
+
+import os
+import socket
+import sys
+import time
+
+from hooks import runtime_dir
+
+COMMANDS = ("show", "quit")
+TIMEOUT = 2.0  # seconden
+
+
+def socket_path():
+    """Socket waarop het resident GUI-proces luistert."""
+    return os.path.join(runtime_dir(), "instance.sock")
+
+
+def send(command, path=None, timeout=TIMEOUT):
+    """Stuurt een commando naar het resident proces; geeft het antwoord (of None)."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path or socket_path())
+            client.sendall(f"{command}\n".encode("utf-8"))
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = client.recv(64)
+                if not chunk:
+                    break
+                reply += chunk
+    except OSError:
+        return None
+    return reply.decode("utf-8", errors="replace").strip() or None
+
+
+def main(argv):
+    if not argv or argv[0] not in COMMANDS:
+        print("Gebruik: instance.py show|quit [--profile-startup]", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    reply = send(argv[0])
+    if reply is None:
+        # Geen resident proces: de aanroeper start de GUI
+        return 1
+    if "--profile-startup" in argv:
+        print(f"Warme start: venster getoond na {(time.perf_counter() - started) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""
+Parallelle instances van een app (bijv. vanuit verschillende git worktrees).
+Een instance draait in een eigen tmux sessie (`<app>@<instance>`) met een eigen
+blok poorten: de geconfigureerde poorten plus een veelvoud van PORT_STEP. De
+poorten gaan via de omgeving (WODDEX_PORT_0, ...) naar de commando's, die ze
+moeten gebruiken (`--port=$WODDEX_PORT_0`), en worden als tmux session option
+bewaard, zodat GUI en CLI dezelfde toewijzing zien.
+"""
+
+import re
+import socket
+from pathlib import Path
+
+SEPARATOR = "@"
+
+# Afstand tussen de poortblokken van instances (4200 -> 5200 -> 6200 ...)
+PORT_STEP = 1000
+MAX_OFFSET = 50
+
+# tmux session options (user options) waarin een instance wordt vastgelegd
+OPTION_APP = "@woddex_app"
+OPTION_INSTANCE = "@woddex_instance"
+OPTION_PORTS = "@woddex_ports"
+OPTION_WORKTREE = "@woddex_worktree"
+
+# $WODDEX_PORT_0 of ${WODDEX_PORT_0} in een commando
+_PORT_VARIABLE = re.compile(r"\$\{?WODDEX_PORT_(\d+)\b")
+
+
+def normalize(instance):
+    """Instancenaam die tmux als sessienaam accepteert (geen '.', ':' of spaties)."""
+    return re.sub(r"[^\w-]", "_", instance)
+
+
+def for_worktree(worktree):
+    """Instancenaam voor een git worktree: de naam van de map (feature-x)."""
+    return normalize(Path(worktree).name)
+
+
+def session_name(app_name, instance):
+    """Sessie van een instance: <app>@<instance>."""
+    return f"{app_name}{SEPARATOR}{normalize(instance)}"
+
+
+def env_prefix(app_name=None):
+    """Prefix van de poortvariabelen: WODDEX voor de eigen poorten, WODDEX_<APP> voor een dependency."""
+    if app_name is None:
+        return "WODDEX"
+    return "WODDEX_" + re.sub(r"\W", "_", app_name).upper()
+
+
+def port_env(ports, app_name=None):
+    """{WODDEX_PORT_0: "4200", ...} voor de poorten van een app (of een dependency)."""
+    prefix = env_prefix(app_name)
+    return {f"{prefix}_PORT_{index}": str(port) for index, port in enumerate(ports)}
+
+
+def unused_ports(commands, ports):
+    """Poortvariabelen (WODDEX_PORT_<n>) die in geen van de commando's voorkomen.
+    
+    Een commando dat zijn poort niet uit de omgeving haalt, luistert als instance
+    gewoon op de geconfigureerde poort en botst dan met de app zelf.
+    """
+    used = {int(index) for command in commands for index in _PORT_VARIABLE.findall(command)}
+    return [f"WODDEX_PORT_{index}" for index in range(len(ports)) if index not in used]
+
+
+def format_ports(ports):
+    return " ".join(str(port) for port in ports)
+
+
+def parse_ports(value):
+    return [int(port) for port in value.split() if port.isdigit()]
+
+
+def port_free(port):
+    """True als er lokaal niemand op de poort luistert.
+    
+    Bind-test op alle IPv4 en alle IPv6 adressen: een dev server die alleen op
+    ::1 of [::] luistert (Node op veel systemen) bezet de poort ook. Zonder
+    IPv6 op het systeem telt alleen de IPv4 test.
+    """
+    for family, address in ((socket.AF_INET, ""), (socket.AF_INET6, "::")):
+        try:
+            probe = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            continue
+        with probe:
+            # TIME_WAIT van een net gestopte server telt niet als bezet
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if family == socket.AF_INET6:
+                # Alleen IPv6; IPv4 is hierboven al getest
+                probe.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+            try:
+                probe.bind((address, port))
+            except OSError:
+                return False
+    return True
+
+
+def allocate_ports(ports, reserved, is_free=port_free):
+    """Eerste vrije poortblok (offset 1..MAX_OFFSET keer PORT_STEP) of None.
+    
+    Een blok is vrij als geen van de poorten gereserveerd is (geconfigureerd of
+    al aan een andere instance gegeven) en de bind-test op elke poort slaagt.
+    """
+    for offset in range(1, MAX_OFFSET + 1):
+        block = [port + offset * PORT_STEP for port in ports]
+        if max(block, default=0) >= 65536:
+            break
+        if any(port in reserved for port in block):
+            continue
+        if all(is_free(port) for port in block):
+            return block
+    return None
@@ -17,11 +17,16 @@ if [ -z "$PYTHON_CMD" ]; then
     exit 1
 fi
 
-# Controleer of PySide6 geïnstalleerd is
-if ! $PYTHON_CMD -c "import PySide6" 2>/dev/null; then
+# Draait er al een resident venster? Dan alleen tonen (zonder Qt te laden)
+if $PYTHON_CMD -S instance.py show "$@"; then
+    exit 0
+fi
+
+# Controleer of PySide6 geïnstalleerd is (zoeken zonder te importeren)
+if ! $PYTHON_CMD -c "import importlib.util, sys; sys.exit(importlib.util.find_spec('PySide6') is None)" 2>/dev/null; then
     notify-send "Tmux Manager" "PySide6 niet geïnstalleerd!\nInstalleer met: pip install PySide6" -u critical 2>/dev/null || true
     exit 1
 fi
 
-# Start de applicatie (in achtergrond zodat Hyprland niet blokkeert)
-$PYTHON_CMD main.py &
+# Start de applicatie resident (in achtergrond zodat Hyprland niet blokkeert)
+$PYTHON_CMD main.py --resident "$@" &
@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 
+import json
+import re
+import shlex
 import sys
-import subprocess
-import shutil
-from pathlib import Path
+import sqlite3
+import time
+
+# Begin van de koude start (voor --profile-startup), vóór de PySide6 imports
+STARTUP = time.perf_counter()
+
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -11,77 +17,578 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QLabel,
     QPushButton,
-    QToolButton,
     QHBoxLayout,
-    QScrollArea,
     QMessageBox,
     QLineEdit,
     QInputDialog,
+    QCheckBox,
+    QDialog,
+    QListWidget,
+    QListWidgetItem,
+    QComboBox,
+    QPlainTextEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QFileDialog,
 )
-from PySide6.QtCore import Qt, QEvent, QPoint, QTimer, QSize
-from PySide6.QtGui import QFont, QMouseEvent, QIcon
+from PySide6.QtCore import Qt, QEvent, QPoint, QTimer, QSize, QThreadPool, QFileSystemWatcher
+from PySide6.QtGui import QFont, QMouseEvent, QIcon, QKeySequence, QShortcut
+from PySide6.QtNetwork import QLocalServer
 from PySide6.QtWidgets import QStyle
-from styles import Styles, ColorScheme, Icons
+from styles import Styles, Icons
+import applist
+import commandlog
+import config
+import core
+import deps
+import hooks
+import instance
+import instances
+import panelogs
+import procfs
+import tracing
+from workers import Worker
+
+
+class WorktreeDialog(QDialog):
+    """Lijst met git worktrees; start een app vanuit de gekozen worktree."""
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self.main_window = window
+        self.setObjectName("worktreeDialog")
+        self.setWindowTitle("Worktrees")
+        self.resize(560, 320)
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        self.worktree_list = QListWidget()
+        self.worktree_list.setObjectName("worktreeList")
+        self.worktree_list.itemDoubleClicked.connect(self.start_selected)
+        layout.addWidget(self.worktree_list)
+        
+        buttons_layout = QHBoxLayout()
+        self.app_box = QComboBox()
+        self.app_box.setObjectName("worktreeAppBox")
+        buttons_layout.addWidget(self.app_box, 1)
+        
+        start_button = QPushButton(f"{Icons.PLAY} Start app")
+        start_button.setObjectName("primaryButton")
+        start_button.clicked.connect(self.start_selected)
+        buttons_layout.addWidget(start_button)
+        
+        refresh_button = QPushButton("🔄 Vernieuwen")
+        refresh_button.setObjectName("primaryButton")
+        refresh_button.clicked.connect(self.refresh)
+        buttons_layout.addWidget(refresh_button)
+        layout.addLayout(buttons_layout)
+    
+    def refresh(self):
+        """Haal de worktrees (git) op de achtergrond op en vul de app keuzelijst."""
+        current_app = self.app_box.currentText()
+        self.app_box.clear()
+        self.app_box.addItems([app["name"] for app in self.main_window.core.apps if app.get("commands")])
+        if current_app:
+            self.app_box.setCurrentText(current_app)
+        self.main_window.run_operation(self.main_window.core.worktrees, on_success=self.set_worktrees)
+    
+    def set_worktrees(self, worktrees):
+        self.worktree_list.clear()
+        for worktree in worktrees:
+            label = worktree.describe() + (" (hoofdmap)" if worktree.is_main else "")
+            item = QListWidgetItem(label)
+            # None voor de hoofdmap: apps starten dan zoals altijd
+            item.setData(Qt.UserRole, None if worktree.is_main else str(worktree.path))
+            self.worktree_list.addItem(item)
+        if worktrees:
+            self.worktree_list.setCurrentRow(0)
+    
+    def start_selected(self):
+        item = self.worktree_list.currentItem()
+        app = self.main_window.core.find_app(self.app_box.currentText())
+        if item is None or app is None:
+            return
+        self.main_window.start_apps([app], worktree=item.data(Qt.UserRole))
+
+
+class LogViewer(QDialog):
+    """Volgt de pane logs van een app (zie panelogs.py).
+    
+    Elke tick leest alleen de nieuwe bytes (mmap); de tekst is begrensd op
+    MAX_LINES regels zodat het geheugen vlak blijft bij veel output.
+    """
+    
+    POLL_INTERVAL_MS = 500
+    MAX_LINES = 5000
+    # Kleur- en cursorcodes uit de terminal output
+    ANSI_PATTERN = re.compile(rb"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07]*(?:\x07|\x1b\\)|[@-Z\\-_])|\r")
+    
+    def __init__(self, window, app_name):
+        super().__init__(window)
+        self.main_window = window
+        self.app_name = app_name
+        self.tail = None
+        self.setObjectName("logViewer")
+        self.setWindowTitle(f"Logs: {app_name}")
+        self.resize(800, 500)
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        self.log_box = QComboBox()
+        self.log_box.setObjectName("logSelector")
+        self.log_box.currentIndexChanged.connect(self.select_log)
+        layout.addWidget(self.log_box)
+        
+        self.text = QPlainTextEdit()
+        self.text.setObjectName("logText")
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(self.MAX_LINES)
+        self.text.setFont(QFont("monospace", 9))
+        layout.addWidget(self.text)
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll)
+        self.reload_logs()
+    
+    def reload_logs(self):
+        """Vult de keuzelijst met de logs van de app (en van zijn backend sessie)."""
+        current = self.log_box.currentData()
+        self.log_box.blockSignals(True)
+        self.log_box.clear()
+        for label, path in self.main_window.core.pane_logs(self.app_name):
+            self.log_box.addItem(label, path)
+        index = self.log_box.findData(current)
+        self.log_box.setCurrentIndex(max(index, 0))
+        self.log_box.blockSignals(False)
+        if self.log_box.currentData() != current:
+            self.select_log()
+        if self.log_box.count() == 0:
+            self.text.setPlainText("Nog geen logs voor deze app")
+    
+    def select_log(self):
+        path = self.log_box.currentData()
+        self.text.clear()
+        self.tail = panelogs.LogTail(path) if path else None
+        self.poll()
+    
+    def poll(self):
+        if self.tail is None:
+            return
+        data = self.tail.read_new()
+        if not data:
+            return
+        # Alleen naar beneden scrollen als de gebruiker al onderaan stond
+        scroll_bar = self.text.verticalScrollBar()
+        at_end = scroll_bar.value() == scroll_bar.maximum()
+        cursor = self.text.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(self.ANSI_PATTERN.sub(b"", data).decode("utf-8", "replace"))
+        if at_end:
+            scroll_bar.setValue(scroll_bar.maximum())
+    
+    def showEvent(self, event):
+        self.poll_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.poll_timer.stop()
+        super().hideEvent(event)
+
+
+class CommandPanel(QDialog):
+    """Debug paneel (Ctrl+Shift+D): aantallen en latency per soort commando (zie commandlog.py).
+    
+    Ververst elke seconde zolang het zichtbaar is; Exporteren schrijft de
+    statistiek en de recente aanroepen als JSON, Trace exporteren de spans en
+    haperingen als Chrome trace (zie tracing.py).
+    """
+    
+    POLL_INTERVAL_MS = 1000
+    RECENT = 200
+    COLUMNS = ("Commando", "Via", "Aantal", "Fouten", "Gem. ms", "p95 ms", "Max ms", "Totaal ms", "Histogram")
+    BARS = "▁▂▃▄▅▆▇█"
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self.setObjectName("commandPanel")
+        self.setWindowTitle("Commando's")
+        self.resize(900, 560)
+        self.shown_record = None
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        self.totals_label = QLabel("")
+        self.totals_label.setObjectName("commandTotals")
+        layout.addWidget(self.totals_label)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setObjectName("commandTable")
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table, 2)
+        
+        self.recent_text = QPlainTextEdit()
+        self.recent_text.setObjectName("commandRecent")
+        self.recent_text.setReadOnly(True)
+        self.recent_text.setFont(QFont("monospace", 9))
+        self.recent_text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.recent_text, 1)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        reset_button = QPushButton("Wissen")
+        reset_button.setObjectName("primaryButton")
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(reset_button)
+        export_button = QPushButton("Exporteren")
+        export_button.setObjectName("primaryButton")
+        export_button.clicked.connect(self.export)
+        button_layout.addWidget(export_button)
+        trace_button = QPushButton("Trace exporteren")
+        trace_button.setObjectName("primaryButton")
+        trace_button.clicked.connect(self.export_trace)
+        button_layout.addWidget(trace_button)
+        layout.addLayout(button_layout)
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.refresh)
+    
+    def refresh(self):
+        log = commandlog.LOG
+        totals = log.totals()
+        since = time.strftime("%H:%M:%S", time.localtime(log.since))
+        self.totals_label.setText(
+            f"{totals.get(commandlog.SPAWN, 0)} processen en "
+            f"{totals.get(commandlog.CONTROL, 0)} control-mode commando's sinds {since}"
+            + self._describe_stalls()
+        )
+        
+        summary = log.summary()
+        self.table.setRowCount(len(summary))
+        for row, (via, kind, stats) in enumerate(summary):
+            p95 = stats.percentile(0.95)
+            values = (
+                kind, via, str(stats.count), str(stats.errors), f"{stats.mean:.1f}",
+                f"≤{p95}" if p95 is not None else f">{commandlog.BUCKETS[-1]}",
+                f"{stats.max:.1f}", f"{stats.total:.0f}", self._histogram(stats),
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if 2 <= column <= 7:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+            self.table.item(row, len(values) - 1).setToolTip(self._describe_histogram(stats))
+        
+        # Recente aanroepen alleen opnieuw zetten als er iets bij gekomen is
+        records = log.recent(self.RECENT)
+        last = records[-1] if records else None
+        if last is not self.shown_record:
+            self.shown_record = last
+            self.recent_text.setPlainText("\n".join(self._describe_record(record) for record in records))
+            scroll_bar = self.recent_text.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+    
+    @classmethod
+    def _histogram(cls, stats):
+        peak = max(stats.buckets) or 1
+        return "".join(
+            cls.BARS[min(len(cls.BARS) - 1, count * len(cls.BARS) // peak)] if count else " "
+            for count in stats.buckets
+        )
+    
+    @staticmethod
+    def _describe_histogram(stats):
+        bounds = [f"≤ {bound} ms" for bound in commandlog.BUCKETS] + [f"> {commandlog.BUCKETS[-1]} ms"]
+        return "\n".join(f"{bound}: {count}" for bound, count in zip(bounds, stats.buckets) if count)
+    
+    @staticmethod
+    def _describe_stalls():
+        stalls = list(tracing.TRACER.stalls)
+        if not stalls:
+            return ""
+        return f"\n{len(stalls)} haperingen, laatste: {stalls[-1].describe()}"
+    
+    @staticmethod
+    def _describe_record(record):
+        if record.exit_code is None:
+            outcome = "loopt"
+        elif record.exit_code == commandlog.NOT_STARTED:
+            outcome = "niet gestart"
+        else:
+            outcome = f"exit {record.exit_code}"
+        started = time.strftime("%H:%M:%S", time.localtime(record.started))
+        return (
+            f"{started}  {record.operation:<18} {record.via:<7} {record.duration * 1000:8.1f} ms  "
+            f"{outcome:<12} {shlex.join(record.argv)[:200]}"
+        )
+    
+    def reset(self):
+        commandlog.LOG.reset()
+        tracing.TRACER.reset()
+        self.refresh()
+    
+    def export(self):
+        self._export_json("Commando's exporteren", "woddex-commands", commandlog.LOG.export)
+    
+    def export_trace(self):
+        self._export_json("Trace exporteren", "woddex-trace", tracing.TRACER.chrome_trace)
+    
+    def _export_json(self, title, prefix, collect):
+        default = f"{prefix}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(self, title, default, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, "w") as handle:
+                json.dump(collect(), handle, indent=2)
+        except OSError as e:
+            QMessageBox.warning(self, "Fout", f"Kon niet exporteren:\n{e}")
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.poll_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.poll_timer.stop()
+        super().hideEvent(event)
 
 
 class MainWindow(QMainWindow):
-    APPS = [
-        {
-            "name": "hakon",
-            "ports": [3000, 8010],
-            "commands": [
-                "cd ~/dev/nea && nx run hakon-app:serve",
-                "cd ~/dev/nea && nx run hakon-backend:serve",
-            ],
-            "depends_on": "avicii",
-        },
-        {
-            "name": "hakon-enq",
-            "ports": [4211, 3011],
-            "commands": [
-                "cd ~/dev/nea && nx run hakon-enq-app:serve",
-                "cd ~/dev/nea && nx run hakon-enq-backend:serve",
-            ],
-        },
-        {
-            "name": "avicii",
-            "ports": [4200, 8000],
-            "commands": [
-                "cd ~/dev/nea && nx run avicii-app:serve",
-                "cd ~/dev/nea && nx run avicii-backend:serve",
-            ],
-        },
-        {
-            "name": "avicii-enq",
-            "ports": [4201, 3001],
-            "commands": [
-                "cd ~/dev/nea && nx run avicii-enq-app:serve",
-                "cd ~/dev/nea && nx run avicii-enq-backend:serve",
-            ],
-        },
-        {
-            "name": "alice",
-            "ports": [4220, 8001, 3020],
-            "commands": [
-                "cd ~/dev/nea && nx run alice-app:serve",
-                "cd ~/dev/nea && nx run alice-backend:serve",
-                "cd ~/dev/nea && nx run alice-v2-backend:serve"
-            ],
-        }
-    ]
-    
-    def __init__(self):
+    SAMPLE_INTERVAL_MS = 3000
+    
+    def __init__(self, resident=False, stall_threshold_ms=None):
         super().__init__()
-        self.app_widgets = {}
+        # Resident: sluiten verbergt het venster, het proces blijft warm draaien
+        self.resident = resident
+        self.quitting = False
+        # Alle sessie-, poort- en git-logica zit in de Qt-vrije kern
+        self.core = core.Controller()
+        self.tmux = self.core.tmux
+        self.sessions = self.core.sessions
+        self.thread_pool = QThreadPool(self)
+        # Operaties wachten vooral op tmux, git en poorten: meer threads dan cores
+        self.thread_pool.setMaxThreadCount(8)
+        self.busy_apps = set()
+        self._workers = set()
+        self.sampler = procfs.ResourceSampler()
+        self.worktree_dialog = None
+        self.log_viewers = {}
+        self.command_panel = None
+        self.init_event_server()
+        if resident:
+            self.init_instance_server()
         self.init_ui()
+        self.init_config_watcher()
         self.refresh_apps()
+        self.update_ready_stats([app["name"] for app in self.core.apps])
+        if self.core.config_error:
+            self.set_status(str(self.core.config_error), "error")
+        
+        # CPU/geheugen per app op een lage frequentie
+        self.sample_timer = QTimer(self)
+        self.sample_timer.setInterval(self.SAMPLE_INTERVAL_MS)
+        self.sample_timer.timeout.connect(self.sample_resources)
+        if procfs.available():
+            self.sample_timer.start()
+        
+        # Haperingen van de event loop melden met de span die op dat moment liep.
+        # Alleen op verzoek (--stall-threshold): de heartbeat wekt de event loop
+        # tientallen keren per seconde, ook als er niets gebeurt
+        self.watchdog = None
+        if stall_threshold_ms is not None:
+            self.watchdog = tracing.StallWatchdog(threshold_ms=stall_threshold_ms)
+            self.heartbeat_timer = QTimer(self)
+            self.heartbeat_timer.setInterval(self.watchdog.interval_ms)
+            self.heartbeat_timer.timeout.connect(self.watchdog.beat)
+    
+    def init_event_server(self):
+        """Luister naar tmux hooks zodat rijen direct bijwerken, ook bij sessies
+        die vanuit een terminal gestart of gestopt worden."""
+        # Meerdere events vlak na elkaar leiden tot één verversing
+        self.event_refresh_timer = QTimer(self)
+        self.event_refresh_timer.setSingleShot(True)
+        self.event_refresh_timer.setInterval(100)
+        self.event_refresh_timer.timeout.connect(self.refresh_apps)
+        
+        path = hooks.socket_path()
+        QLocalServer.removeServer(path)
+        self.event_server = QLocalServer(self)
+        if not self.event_server.listen(path):
+            # Geen push-updates; de Vernieuwen knop blijft werken
+            return
+        self.event_server.newConnection.connect(self._accept_event_connections)
+        self.tmux.startup_commands = hooks.install_commands(path)
+    
+    def _accept_event_connections(self):
+        while self.event_server.hasPendingConnections():
+            connection = self.event_server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self._read_events(c))
+            connection.disconnected.connect(connection.deleteLater)
+    
+    def _read_events(self, connection):
+        events = hooks.parse_events(bytes(connection.readAll()))
+        # Events van de eigen control-mode sessie negeren
+        session_events = [event for event, session_name in events if session_name != self.tmux.SESSION]
+        if not session_events:
+            return
+        # Een nieuwe output-toestand verandert niets aan de sessies zelf
+        if any(event != "pane-state" for event in session_events):
+            self.sessions.invalidate()
+        self.event_refresh_timer.start()
+    
+    def init_config_watcher(self):
+        """Herlaad het configuratiebestand zodra het wijzigt (hot reload)."""
+        self.config_watcher = QFileSystemWatcher(self)
+        # Editors schrijven vaak in stappen (of via rename): één reload na 200 ms rust
+        self.config_reload_timer = QTimer(self)
+        self.config_reload_timer.setSingleShot(True)
+        self.config_reload_timer.setInterval(200)
+        self.config_reload_timer.timeout.connect(self.reload_config)
+        self.config_watcher.fileChanged.connect(lambda path: self.config_reload_timer.start())
+        self.config_watcher.directoryChanged.connect(lambda path: self.config_reload_timer.start())
+        self.watch_config()
+    
+    def watch_config(self):
+        """Bewaakt de configuratiemap en de bestanden erin.
+        
+        Bestanden die via rename vervangen worden vallen uit de watcher; ze worden
+        hier opnieuw toegevoegd. Bestaat de map nog niet, dan de bovenliggende map.
+        """
+        directory = config.config_dir()
+        watch_dir = directory if directory.is_dir() else directory.parent
+        paths = [str(watch_dir)] + [
+            str(directory / filename) for filename in config.FILENAMES
+            if (directory / filename).is_file()
+        ]
+        watched = set(self.config_watcher.files()) | set(self.config_watcher.directories())
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self.config_watcher.addPaths(missing)
+    
+    def reload_config(self):
+        """Neemt een gewijzigde configuratie over; alleen betrokken rijen wijzigen."""
+        self.watch_config()
+        try:
+            changed = self.core.reload_config()
+        except config.ConfigError as e:
+            # Vorige (geldige) configuratie blijft actief
+            self.set_status(str(e), "error")
+            return
+        if not changed:
+            return
+        # Nieuwe apps krijgen een rij, verdwenen apps verliezen hun rij en
+        # gewijzigde apps krijgen hun nieuwe configuratie en status
+        self.refresh_apps()
+        self.update_ready_stats([app["name"] for app in self.core.apps])
+        self.set_status("Configuratie opnieuw geladen", "success")
+    
+    def init_instance_server(self):
+        """Luister naar latere launches (instance.py) die het venster willen tonen."""
+        path = instance.socket_path()
+        QLocalServer.removeServer(path)
+        self.instance_server = QLocalServer(self)
+        if not self.instance_server.listen(path):
+            return
+        self.instance_server.newConnection.connect(self._accept_instance_connections)
+    
+    def _accept_instance_connections(self):
+        while self.instance_server.hasPendingConnections():
+            connection = self.instance_server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self._read_instance_command(c))
+            connection.disconnected.connect(connection.deleteLater)
+    
+    def _read_instance_command(self, connection):
+        if not connection.canReadLine():
+            return
+        command = bytes(connection.readLine()).decode("utf-8", errors="replace").strip()
+        if command == "quit":
+            connection.write(b"ok\n")
+            connection.flush()
+            QTimer.singleShot(0, self.quit_application)
+        elif command == "show":
+            self.show_from_launcher()
+            
+            # Antwoord pas nadat de event loop het tonen verwerkt heeft
+            def reply():
+                connection.write(b"ok\n")
+                connection.flush()
+            QTimer.singleShot(0, reply)
+        else:
+            connection.write(b"onbekend\n")
+    
+    def show_from_launcher(self):
+        """Toont het (verborgen) venster weer; de status is al bijgewerkt via tmux hooks."""
+        if not self.event_server.isListening():
+            self.refresh_apps()
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        self.sample_resources()
+    
+    def quit_application(self):
+        """Sluit het venster en stopt het (resident) proces."""
+        self.quitting = True
+        self.close()
+        QApplication.quit()
+    
+    def sample_resources(self):
+        """Meet CPU% en RSS per app over de procesbomen onder de panes van zijn sessies."""
+        if not self.isVisible():
+            return
+        snapshot = self.sessions.get()
+        roots = {}
+        for app in self.core.apps:
+            app_name = app["name"]
+            pane_pids = self.core.pane_pids(app_name, snapshot)
+            if pane_pids:
+                roots[app_name] = pane_pids
+        self.app_model.set_usage(self.sampler.sample(roots))
+    
+    def showEvent(self, event):
+        if self.watchdog is not None:
+            self.watchdog.start()
+            self.heartbeat_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        # Verborgen (resident) venster: geen heartbeat, dus ook geen watchdog
+        if self.watchdog is not None:
+            self.heartbeat_timer.stop()
+            self.watchdog.stop()
+        super().hideEvent(event)
+    
+    def closeEvent(self, event):
+        """Sluit de tmux control-mode verbinding bij het sluiten van het venster."""
+        if self.resident and not self.quitting:
+            # Alleen verbergen; de volgende launch toont het venster direct
+            event.ignore()
+            self.hide()
+            return
+        
+        # Breek wachten op poorten af en laat lopende operaties eerst afronden
+        self.core.closing.set()
+        self.thread_pool.waitForDone()
+        if self.event_server.isListening():
+            self.tmux.run_list(hooks.uninstall_commands())
+            self.event_server.close()
+        self.core.close()
+        super().closeEvent(event)
     
     def init_ui(self):
         central_widget = QWidget()
+        central_widget.setObjectName("centralWidget")
         self.setCentralWidget(central_widget)
         
-        central_widget.setStyleSheet(Styles.get_central_widget())
-        
         main_layout = QVBoxLayout()
         central_widget.setLayout(main_layout)
         
@@ -90,7 +597,7 @@ class MainWindow(QMainWindow):
         title_font.setBold(True)
         self.title_label.setFont(title_font)
         self.title_label.setAlignment(Qt.AlignCenter)
-        self.title_label.setStyleSheet(Styles.get_title_label())
+        self.title_label.setObjectName("titleLabel")
         main_layout.addWidget(self.title_label)
         
         refresh_layout = QHBoxLayout()
@@ -98,26 +605,49 @@ class MainWindow(QMainWindow):
         
         refresh_button = QPushButton("🔄 Vernieuwen")
         refresh_button.setFlat(False)
-        refresh_button.setStyleSheet(Styles.get_refresh_button())
+        refresh_button.setObjectName("primaryButton")
         refresh_button.clicked.connect(self.refresh_apps)
         refresh_layout.addWidget(refresh_button)
+        
+        start_all_button = QPushButton(f"{Icons.PLAY} Start alle")
+        start_all_button.setObjectName("primaryButton")
+        start_all_button.clicked.connect(self.start_all_apps)
+        refresh_layout.addWidget(start_all_button)
+        
+        worktrees_button = QPushButton("Worktrees")
+        worktrees_button.setObjectName("primaryButton")
+        worktrees_button.clicked.connect(self.show_worktrees)
+        refresh_layout.addWidget(worktrees_button)
         refresh_layout.addStretch()
         main_layout.addLayout(refresh_layout)
         
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet(Styles.get_scroll_area())
+        no_apps_label = QLabel("Geen apps geconfigureerd")
+        no_apps_label.setObjectName("noAppsLabel")
+        no_apps_label.setAlignment(Qt.AlignCenter)
+        no_apps_label.setVisible(False)
+        self.no_apps_label = no_apps_label
+        main_layout.addWidget(no_apps_label)
         
-        self.apps_container = QWidget()
-        self.apps_layout = QVBoxLayout()
-        self.apps_layout.setSpacing(4)
-        self.apps_container.setLayout(self.apps_layout)
-        scroll_area.setWidget(self.apps_container)
-        main_layout.addWidget(scroll_area)
+        # Fuzzy filter over apps, commando's en losse sessies; pijltjes en Enter gaan naar de lijst
+        self.filter_input = QLineEdit()
+        self.filter_input.setObjectName("filterInput")
+        self.filter_input.setPlaceholderText("Zoek app of sessie (Ctrl+F)")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.textChanged.connect(self.filter_apps)
+        self.filter_input.returnPressed.connect(self.activate_selected)
+        self.filter_input.installEventFilter(self)
+        main_layout.addWidget(self.filter_input)
+        
+        # Model/view: alleen zichtbare rijen worden getekend, geen widgets per app
+        self.app_model = applist.AppListModel(self)
+        self.app_list = applist.AppListView(self.app_model)
+        self.app_list.clicked.connect(self.app_clicked)
+        self.app_list.activated.connect(self.activate_row)
+        main_layout.addWidget(self.app_list, 1)
         
         # Separator tussen apps en new branch sectie
         separator = QLabel()
-        separator.setStyleSheet(Styles.get_separator())
+        separator.setObjectName("separator")
         separator.setFixedHeight(1)
         main_layout.addWidget(separator)
         
@@ -126,25 +656,32 @@ class MainWindow(QMainWindow):
         new_branch_layout.setContentsMargins(10, 5, 10, 5)
         
         new_branch_label = QLabel("New Branch:")
-        new_branch_label.setStyleSheet(f"color: {ColorScheme.TEXT_PRIMARY}; font-size: 11pt;")
+        new_branch_label.setObjectName("branchLabel")
         new_branch_layout.addWidget(new_branch_label)
         
         self.new_branch_input = QLineEdit()
         self.new_branch_input.setPlaceholderText("branch-naam")
-        self.new_branch_input.setStyleSheet(Styles.get_new_branch_input())
+        self.new_branch_input.setObjectName("branchInput")
         self.new_branch_input.returnPressed.connect(self.create_new_branch)
         new_branch_layout.addWidget(self.new_branch_input)
         
-        new_branch_button = QPushButton("New Branch")
-        new_branch_button.setStyleSheet(Styles.get_new_branch_button())
-        new_branch_button.clicked.connect(self.create_new_branch)
-        new_branch_layout.addWidget(new_branch_button)
+        self.worktree_checkbox = QCheckBox("Worktree")
+        self.worktree_checkbox.setObjectName("worktreeCheckbox")
+        self.worktree_checkbox.setToolTip(
+            "Maak de branch in een eigen git worktree; draaiende apps blijven op de huidige branch"
+        )
+        new_branch_layout.addWidget(self.worktree_checkbox)
+        
+        self.new_branch_button = QPushButton("New Branch")
+        self.new_branch_button.setObjectName("primaryButton")
+        self.new_branch_button.clicked.connect(self.create_new_branch)
+        new_branch_layout.addWidget(self.new_branch_button)
         
         main_layout.addLayout(new_branch_layout)
         
         self.status_label = QLabel("")
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet(Styles.get_status_label())
+        self.status_label.setObjectName("statusLabel")
         main_layout.addWidget(self.status_label)
         
         self.setWindowTitle("Tmux Sessie Manager")
@@ -157,442 +694,280 @@ class MainWindow(QMainWindow):
             Qt.WindowMinimizeButtonHint
         )
         
+        # Ctrl+Q stopt ook een resident proces (sluiten verbergt dan alleen)
+        quit_shortcut = QShortcut(QKeySequence("Ctrl+Q"), self)
+        quit_shortcut.activated.connect(self.quit_application)
+        
+        filter_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
+        filter_shortcut.activated.connect(self.focus_filter)
+        
+        # Verborgen debug paneel met de boekhouding van alle externe commando's
+        command_panel_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        command_panel_shortcut.activated.connect(self.toggle_command_panel)
+    
     def is_session_active(self, session_name):
-        try:
-            result = subprocess.run(
-                ["tmux", "has-session", "-t", session_name],
-                capture_output=True,
-                check=False
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
-    
-    def kill_ports(self, ports):
-        for port in ports:
-            try:
-                result = subprocess.run(
-                    ["lsof", "-ti", f":{port}"],
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode == 0 and result.stdout.strip():
-                    pid = result.stdout.strip().split('\n')[0]
-                    subprocess.run(
-                        ["kill", "-9", pid],
-                        capture_output=True,
-                        check=False
-                    )
-            except Exception:
-                pass
+        """Leest de sessie-status uit de gecachte snapshot (geen fork per check)."""
+        return self.sessions.is_active(session_name)
     
+    @commandlog.operation("refresh_apps")
+    @tracing.span("refresh_apps")
     def refresh_apps(self):
-        """Ververs de lijst met apps."""
-        # Verwijder alle bestaande widgets uit de layout
-        while self.apps_layout.count():
-            item = self.apps_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Clear de dictionary
-        self.app_widgets.clear()
-        
-        if not self.APPS:
-            no_apps_label = QLabel("Geen apps geconfigureerd")
-            no_apps_label.setStyleSheet(Styles.get_no_apps_label())
-            no_apps_label.setAlignment(Qt.AlignCenter)
-            self.apps_layout.addWidget(no_apps_label)
-        else:
-            # Toon alle apps
-            for app in self.APPS:
-                self.add_app_widget(app)
+        """Ververs de lijst met apps.
         
-        # Voeg stretch toe aan het einde (maar alleen één keer)
-        self.apps_layout.addStretch()
-    
-    def add_app_widget(self, app):
-        """Voegt een widget toe voor een app."""
-        app_name = app["name"]
+        Het model wordt alleen opnieuw opgebouwd als de apps zelf wijzigen;
+        anders worden alleen rijen met een andere status opnieuw getekend.
+        """
+        # Eén verse snapshot van alle sessies en één poortscan voor de hele verversing
+        statuses = self.core.status()
+        self.no_apps_label.setVisible(not statuses)
+        self.app_list.setVisible(bool(statuses))
         
-        # Check of app actief is (alleen volledige app, niet alleen backend)
-        is_active = self.is_session_active(app_name)
-        
-        # Container widget voor elke app (compact, met hover-highlight)
-        app_widget = QWidget()
-        app_layout = QHBoxLayout()
-        app_layout.setContentsMargins(12, 8, 12, 8)  # Compactere padding
-        app_widget.setLayout(app_layout)
-        app_widget.setStyleSheet(Styles.get_app_widget())
-        
-        # Status indicator (groen bolletje als actief)
-        status_label = QLabel(Icons.STATUS_ACTIVE if is_active else Icons.STATUS_INACTIVE)
-        status_label.setStyleSheet(Styles.get_status_indicator(is_active))
-        status_label.setToolTip("Actief" if is_active else "Niet actief")
-        app_layout.addWidget(status_label)
-        
-        # App naam label (plain text, geen borders)
-        name_label = QLabel(app_name)
-        name_label.setStyleSheet(Styles.get_name_label())
-        app_layout.addWidget(name_label)
-        
-        app_layout.addStretch()
-        
-        if is_active:
-            # Als actief: toon attach en kill knoppen
-            # Verbinden knop
-            attach_button = QToolButton()
-            attach_button.setText(Icons.ATTACH)
-            attach_button.setFixedSize(32, 32)
-            attach_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
-            attach_button.setAutoRaise(True)
-            attach_button.setToolTip("Verbinden met sessie")
-            attach_button.setStyleSheet(Styles.get_attach_button())
-            attach_button.clicked.connect(lambda checked, name=app_name: self.attach_session(name))
-            app_layout.addWidget(attach_button)
-            
-            # Spacing tussen knoppen
-            app_layout.addSpacing(8)
-            
-            # Kill knop
-            kill_button = QToolButton()
-            kill_button.setText(Icons.KILL)
-            kill_button.setFixedSize(32, 32)
-            kill_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
-            kill_button.setAutoRaise(True)
-            kill_button.setToolTip("Stop app")
-            kill_button.setStyleSheet(Styles.get_kill_button())
-            kill_button.clicked.connect(lambda checked, app_data=app: self.kill_app(app_data))
-            app_layout.addWidget(kill_button)
+        selected = self.app_model.entry_at(self.app_list.currentIndex())
+        with tracing.span("rows", rows=len(statuses)):
+            self.app_model.set_statuses(
+                statuses, self.core.extra_sessions(), version=self.core.config_version
+            )
+        self._restore_selection(selected.name if selected else None)
+    
+    def eventFilter(self, watched, event):
+        """Pijltjes en Escape in het filter besturen de lijst."""
+        if watched is self.filter_input and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+                QApplication.sendEvent(self.app_list, event)
+                return True
+            if event.key() == Qt.Key_Escape and self.filter_input.text():
+                self.filter_input.clear()
+                return True
+        return super().eventFilter(watched, event)
+    
+    def focus_filter(self):
+        self.filter_input.setFocus()
+        self.filter_input.selectAll()
+    
+    @tracing.span("filter_apps")
+    def filter_apps(self, query):
+        """Filtert de lijst bij elke toetsaanslag; de beste match wordt geselecteerd."""
+        self.app_model.set_filter(query)
+        if query.strip() and self.app_model.rowCount():
+            self.app_list.setCurrentIndex(self.app_model.index(0, applist.NAME))
+    
+    def _restore_selection(self, name):
+        # Na een verversing dezelfde rij, of de beste match bij een filter
+        current = self.app_model.entry_at(self.app_list.currentIndex())
+        if current is not None and current.name == name:
+            return
+        row = self.app_model.row(name)
+        if row is None and self.app_model.query.strip() and self.app_model.rowCount():
+            row = 0
+        if row is not None:
+            self.app_list.setCurrentIndex(self.app_model.index(row, applist.NAME))
+    
+    def activate_selected(self):
+        """Enter in het filter: start of verbind met de geselecteerde rij."""
+        self.activate_row(self.app_list.currentIndex().siblingAtColumn(applist.NAME))
+    
+    def activate_row(self, index):
+        """Start een gestopte app; verbindt met een actieve app of losse sessie."""
+        # Een (dubbel)klik op een knop is al afgehandeld door app_clicked
+        if self.app_model.action_at(index) is not None:
+            return
+        entry = self.app_model.entry_at(index)
+        if entry is None or entry.name in self.app_model.busy:
+            return
+        if entry.is_active:
+            self.attach_session(entry.name)
         else:
-            # Als niet actief: alleen start knop
-            start_button = QToolButton()
-            start_button.setText(Icons.PLAY)
-            start_button.setFixedSize(32, 32)
-            start_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextOnly)
-            start_button.setAutoRaise(True)
-            start_button.setToolTip("Start app")
-            start_button.setStyleSheet(Styles.get_start_button())
-            start_button.clicked.connect(lambda checked, app_data=app: self.start_app(app_data))
-            app_layout.addWidget(start_button)
-        
-        # Voeg toe aan layout
-        self.apps_layout.addWidget(app_widget)
-        self.app_widgets[app_name] = app_widget
-
-    def detect_terminal_emulator(self):
-        """Detecteert welke terminal emulator beschikbaar is."""
-        terminals = [
-            ("kitty", ["kitty", "tmux", "attach-session", "-t"]),
-            ("alacritty", ["alacritty", "-e", "tmux", "attach-session", "-t"]),
-            ("foot", ["foot", "tmux", "attach-session", "-t"]),
-            ("gnome-terminal", ["gnome-terminal", "--", "tmux", "attach-session", "-t"]),
-            ("xterm", ["xterm", "-e", "tmux", "attach-session", "-t"]),
-        ]
-        
-        for name, cmd in terminals:
-            if shutil.which(name):
-                return cmd
-        return None
+            self.start_app(entry.app)
+    
+    def app_clicked(self, index):
+        """Klik op een knop in een app-rij; knoppen van bezette apps doen niets."""
+        action = self.app_model.action_at(index)
+        entry = self.app_model.entry_at(index)
+        if action is None or entry is None or entry.name in self.app_model.busy:
+            return
+        self.app_action(action, entry.app)
+    
+    def app_action(self, action, app):
+        """Voert de actie van een knop in een app-rij uit (zie applist.BUTTONS)."""
+        if action == applist.ATTACH:
+            self.attach_session(app["name"])
+        elif action == applist.KILL:
+            self.kill_app(app)
+        elif action == applist.START:
+            self.start_app(app)
+        elif action == applist.LOGS:
+            self.show_logs(app["name"])
     
+    @commandlog.operation("attach_session")
     def attach_session(self, session_name):
         """Voegt zich toe aan een tmux sessie."""
         try:
-            # Controleer of sessie bestaat
-            result = subprocess.run(
-                ["tmux", "has-session", "-t", session_name],
-                capture_output=True,
-                check=False
-            )
-            if result.returncode != 0:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Sessie '{session_name}' bestaat niet"
-                )
-                return
-            
-            # Detecteer terminal emulator
-            terminal_cmd = self.detect_terminal_emulator()
-            
-            if terminal_cmd:
-                # Start terminal met tmux attach
-                cmd = terminal_cmd + [session_name]
-                subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    start_new_session=True
-                )
-            else:
-                # Fallback: direct tmux attach (als terminal niet beschikbaar)
-                subprocess.Popen(
-                    ["tmux", "attach-session", "-t", session_name],
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL
-                )
-            
-            self.status_label.setText(f"Verbonden met: {session_name}")
-            self.status_label.setStyleSheet(Styles.get_status_label_info())
-            # Sluit venster na korte delay
-            QTimer.singleShot(300, self.close)
-        except Exception as e:
-            QMessageBox.warning(
-                self,
-                "Fout",
-                f"Kon niet verbinden met sessie '{session_name}':\n{str(e)}"
-            )
-            self.status_label.setText("Fout bij verbinden")
-    
-    def extract_project_dir(self, command):
-        """Haal project directory uit commando (cd ~/dev/nea && ... -> ~/dev/nea)."""
-        # Zoek naar cd commando in het begin
-        if "cd " in command and " && " in command:
-            parts = command.split(" && ", 1)
-            cd_part = parts[0].strip()
-            if cd_part.startswith("cd "):
-                # Haal directory uit "cd ~/dev/nea"
-                dir_part = cd_part[3:].strip().strip('"').strip("'")
-                return dir_part
-        return None
-    
-    def find_app_by_name(self, app_name):
-        """Vind een app configuratie op basis van naam."""
-        for app in self.APPS:
-            if app["name"] == app_name:
-                return app
-        return None
-    
-    def _create_tmux_session(self, session_name, commands, project_dir=None):
-        """Helper functie om een tmux sessie te maken met commando's in panes."""
-        # Filter "true" commando's eruit
-        valid_commands = [cmd for cmd in commands if cmd != "true"]
-        if not valid_commands:
-            return False
-        
-        # Haal project directory op uit eerste commando als niet gegeven
-        if not project_dir:
-            project_dir = self.extract_project_dir(valid_commands[0])
-        if not project_dir:
-            project_dir = "~"
-        project_dir_expanded = str(Path(project_dir).expanduser())
-        
-        # Maak nieuwe lege tmux sessie
-        result = subprocess.run(
-            ["tmux", "new-session", "-d", "-s", session_name],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-        if result.returncode != 0:
-            return False
-        
-        # Eerste pane: cd + eerste commando
-        first_cmd = valid_commands[0]
-        if "cd " in first_cmd and " && " in first_cmd:
-            first_cmd = first_cmd.split(" && ", 1)[1]
-        
-        subprocess.run(["tmux", "send-keys", "-t", session_name, f"cd \"{project_dir_expanded}\""], capture_output=True, check=False)
-        subprocess.run(["tmux", "send-keys", "-t", session_name, "C-m"], capture_output=True, check=False)
-        subprocess.run(["tmux", "send-keys", "-t", session_name, first_cmd], capture_output=True, check=False)
-        subprocess.run(["tmux", "send-keys", "-t", session_name, "C-m"], capture_output=True, check=False)
-        
-        # Voeg extra panes toe voor resterende commando's (naast elkaar)
-        for cmd in valid_commands[1:]:
-            subprocess.run(["tmux", "split-window", "-h", "-t", session_name], capture_output=True, check=False)
-            if "cd " in cmd and " && " in cmd:
-                cmd = cmd.split(" && ", 1)[1]
-            subprocess.run(["tmux", "send-keys", "-t", session_name, f"cd \"{project_dir_expanded}\""], capture_output=True, check=False)
-            subprocess.run(["tmux", "send-keys", "-t", session_name, "C-m"], capture_output=True, check=False)
-            subprocess.run(["tmux", "send-keys", "-t", session_name, cmd], capture_output=True, check=False)
-            subprocess.run(["tmux", "send-keys", "-t", session_name, "C-m"], capture_output=True, check=False)
-        
-        # Zet layout op even-horizontal
-        subprocess.run(["tmux", "select-layout", "-t", session_name, "even-horizontal"], capture_output=True, check=False)
-        return True
-    
-    def start_dependency(self, dependency_app_name):
-        """Start een dependency (volledige app). Maakt sessie met naam app_name-backend."""
-        dep_app = self.find_app_by_name(dependency_app_name)
-        if not dep_app:
-            return False
-        
-        commands = dep_app.get("commands", [])
-        if not commands:
-            return False
-        
-        # Sessie naam is app naam + "-backend"
-        dependency_session_name = f"{dependency_app_name}-backend"
-        return self._create_tmux_session(dependency_session_name, commands)
+            self.core.open_terminal(session_name)
+        except core.OperationError as e:
+            QMessageBox.warning(self, "Fout", str(e))
+            self.set_status("Fout bij verbinden", "error")
+            return
+        
+        self.set_status(f"Verbonden met: {session_name}", "info")
+        # Sluit venster na korte delay
+        QTimer.singleShot(300, self.close)
+    
+    def run_operation(self, fn, *args, app_names=(), on_success=None, on_error=None, trace=None):
+        """Voert fn op de achtergrond uit en koppelt het resultaat aan de GUI.
+        
+        Zolang de operatie loopt zijn de knoppen van de betrokken apps uitgeschakeld.
+        Voortgang komt in de status label; fouten worden als melding getoond.
+        trace=(naam, args) meet het werk als operatie-span (zie Worker).
+        """
+        app_names = tuple(app_names)
+        self.busy_apps.update(app_names)
+        for app_name in app_names:
+            self.set_app_buttons_enabled(app_name, False)
+        
+        worker = Worker(fn, *args, trace=trace)
+        self._workers.add(worker)
+        
+        def release():
+            self._workers.discard(worker)
+            self.busy_apps.difference_update(app_names)
+            for app_name in app_names:
+                self.set_app_buttons_enabled(app_name, True)
+        
+        def finished(result):
+            release()
+            if on_success:
+                on_success(result)
+        
+        def failed(message):
+            release()
+            QMessageBox.warning(self, "Fout", message)
+            if on_error:
+                on_error(message)
+        
+        worker.signals.progress.connect(self.show_progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.failed.connect(failed)
+        self.thread_pool.start(worker)
+    
+    def show_progress(self, message):
+        """Toont voortgang van een achtergrondoperatie in de status label."""
+        self.set_status(message, "info")
+    
+    def set_status(self, text, level=""):
+        """Zet de status label; level (info/success/error) bepaalt de kleur."""
+        self.status_label.setText(text)
+        Styles.set_property(self.status_label, "level", level)
+    
+    def set_app_buttons_enabled(self, app_name, enabled):
+        """Zet de knoppen van een app-rij aan of uit."""
+        self.app_model.set_busy(app_name, not enabled)
     
     def start_app(self, app):
         """Start een app met tmux sessie en commando's in panes naast elkaar."""
         app_name = app["name"]
-        commands = app.get("commands", [])
-        depends_on = app.get("depends_on")
         
-        try:
-            # Check eerst of er een backend-only sessie draait (gemaakt door dependency)
-            # Stop die automatisch als die bestaat, zodat we de volledige app kunnen starten
-            backend_session_name = f"{app_name}-backend"
-            if self.is_session_active(backend_session_name):
-                # Stop de backend-only sessie automatisch
-                subprocess.run(
-                    ["tmux", "kill-session", "-t", backend_session_name],
-                    capture_output=True,
-                    check=False
-                )
-            
-            # Controleer nu of de volledige app al actief is
-            if self.is_session_active(app_name):
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"App '{app_name}' is al actief"
-                )
-                return
-            
-            # Check of er dependencies zijn die we moeten starten
-            # (bijv. hakon starten die afhankelijk is van avicii)
-            if depends_on:
-                dependency_session_name_for_check = f"{depends_on}-backend"
-                if not self.is_session_active(dependency_session_name_for_check):
-                    # Start de dependency (alleen backend)
-                    if not self.start_dependency(depends_on):
-                        QMessageBox.warning(
-                            self,
-                            "Fout",
-                            f"Kon dependency '{depends_on}' niet starten"
-                        )
-                        return
-            
-            if not commands:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Geen commando's geconfigureerd voor '{app_name}'"
-                )
-                return
-            
-            # Filter "true" commando's eruit
-            valid_commands = [cmd for cmd in commands if cmd != "true"]
-            if not valid_commands:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Geen geldige commando's voor '{app_name}'"
-                )
-                return
-            
-            # Haal project directory op uit eerste commando
-            project_dir = self.extract_project_dir(valid_commands[0])
-            if not project_dir:
-                project_dir = "~"  # Fallback
-            
-            # Expand ~ naar volledig pad
-            project_dir_expanded = str(Path(project_dir).expanduser())
-            
-            # Maak nieuwe lege tmux sessie
-            result = subprocess.run(
-                ["tmux", "new-session", "-d", "-s", app_name],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() or result.stdout.strip()
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Kon app '{app_name}' niet starten:\n{error_msg}"
-                )
-                return
-            
-            # Eerste pane: cd + eerste commando
-            first_cmd = valid_commands[0]
-            # Verwijder cd deel uit commando als het erin zit
-            if "cd " in first_cmd and " && " in first_cmd:
-                first_cmd = first_cmd.split(" && ", 1)[1]
-            
-            subprocess.run(
-                ["tmux", "send-keys", "-t", app_name, f"cd \"{project_dir_expanded}\""],
-                capture_output=True,
-                check=False
-            )
-            subprocess.run(
-                ["tmux", "send-keys", "-t", app_name, "C-m"],
-                capture_output=True,
-                check=False
-            )
-            subprocess.run(
-                ["tmux", "send-keys", "-t", app_name, first_cmd],
-                capture_output=True,
-                check=False
-            )
-            subprocess.run(
-                ["tmux", "send-keys", "-t", app_name, "C-m"],
-                capture_output=True,
-                check=False
-            )
-            
-            # Voeg extra panes toe voor resterende commando's (naast elkaar)
-            for cmd in valid_commands[1:]:
-                # Split window horizontaal
-                subprocess.run(
-                    ["tmux", "split-window", "-h", "-t", app_name],
-                    capture_output=True,
-                    check=False
-                )
-                
-                # Verwijder cd deel uit commando als het erin zit
-                if "cd " in cmd and " && " in cmd:
-                    cmd = cmd.split(" && ", 1)[1]
-                
-                # Stuur commando's naar nieuwe pane
-                subprocess.run(
-                    ["tmux", "send-keys", "-t", app_name, f"cd \"{project_dir_expanded}\""],
-                    capture_output=True,
-                    check=False
-                )
-                subprocess.run(
-                    ["tmux", "send-keys", "-t", app_name, "C-m"],
-                    capture_output=True,
-                    check=False
-                )
-                subprocess.run(
-                    ["tmux", "send-keys", "-t", app_name, cmd],
-                    capture_output=True,
-                    check=False
-                )
-                subprocess.run(
-                    ["tmux", "send-keys", "-t", app_name, "C-m"],
-                    capture_output=True,
-                    check=False
-                )
-            
-            # Zet layout op even-horizontal (werkt voor 2 of 3 panes)
-            subprocess.run(
-                ["tmux", "select-layout", "-t", app_name, "even-horizontal"],
-                capture_output=True,
-                check=False
-            )
-            
-            self.status_label.setText(f"App '{app_name}' gestart")
-            self.status_label.setStyleSheet(Styles.get_status_label_success())
-            self.refresh_apps()
-        except Exception as e:
+        if not app.get("commands", []):
             QMessageBox.warning(
                 self,
                 "Fout",
-                f"Fout bij starten van app '{app_name}':\n{str(e)}"
+                f"Geen commando's geconfigureerd voor '{app_name}'"
+            )
+            return
+        
+        if "instance_of" in app:
+            # Instance die alleen als backend draait: start de volledige instance
+            self.start_apps(
+                [self.core.find_app(app["instance_of"])],
+                worktree=app.get("worktree"),
+                instance=app["instance"],
+                trace_name="start_app",
             )
+            return
+        self.start_apps([app], trace_name="start_app")
+    
+    def start_all_apps(self):
+        """Start alle apps die nog niet actief zijn (gedeelde dependencies één keer)."""
+        snapshot = self.sessions.get()
+        apps = [
+            app for app in self.core.apps
+            if app.get("commands") and not snapshot.is_active(app["name"])
+        ]
+        if not apps:
+            self.set_status("Alle apps zijn al actief", "info")
+            return
+        self.start_apps(apps)
+    
+    def start_apps(self, apps, worktree=None, instance=None, trace_name="start_apps"):
+        """Start een of meer apps inclusief hun dependencies.
+        
+        De dependencies worden als DAG opgelost: elke laag start parallel, de
+        volgende laag pas als de vorige klaar is. Met worktree starten de apps
+        vanuit die git worktree, als instance met eigen poorten.
+        """
+        names = [app["name"] for app in apps]
+        if worktree is not None and instance is None:
+            instance = instances.for_worktree(worktree)
+        
+        def row_name(name):
+            return instances.session_name(name, instance) if instance else name
+        
+        try:
+            layers = self.core.start_layers(names)
+        except deps.DependencyError as e:
+            QMessageBox.warning(self, "Fout", str(e))
+            return
+        
+        def started(pending):
+            labels = [row_name(name) for name in names]
+            label = f"App '{labels[0]}'" if len(labels) == 1 else f"Apps {', '.join(labels)}"
+            if worktree:
+                label += f" ({worktree})"
+            self.set_status(f"{label} gestart", "success")
+            self.refresh_apps()
+            
+            # Wacht op de achtergrond tot de poorten luisteren (knoppen blijven bruikbaar)
+            if pending:
+                self.run_operation(
+                    self.core.wait_ready, list(pending), pending,
+                    on_success=lambda results: self._apps_ready(pending, results),
+                )
+        
+        self.run_operation(
+            self.core.start_apps, layers, set(names), worktree, instance,
+            app_names=[row_name(name) for layer in layers for name in layer],
+            on_success=started,
+            on_error=lambda message: self.refresh_apps(),
+            trace=(trace_name, {"apps": ", ".join(names)}),
+        )
+    
+    def _apps_ready(self, started, results):
+        """GUI-deel: toon time-to-ready en werk de tooltips bij."""
+        ready = []
+        not_ready = []
+        for app_name, result in results.items():
+            if result.ready:
+                ready.append(f"'{app_name}' klaar na {result.ready_at - started[app_name][0]:.1f} s")
+            else:
+                ports = ", ".join(str(port) for port in result.pending)
+                not_ready.append(f"'{app_name}' luistert niet op {ports}")
+        if not_ready:
+            self.set_status("; ".join(ready + not_ready), "error")
+        elif ready:
+            self.set_status("App " + "; ".join(ready), "success")
+        self.update_ready_stats(list(results))
+    
+    def update_ready_stats(self, app_names):
+        """Laad p50/p95 opstarttijden uit de historie voor de tooltips."""
+        try:
+            stats = self.core.history.stats(app_names)
+        except sqlite3.Error:
+            return
+        for app_name, app_stats in stats.items():
+            self.app_model.set_ready_stats(app_name, app_stats)
     
     def kill_app(self, app):
         """Beëindigt een app: kill poorten en kill tmux sessie."""
         app_name = app["name"]
-        ports = app.get("ports", [])
-        depends_on = app.get("depends_on")
         
         reply = QMessageBox.question(
             self,
@@ -603,47 +978,46 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            try:
-                # Kill poorten
-                if ports:
-                    self.kill_ports(ports)
-                
-                # Kill tmux sessie
-                if self.is_session_active(app_name):
-                    result = subprocess.run(
-                        ["tmux", "kill-session", "-t", app_name],
-                        capture_output=True,
-                        text=True,
-                        check=False
-                    )
-                    if result.returncode != 0:
-                        error_msg = result.stderr.strip() or result.stdout.strip()
-                        QMessageBox.warning(
-                            self,
-                            "Fout",
-                            f"Kon sessie '{app_name}' niet beëindigen:\n{error_msg}"
-                        )
-                        return
-                
-                # Kill dependency backend sessie ook als die bestaat
-                if depends_on:
-                    dependency_session_name = f"{depends_on}-backend"
-                    if self.is_session_active(dependency_session_name):
-                        subprocess.run(
-                            ["tmux", "kill-session", "-t", dependency_session_name],
-                            capture_output=True,
-                            check=False
-                        )
-                
-                self.status_label.setText(f"App '{app_name}' gestopt")
-                self.status_label.setStyleSheet(Styles.get_status_label_error())
+            def stopped(result):
+                self.set_status(f"App '{app_name}' gestopt: {result.summary()}", "error")
                 self.refresh_apps()
-            except Exception as e:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Fout bij stoppen van app '{app_name}':\n{str(e)}"
-                )
+            
+            # Span op de worker, na de bevestiging: de dialoog is geen werk
+            self.run_operation(
+                self.core.stop_app, app,
+                app_names=[app_name],
+                on_success=stopped,
+                trace=("kill_app", {"app": app_name}),
+            )
+    
+    def show_logs(self, app_name):
+        """Toont de logviewer van een app (één venster per app)."""
+        viewer = self.log_viewers.get(app_name)
+        if viewer is None:
+            viewer = LogViewer(self, app_name)
+            self.log_viewers[app_name] = viewer
+        else:
+            viewer.reload_logs()
+        viewer.show()
+        viewer.raise_()
+    
+    def toggle_command_panel(self):
+        """Toont of verbergt het debug paneel met de commando-statistiek."""
+        if self.command_panel is None:
+            self.command_panel = CommandPanel(self)
+        if self.command_panel.isVisible():
+            self.command_panel.hide()
+            return
+        self.command_panel.show()
+        self.command_panel.raise_()
+    
+    def show_worktrees(self):
+        """Toont het worktrees venster (niet modaal) met actuele gegevens."""
+        if self.worktree_dialog is None:
+            self.worktree_dialog = WorktreeDialog(self)
+        self.worktree_dialog.refresh()
+        self.worktree_dialog.show()
+        self.worktree_dialog.raise_()
     
     def create_new_branch(self, retry_count=0):
         """Maakt een nieuwe git branch aan en PR volgens het newbranch.sh script."""
@@ -657,7 +1031,7 @@ class MainWindow(QMainWindow):
             )
             return
         
-        project_dir = Path("/home/woddex/dev/nea").expanduser()
+        project_dir = core.PROJECT_DIR.expanduser()
         
         if not project_dir.exists():
             QMessageBox.warning(
@@ -667,191 +1041,135 @@ class MainWindow(QMainWindow):
             )
             return
         
-        try:
-            # Checkout develop (alleen als we niet retryen)
-            if retry_count == 0:
-                result = subprocess.run(
-                    ["git", "checkout", "develop"],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode != 0:
-                    QMessageBox.warning(
-                        self,
-                        "Fout",
-                        f"Kon niet checkout develop:\n{result.stderr}"
-                    )
-                    return
-                
-                # Pull origin develop
-                result = subprocess.run(
-                    ["git", "pull", "origin", "develop"],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode != 0:
-                    QMessageBox.warning(
-                        self,
-                        "Fout",
-                        f"Kon niet pull origin develop:\n{result.stderr}"
-                    )
-                    return
-                
-                # Checkout nieuwe branch
-                result = subprocess.run(
-                    ["git", "checkout", "-b", branch_name],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode != 0:
-                    QMessageBox.warning(
-                        self,
-                        "Fout",
-                        f"Kon niet branch '{branch_name}' aanmaken:\n{result.stderr}"
-                    )
-                    return
+        self.set_branch_controls_enabled(False)
+        self.run_operation(
+            self.core.prepare_branch, project_dir, branch_name, retry_count == 0,
+            self.worktree_checkbox.isChecked(),
+            on_success=lambda prepared: self._confirm_branch_commit(
+                prepared[1], branch_name, prepared[0], retry_count
+            ),
+            on_error=self._branch_failed,
+            trace=("create_new_branch", {"branch": branch_name, "step": "prepare"}),
+        )
+    
+    def set_branch_controls_enabled(self, enabled):
+        """Zet de new branch invoer en knop aan of uit."""
+        self.new_branch_input.setEnabled(enabled)
+        self.worktree_checkbox.setEnabled(enabled)
+        self.new_branch_button.setEnabled(enabled)
+    
+    def _branch_failed(self, message):
+        self.set_branch_controls_enabled(True)
+        self.set_status("Fout bij aanmaken branch", "error")
+    
+    def _confirm_branch_commit(self, project_dir, branch_name, has_staged_changes, retry_count):
+        """GUI-deel: vraag commit message of bevestiging voor een lege commit."""
+        if has_staged_changes:
+            # Vraag commit message
+            commit_message, ok = QInputDialog.getText(
+                self,
+                "Commit Message",
+                "Staged changes gevonden. Geef een commit message op:",
+                text="Update"
+            )
             
-            # Check voor staged changes
-            result = subprocess.run(
-                ["git", "diff", "--cached", "--quiet"],
-                cwd=str(project_dir),
-                capture_output=True,
-                check=False
+            if not ok:
+                # Gebruiker heeft geannuleerd
+                self.set_branch_controls_enabled(True)
+                self.status_label.setText("")
+                return
+            
+            if not commit_message or not commit_message.strip():
+                commit_message = "Update"
+            allow_empty = False
+        else:
+            # Geen staged changes, vraag bevestiging voor empty commit
+            reply = QMessageBox.question(
+                self,
+                "Bevestiging",
+                "Geen staged changes gevonden.\n\nWeet je zeker dat je een lege commit wilt aanmaken?\n\n(Druk 'Nee' om opnieuw te controleren na het stagen van changes)",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
             )
-            has_staged_changes = result.returncode != 0
             
-            if has_staged_changes:
-                # Vraag commit message
-                commit_message, ok = QInputDialog.getText(
-                    self,
-                    "Commit Message",
-                    "Staged changes gevonden. Geef een commit message op:",
-                    text="Update"
-                )
-                
-                if not ok:
-                    # Gebruiker heeft geannuleerd
-                    return
-                
-                if not commit_message or not commit_message.strip():
-                    commit_message = "Update"
-                
-                # Commit
-                result = subprocess.run(
-                    ["git", "commit", "-m", commit_message],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode != 0:
-                    QMessageBox.warning(
-                        self,
-                        "Fout",
-                        f"Kon niet committen:\n{result.stderr}"
-                    )
-                    return
-            else:
-                # Geen staged changes, vraag bevestiging voor empty commit
-                reply = QMessageBox.question(
-                    self,
-                    "Bevestiging",
-                    "Geen staged changes gevonden.\n\nWeet je zeker dat je een lege commit wilt aanmaken?\n\n(Druk 'Nee' om opnieuw te controleren na het stagen van changes)",
-                    QMessageBox.Yes | QMessageBox.No,
-                    QMessageBox.No
-                )
-                
-                if reply == QMessageBox.No:
-                    # Gebruiker zegt nee, probeer opnieuw (met maximum retries)
-                    if retry_count < 2:
-                        self.create_new_branch(retry_count + 1)
-                    else:
-                        QMessageBox.information(
-                            self,
-                            "Geannuleerd",
-                            "Branch aanmaken geannuleerd."
-                        )
-                    return
-                
-                # Maak empty commit
-                result = subprocess.run(
-                    ["git", "commit", "--allow-empty", "-m", "Empty commit to trigger PR"],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    check=False
-                )
-                if result.returncode != 0:
-                    QMessageBox.warning(
+            if reply == QMessageBox.No:
+                # Gebruiker zegt nee, probeer opnieuw (met maximum retries)
+                if retry_count < 2:
+                    self.create_new_branch(retry_count + 1)
+                else:
+                    self.set_branch_controls_enabled(True)
+                    self.status_label.setText("")
+                    QMessageBox.information(
                         self,
-                        "Fout",
-                        f"Kon niet empty commit aanmaken:\n{result.stderr}"
+                        "Geannuleerd",
+                        "Branch aanmaken geannuleerd."
                     )
-                    return
-            
-            # Push branch
-            result = subprocess.run(
-                ["git", "push", "--set-upstream", "origin", branch_name],
-                cwd=str(project_dir),
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            if result.returncode != 0:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Kon niet branch pushen:\n{result.stderr}"
-                )
                 return
             
-            # Maak PR aan met gh
-            result = subprocess.run(
-                [
-                    "gh", "pr", "create",
-                    "--repo", "onderzoekdoen-nl/nea",
-                    "--title", branch_name,
-                    "--body", "",
-                    "--base", "develop",
-                    "--head", branch_name
-                ],
-                cwd=str(project_dir),
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                QMessageBox.warning(
-                    self,
-                    "Fout",
-                    f"Kon PR niet aanmaken:\n{result.stderr}\n\nBranch is wel aangemaakt en gepusht."
-                )
-                self.status_label.setText(f"Branch '{branch_name}' aangemaakt, maar PR mislukt")
-                self.status_label.setStyleSheet(Styles.get_status_label_error())
-            else:
-                self.status_label.setText(f"Branch en PR aangemaakt: {branch_name}")
-                self.status_label.setStyleSheet(Styles.get_status_label_success())
-                self.new_branch_input.clear()
+            commit_message = "Empty commit to trigger PR"
+            allow_empty = True
         
-        except Exception as e:
+        self.run_operation(
+            self.core.publish_branch, project_dir, branch_name, commit_message, allow_empty,
+            on_success=lambda pr_error: self._branch_published(branch_name, project_dir, pr_error),
+            on_error=self._branch_failed,
+            trace=("create_new_branch", {"branch": branch_name, "step": "publish"}),
+        )
+    
+    def _branch_published(self, branch_name, project_dir, pr_error):
+        """GUI-deel: toon het resultaat van push en PR."""
+        self.set_branch_controls_enabled(True)
+        if self.worktree_dialog is not None and self.worktree_dialog.isVisible():
+            self.worktree_dialog.refresh()
+        if pr_error is not None:
             QMessageBox.warning(
                 self,
                 "Fout",
-                f"Fout bij aanmaken branch:\n{str(e)}"
+                f"Kon PR niet aanmaken:\n{pr_error}\n\nBranch is wel aangemaakt en gepusht."
             )
-            self.status_label.setText("Fout bij aanmaken branch")
-            self.status_label.setStyleSheet(Styles.get_status_label_error())
+            self.set_status(f"Branch '{branch_name}' aangemaakt, maar PR mislukt", "error")
+        else:
+            location = f" in {project_dir}" if project_dir != core.PROJECT_DIR.expanduser() else ""
+            self.set_status(f"Branch en PR aangemaakt: {branch_name}{location}", "success")
+            self.new_branch_input.clear()
+
+
+def report_startup(marks):
+    """Print de duur van elke fase van de koude start (--profile-startup)."""
+    phases = []
+    previous = STARTUP
+    for label, moment in marks:
+        phases.append(f"{label} {(moment - previous) * 1000:.0f} ms")
+        previous = moment
+    total = (previous - STARTUP) * 1000
+    print(f"Koude start: {' · '.join(phases)} · totaal {total:.0f} ms", flush=True)
 
 
 def main():
-    """Hoofdfunctie die de applicatie start."""
+    """Hoofdfunctie die de applicatie start.
+    
+    --resident: blijf draaien na sluiten; latere launches tonen het venster via
+    instance.py. --profile-startup: print de duur van de koude start.
+    --stall-threshold MS: zet de watchdog aan die een event loop die langer dan
+    MS geblokkeerd is op stderr meldt (standaard uit).
+    """
+    resident = "--resident" in sys.argv
+    profile = "--profile-startup" in sys.argv
+    stall_threshold = None
+    if "--stall-threshold" in sys.argv:
+        value = sys.argv[sys.argv.index("--stall-threshold") + 1:][:1]
+        try:
+            stall_threshold = int(value[0])
+        except (IndexError, ValueError):
+            stall_threshold = 0
+        if stall_threshold <= 0:
+            sys.exit("woddex-control: --stall-threshold verwacht een positief aantal ms")
+    marks = [("imports", time.perf_counter())]
+    
+    # Er draait al een resident venster (bijv. gelijktijdige launches)
+    if resident and instance.send("show") is not None:
+        return
+    
     app = QApplication(sys.argv)
     
     # High-DPI fixes voor Hyprland / Wayland (anti-aliased rendering)
@@ -868,11 +1186,18 @@ def main():
     app.setApplicationDisplayName("Tmux Manager")
     app.setOrganizationName("Woddex")
     
-    # Stijl voor de hele applicatie
+    # Stijl voor de hele applicatie; één stylesheet, één keer geparsed
     app.setStyle("Fusion")
+    app.setStyleSheet(Styles.get_application())
+    
+    # Resident: verbergen van het laatste venster stopt de event loop niet
+    if resident:
+        app.setQuitOnLastWindowClosed(False)
+    marks.append(("QApplication", time.perf_counter()))
     
     # Hoofdvenster maken en tonen
-    window = MainWindow()
+    window = MainWindow(resident=resident, stall_threshold_ms=stall_threshold)
+    marks.append(("MainWindow", time.perf_counter()))
     
     # Stel expliciet window class in voor Hyprland/X11 herkenning
     # Dit zorgt ervoor dat de window manager de applicatie correct kan identificeren
@@ -886,6 +1211,13 @@ def main():
     
     window.show()
     
+    if profile:
+        # Eerste iteratie van de event loop: venster is getoond
+        def shown():
+            marks.append(("tonen", time.perf_counter()))
+            report_startup(marks)
+        QTimer.singleShot(0, shown)
+    
     # Event loop starten
     sys.exit(app.exec())
 
@@ -0,0 +1,203 @@
+"""
+Logbestanden per pane via `tmux pipe-pane`.
+tmux stuurt de output van elke pane naar dit script (`python3 -S panelogs.py
+capture ...`), dat het in $XDG_STATE_HOME/woddex-control/logs/<sessie>/pane-<n>.log
+schrijft. Bestanden hebben een maximale grootte: bij MAX_BYTES wordt het log
+naar .log.1 geroteerd. De logs blijven staan na het stoppen van een app.
+Dezelfde schrijver classificeert de output (classifier.py): bij een nieuwe
+toestand komt die in pane-<n>.state en krijgt de GUI een "pane-state" event.
+Bewust alleen de stdlib plus classifier.py en hooks.py (die zelf ook alleen de
+stdlib gebruiken), zodat het per pane snel start en weinig geheugen gebruikt.
+"""
+
+import mmap
+import os
+import shlex
+import sys
+import time
+
+import classifier
+import hooks
+
+# Grootte per logbestand; met één geroteerd bestand maximaal 2x per pane
+MAX_BYTES = 2 * 1024 * 1024
+
+# Zoveel bytes toont de viewer bij het openen van een log
+TAIL_BYTES = 64 * 1024
+
+READ_SIZE = 64 * 1024
+
+
+def log_dir():
+    """$XDG_STATE_HOME/woddex-control/logs (standaard ~/.local/state)."""
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(state_home, "woddex-control", "logs")
+
+
+def session_dir(session_name, directory=None):
+    # Sessienamen mogen '/' bevatten; in een pad wordt dat '_'
+    return os.path.join(directory or log_dir(), session_name.replace("/", "_"))
+
+
+def log_path(session_name, pane_index, directory=None):
+    """Pad van het (actuele) log van één pane."""
+    return os.path.join(session_dir(session_name, directory), f"pane-{pane_index}.log")
+
+
+def list_logs(session_name, directory=None):
+    """Actuele logs van een sessie, gesorteerd op pane index."""
+    path = session_dir(session_name, directory)
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return []
+    panes = sorted(
+        int(name[5:-4]) for name in names
+        if name.startswith("pane-") and name.endswith(".log") and name[5:-4].isdigit()
+    )
+    return [os.path.join(path, f"pane-{index}.log") for index in panes]
+
+
+def clear_states(session_name, directory=None):
+    """Verwijdert de toestanden van een vorige run, zodat een nieuwe start niet als "fout" begint."""
+    path = session_dir(session_name, directory)
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return
+    for name in names:
+        if name.endswith(".state"):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+
+
+def pane_states(session_name, directory=None):
+    """{pane index: toestand} uit de .state bestanden van een sessie."""
+    states = {}
+    for path in list_logs(session_name, directory):
+        state = classifier.read_state(classifier.state_path(path))
+        if state:
+            states[int(os.path.basename(path)[5:-4])] = state
+    return states
+
+
+def capture_command(directory=None, python=None, events=None):
+    """Shell commando voor `pipe-pane`; tmux vult sessienaam en pane index in."""
+    python = python or sys.executable
+    script = os.path.abspath(__file__)
+    parts = (python, "-S", script, "capture", directory or log_dir(), events or hooks.socket_path())
+    capture = " ".join(shlex.quote(part) for part in parts)
+    # #{q:} escapet de sessienaam voor de shell (quotes, $() en spaties)
+    return f"exec {capture} #{{q:session_name}} #{{q:pane_index}}"
+
+
+class RotatingWriter:
+    """Schrijft een stroom bytes naar een log met maximale grootte."""
+    
+    def __init__(self, path, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._open()
+    
+    def _open(self):
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        self.size = os.fstat(self.fd).st_size
+    
+    def rotate(self):
+        """Huidig log wordt .log.1 (het vorige .log.1 vervalt); begin een nieuw log."""
+        os.close(self.fd)
+        os.replace(self.path, self.path + ".1")
+        self._open()
+    
+    def write(self, data):
+        if self.size and self.size + len(data) > self.max_bytes:
+            self.rotate()
+        os.write(self.fd, data)
+        self.size += len(data)
+    
+    def close(self):
+        os.close(self.fd)
+
+
+def capture(directory, events, session_name, pane_index, source=0):
+    """Leest de pane output van stdin tot tmux de pipe sluit (pane weg of gestopt).
+    
+    Elke chunk gaat naar het log en door de classifier; een gewijzigde toestand
+    wordt weggeschreven en als event naar de GUI gestuurd.
+    """
+    path = log_path(session_name, pane_index, directory)
+    writer = RotatingWriter(path)
+    output = classifier.OutputClassifier()
+    state_file = classifier.state_path(path)
+    started = time.strftime("%Y-%m-%d %H:%M:%S")
+    writer.write(f"\n--- woddex-control: {session_name} pane {pane_index} gestart {started} ---\n".encode())
+    try:
+        while True:
+            data = os.read(source, READ_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            if output.feed(data):
+                classifier.write_state(state_file, output.snapshot())
+                hooks.notify(events, "pane-state", session_name)
+    finally:
+        writer.close()
+
+
+class LogTail:
+    """Leest alleen de nieuwe bytes van een log via mmap.
+    
+    Bij elke read wordt alleen het stuk vanaf de vorige positie gemapt; na een
+    rotatie (ander inode of kleiner bestand) begint de tail opnieuw bij het
+    nieuwe bestand.
+    """
+    
+    def __init__(self, path, tail_bytes=TAIL_BYTES):
+        self.path = path
+        self.tail_bytes = tail_bytes
+        self.offset = None
+        self.inode = None
+    
+    def read_new(self):
+        """Nieuwe output sinds de vorige aanroep (bytes; leeg als er niets is)."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return b""
+        if self.offset is None:
+            # Eerste keer: alleen het einde van het log
+            self.offset = max(0, stat.st_size - self.tail_bytes)
+        elif stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.offset = 0
+        self.inode = stat.st_ino
+        if stat.st_size <= self.offset:
+            return b""
+        
+        # mmap offsets moeten op een veelvoud van de granularity liggen
+        start = self.offset - self.offset % mmap.ALLOCATIONGRANULARITY
+        try:
+            with open(self.path, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size <= self.offset:
+                    return b""
+                with mmap.mmap(handle.fileno(), size - start, access=mmap.ACCESS_READ, offset=start) as view:
+                    data = view[self.offset - start:]
+        except (OSError, ValueError):
+            return b""
+        self.offset = size
+        return data
+
+
+def main(argv):
+    if len(argv) == 5 and argv[0] == "capture":
+        capture(*argv[1:])
+        return 0
+    print("Gebruik: panelogs.py capture <map> <socket> <sessie> <pane index>", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
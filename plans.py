@@ -0,0 +1,159 @@
+"""
+Voorgecompileerde launch plans: alles wat nodig is om de tmux sessie van een app
+te maken (werkmap, pane commando's, env en layout), één keer afgeleid uit de
+configuratie in plaats van bij elke klik.
+"""
+
+import shlex
+from pathlib import Path
+
+
+def extract_project_dir(command):
+    """Haal project directory uit commando (cd ~/dev/nea && ... -> ~/dev/nea)."""
+    # Zoek naar cd commando in het begin
+    if "cd " in command and " && " in command:
+        parts = command.split(" && ", 1)
+        cd_part = parts[0].strip()
+        if cd_part.startswith("cd "):
+            # Haal directory uit "cd ~/dev/nea"
+            dir_part = cd_part[3:].strip().strip('"').strip("'")
+            return dir_part
+    return None
+
+
+def strip_cd(command):
+    """Commando zonder `cd ... && ` prefix."""
+    if "cd " in command and " && " in command:
+        return command.split(" && ", 1)[1]
+    return command
+
+
+class LaunchPlan:
+    """Gecompileerd plan voor één tmux sessie."""
+    
+    __slots__ = (
+        "session_name", "workdir", "panes", "env", "layout", "mode", "remain_on_exit", "tags",
+        "capture", "_tmux_commands",
+    )
+    
+    # Panes naast elkaar (werkt voor 2 of 3 panes)
+    DEFAULT_LAYOUT = "even-horizontal"
+    
+    # shell: interactieve shell per pane waarin cd en het commando getypt worden
+    # direct: tmux start het commando zelf in de werkmap (-c), zonder shell rc
+    MODES = ("shell", "direct")
+    
+    def __init__(self, session_name, workdir, panes, env=(), layout=None, mode="shell",
+                 remain_on_exit=False, tags=(), capture=None):
+        self.session_name = session_name
+        self.workdir = workdir
+        # Eén commando per pane (zonder cd prefix)
+        self.panes = tuple(panes)
+        # (naam, waarde) paren voor de omgeving van de panes
+        self.env = tuple(env)
+        self.layout = layout or self.DEFAULT_LAYOUT
+        self.mode = mode
+        # Pane blijft na afloop van het commando staan (exit code zichtbaar)
+        self.remain_on_exit = remain_on_exit
+        # (optie, waarde) paren die als tmux session option gezet worden (bijv. @woddex_ports)
+        self.tags = tuple(tags)
+        # Shell commando voor `pipe-pane` per pane (zie panelogs.py), of None
+        self.capture = capture
+        self._tmux_commands = None
+    
+    @classmethod
+    def compile(cls, session_name, commands, project_dir=None, env=None, layout=None,
+                mode="shell", remain_on_exit=False, capture=None):
+        """Leidt een plan af uit de commando's van een app.
+        
+        "true" commando's vallen weg; de werkmap komt uit project_dir of de
+        `cd ... &&` van het eerste commando (standaard ~), met ~ uitgeschreven.
+        """
+        valid_commands = [cmd for cmd in commands if cmd != "true"]
+        if not project_dir and valid_commands:
+            project_dir = extract_project_dir(valid_commands[0])
+        workdir = str(Path(project_dir or "~").expanduser())
+        return cls(
+            session_name,
+            workdir,
+            [strip_cd(cmd) for cmd in valid_commands],
+            sorted((env or {}).items()),
+            layout,
+            mode,
+            remain_on_exit,
+            capture=capture,
+        )
+    
+    def replace(self, **changes):
+        """Kopie van het plan met andere waarden (bijv. werkmap van een worktree, env van een instance)."""
+        fields = {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+        fields.update(changes)
+        return LaunchPlan(**fields)
+    
+    def tmux_commands(self):
+        """tmux commando's (argumentenlijsten) die dit plan uitvoeren; één keer opgebouwd."""
+        if self._tmux_commands is None:
+            self._tmux_commands = self._build_tmux_commands()
+        return self._tmux_commands
+    
+    def _build_tmux_commands(self):
+        # Exacte match op sessienaam; met ':' erachter voor de actieve pane
+        pane_target = f"={self.session_name}:"
+        env_args = [arg for name, value in self.env for arg in ("-e", f"{name}={value}")]
+        if self.mode == "direct":
+            return self._build_direct_commands(pane_target, env_args)
+        
+        # Maak nieuwe lege tmux sessie
+        commands = [["new-session", "-d", "-s", self.session_name, *env_args]]
+        commands.extend(self._tag_commands())
+        commands.extend(self._capture_commands(pane_target))
+        if self.remain_on_exit:
+            commands.append(["set-option", "-w", "-t", pane_target, "remain-on-exit", "on"])
+        for index, cmd in enumerate(self.panes):
+            # Extra panes voor resterende commando's (naast elkaar)
+            if index > 0:
+                commands.append(["split-window", "-h", "-t", pane_target, *env_args])
+                commands.extend(self._capture_commands(pane_target))
+            commands.extend([
+                ["send-keys", "-t", pane_target, "-l", f"cd \"{self.workdir}\""],
+                ["send-keys", "-t", pane_target, "C-m"],
+                ["send-keys", "-t", pane_target, "-l", cmd],
+                ["send-keys", "-t", pane_target, "C-m"],
+            ])
+        
+        # Zet layout
+        commands.append(["select-layout", "-t", pane_target, self.layout])
+        return commands
+    
+    def _build_direct_commands(self, pane_target, env_args):
+        # Elke pane draait direct zijn commando in de werkmap (geen getypte cd)
+        pane_args = ["-c", self.workdir, *env_args]
+        commands = [["new-session", "-d", "-s", self.session_name, *pane_args, self.panes[0]]]
+        commands.extend(self._tag_commands())
+        commands.extend(self._capture_commands(pane_target))
+        # In dezelfde commandolijst, dus vóórdat tmux een gestopte pane kan opruimen
+        if self.remain_on_exit:
+            commands.append(["set-option", "-w", "-t", pane_target, "remain-on-exit", "on"])
+        for cmd in self.panes[1:]:
+            commands.append(["split-window", "-h", "-t", pane_target, *pane_args, cmd])
+            commands.extend(self._capture_commands(pane_target))
+        commands.append(["select-layout", "-t", pane_target, self.layout])
+        return commands
+    
+    def _tag_commands(self):
+        return [["set-option", "-t", f"={self.session_name}:", name, value] for name, value in self.tags]
+    
+    def _capture_commands(self, pane_target):
+        # Na new-session/split-window is de nieuwe pane de actieve pane
+        if not self.capture:
+            return []
+        return [["pipe-pane", "-o", "-t", pane_target, self.capture]]
+    
+    def script(self):
+        """Het plan als tmux script (uit te voeren met `tmux source-file`)."""
+        lines = [f"# Launch plan voor sessie '{self.session_name}' (werkmap {self.workdir})"]
+        lines.extend(shlex.join(command) for command in self.tmux_commands())
+        return "\n".join(lines) + "\n"
+    
+    def __repr__(self):
+        return f"LaunchPlan({self.session_name!r}, panes={len(self.panes)}, workdir={self.workdir!r})"
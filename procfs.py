@@ -0,0 +1,312 @@
+"""
+Procesinformatie uit /proc (Linux).
+Vervangt `lsof -ti :port` per poort door één scan die alle poorten tegelijk beantwoordt.
+"""
+
+import os
+import time
+
+PROC = "/proc"
+
+# Socket state LISTEN in /proc/net/tcp{,6}
+TCP_LISTEN = "0A"
+
+
+def available(proc_root=PROC):
+    """True als /proc met netwerkinformatie beschikbaar is (niet op macOS)."""
+    return os.path.exists(os.path.join(proc_root, "net", "tcp"))
+
+
+def process_name(pid, proc_root=PROC):
+    """Naam van een proces uit /proc/<pid>/comm (of None)."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "comm")) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def listening_sockets(proc_root=PROC):
+    """Parse /proc/net/tcp en tcp6 naar {socket inode: poort} voor LISTEN sockets."""
+    sockets = {}
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(proc_root, "net", table)) as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10 or fields[3] != TCP_LISTEN:
+                        continue
+                    port = int(fields[1].rsplit(":", 1)[1], 16)
+                    inode = int(fields[9])
+                    if inode:
+                        sockets[inode] = port
+        except OSError:
+            continue
+    return sockets
+
+
+def socket_owners(inodes, proc_root=PROC):
+    """Eén pass over /proc/*/fd: {socket inode: set(pids)} voor de gevraagde inodes."""
+    owners = {}
+    if not inodes:
+        return owners
+    try:
+        pids = [entry for entry in os.listdir(proc_root) if entry.isdigit()]
+    except OSError:
+        return owners
+    for pid in pids:
+        fd_dir = os.path.join(proc_root, pid, "fd")
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            # Proces is weg of niet van ons
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                inode = int(target[8:-1])
+                if inode in inodes:
+                    owners.setdefault(inode, set()).add(int(pid))
+    return owners
+
+
+class PortIndex:
+    """Wie luistert er op welke poort: socket inode -> poort -> PIDs."""
+    
+    def __init__(self, owners=None, listening=None):
+        # Poort -> set met PIDs die op die poort luisteren
+        self.owners = owners or {}
+        # Alle poorten waarop geluisterd wordt, ook als de eigenaar onleesbaar is
+        self.listening = set(listening if listening is not None else self.owners)
+    
+    @classmethod
+    def scan(cls, ports=None, proc_root=PROC):
+        """Bouwt de index in één pass; beperkt tot `ports` als die gegeven zijn.
+        
+        /proc/*/fd wordt alleen doorlopen als er op een gevraagde poort
+        daadwerkelijk geluisterd wordt.
+        """
+        wanted = set(ports) if ports is not None else None
+        sockets = {
+            inode: port for inode, port in listening_sockets(proc_root).items()
+            if wanted is None or port in wanted
+        }
+        owners = {}
+        for inode, pids in socket_owners(set(sockets), proc_root).items():
+            owners.setdefault(sockets[inode], set()).update(pids)
+        return cls(owners, listening=set(sockets.values()))
+    
+    def pids_for(self, ports):
+        """Alle PIDs die op één van de poorten luisteren."""
+        pids = set()
+        for port in ports:
+            pids.update(self.owners.get(port, ()))
+        return pids
+    
+    def conflicts(self, ports):
+        """{poort: PIDs} voor de poorten die bezet zijn (PIDs leeg als onbekend)."""
+        return {port: self.owners.get(port, set()) for port in ports if port in self.listening}
+
+
+def read_stat(pid, proc_root=PROC):
+    """Parse /proc/<pid>/stat naar (state, ppid, pgid) of None als het proces weg is."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "stat")) as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm staat tussen haakjes en kan zelf spaties of haakjes bevatten
+    fields = data[data.rfind(")") + 2:].split()
+    if len(fields) < 3:
+        return None
+    return fields[0], int(fields[1]), int(fields[2])
+
+
+def is_alive(pid, proc_root=PROC):
+    """True als het proces bestaat en geen zombie is."""
+    stat = read_stat(pid, proc_root)
+    if stat is None:
+        if available(proc_root):
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    return stat[0] != "Z"
+
+
+class ProcessTable:
+    """Momentopname van alle processen: pid -> (state, ppid, pgid)."""
+    
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+        self._children = None
+    
+    @classmethod
+    def scan(cls, proc_root=PROC):
+        entries = {}
+        try:
+            pids = [int(entry) for entry in os.listdir(proc_root) if entry.isdigit()]
+        except OSError:
+            return cls()
+        for pid in pids:
+            stat = read_stat(pid, proc_root)
+            if stat is not None:
+                entries[pid] = stat
+        return cls(entries)
+    
+    @property
+    def children(self):
+        """ppid -> lijst met kind-PIDs (lazy opgebouwd)."""
+        if self._children is None:
+            children = {}
+            for pid, (_, ppid, _) in self.entries.items():
+                children.setdefault(ppid, []).append(pid)
+            self._children = children
+        return self._children
+    
+    def pgid(self, pid):
+        entry = self.entries.get(pid)
+        return entry[2] if entry else None
+    
+    def descendants(self, roots, include_roots=True):
+        """Alle (klein)kinderen van de roots, optioneel inclusief de roots zelf."""
+        result = set()
+        stack = [pid for pid in roots if pid in self.entries]
+        if include_roots:
+            result.update(stack)
+        while stack:
+            for child in self.children.get(stack.pop(), ()):
+                if child not in result:
+                    result.add(child)
+                    stack.append(child)
+        return result
+
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def read_usage(pid, proc_root=PROC):
+    """(cpu ticks, rss bytes, starttime) uit /proc/<pid>/stat, of None als het proces weg is.
+    
+    rss staat ook in stat (zelfde waarde als statm resident), dus één read per proces.
+    """
+    try:
+        with open(os.path.join(proc_root, str(pid), "stat")) as f:
+            data = f.read()
+    except OSError:
+        return None
+    fields = data[data.rfind(")") + 2:].split()
+    if len(fields) < 22:
+        return None
+    # utime + stime, starttime en rss (in pages); indices relatief aan state
+    return int(fields[11]) + int(fields[12]), int(fields[21]) * PAGE_SIZE, int(fields[19])
+
+
+def read_children(pid, proc_root=PROC):
+    """Kinderen van de hoofdthread uit /proc/<pid>/task/<pid>/children (None als niet beschikbaar)."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "task", str(pid), "children")) as f:
+            return frozenset(int(child) for child in f.read().split())
+    except OSError:
+        return None
+
+
+class ResourceUsage:
+    """CPU en geheugen van een groep processen."""
+    
+    def __init__(self, cpu_percent=0.0, rss_bytes=0, processes=0):
+        self.cpu_percent = cpu_percent
+        self.rss_bytes = rss_bytes
+        self.processes = processes
+    
+    def describe(self):
+        return f"{self.cpu_percent:.0f}% · {self.rss_bytes / (1024 * 1024):.0f} MB"
+
+
+class ResourceSampler:
+    """Incrementele CPU%/RSS sampler per groep procesbomen.
+    
+    De boomstructuur onder de roots wordt tussen ticks gecachet. Per tick wordt
+    alleen per bekend proces het children bestand gelezen; pas als die set
+    verandert (of een proces verdwijnt) volgt een volledige /proc scan.
+    """
+    
+    # Vangnet voor kinderen die door een andere thread dan de hoofdthread zijn gestart
+    RESCAN_EVERY = 20
+    
+    def __init__(self, proc_root=PROC):
+        self.proc_root = proc_root
+        self._roots = frozenset()
+        self._trees = {}      # root -> set met pids in de boom
+        self._children = {}   # pid -> children volgens het children bestand
+        self._last = {}       # (pid, starttime) -> cpu ticks bij vorige tick
+        self._last_time = None
+        self._ticks = 0
+        self.rescans = 0
+    
+    def _tree_changed(self):
+        for pid, children in self._children.items():
+            current = read_children(pid, self.proc_root)
+            if current is None or current != children:
+                return True
+        return False
+    
+    def _rescan(self, roots):
+        table = ProcessTable.scan(self.proc_root)
+        self._trees = {root: table.descendants([root]) for root in roots}
+        self._children = {}
+        for tree in self._trees.values():
+            for pid in tree:
+                self._children[pid] = read_children(pid, self.proc_root)
+        self.rescans += 1
+    
+    def sample(self, roots_by_key):
+        """roots_by_key: {naam: [root pids]} -> {naam: ResourceUsage}."""
+        now = time.monotonic()
+        roots = frozenset(pid for pids in roots_by_key.values() for pid in pids)
+        if (
+            roots != self._roots
+            or self._ticks % self.RESCAN_EVERY == 0
+            or None in self._children.values()
+            or self._tree_changed()
+        ):
+            self._rescan(roots)
+            self._roots = roots
+        self._ticks += 1
+        
+        elapsed = now - self._last_time if self._last_time is not None else None
+        current = {}
+        usage = {}
+        for key, key_roots in roots_by_key.items():
+            pids = set()
+            for root in key_roots:
+                pids |= self._trees.get(root, set())
+            total = ResourceUsage()
+            delta_ticks = 0
+            for pid in pids:
+                stat = read_usage(pid, self.proc_root)
+                if stat is None:
+                    continue
+                ticks, rss, starttime = stat
+                current[(pid, starttime)] = ticks
+                previous = self._last.get((pid, starttime))
+                if previous is not None:
+                    delta_ticks += ticks - previous
+                total.rss_bytes += rss
+                total.processes += 1
+            if elapsed:
+                total.cpu_percent = delta_ticks / CLOCK_TICKS / elapsed * 100
+            usage[key] = total
+        
+        self._last = current
+        self._last_time = now
+        return usage
@@ -0,0 +1,120 @@
+"""
+Readiness probes op de geconfigureerde poorten van apps.
+Non-blocking TCP/HTTP checks met asyncio en exponentiële backoff; alle poorten
+van alle apps worden in één event loop tegelijk gecontroleerd.
+"""
+
+import asyncio
+import time
+
+# Dev servers luisteren soms alleen op IPv4 of alleen op IPv6 (localhost)
+HOSTS = ("127.0.0.1", "::1")
+
+DEFAULT_TIMEOUT = 180.0  # seconden; nx serve moet eerst compileren
+INITIAL_DELAY = 0.1
+MAX_DELAY = 2.0
+CONNECT_TIMEOUT = 1.0
+
+
+class AppReadiness:
+    """Resultaat van het wachten op één app."""
+    
+    def __init__(self, name, ready_at=None, pending=()):
+        self.name = name
+        # time.monotonic() waarop de laatste poort klaar was (None bij timeout)
+        self.ready_at = ready_at
+        self.pending = list(pending)
+    
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+
+async def probe_tcp(port, host):
+    """True als er op host:port een TCP verbinding geaccepteerd wordt."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def probe_http(port, host, path="/"):
+    """True als host:port een HTTP antwoord geeft (elke status onder 500)."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        request = f"GET {path} HTTP/1.0\r\nHost: localhost\r\n\r\n"
+        writer.write(request.encode("ascii"))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+    parts = status_line.split()
+    return len(parts) >= 2 and parts[0].startswith(b"HTTP/") and parts[1][:1] in b"1234"
+
+
+PROBES = {
+    "tcp": probe_tcp,
+    "http": probe_http,
+}
+
+
+async def wait_port(port, kind="tcp", deadline=None, cancel=None):
+    """Probeert een poort met backoff tot hij klaar is; geeft het tijdstip terug (of None).
+    
+    cancel is een optionele threading.Event waarmee het wachten afgebroken wordt.
+    """
+    probe = PROBES[kind]
+    delay = INITIAL_DELAY
+    while True:
+        for host in HOSTS:
+            if await probe(port, host):
+                return time.monotonic()
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        if cancel is not None and cancel.is_set():
+            return None
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_DELAY)
+
+
+async def _wait_app(name, probes, deadline, cancel):
+    results = await asyncio.gather(*(
+        wait_port(port, kind, deadline, cancel) for port, kind in probes
+    ))
+    pending = [port for (port, _), ready_at in zip(probes, results) if ready_at is None]
+    if pending:
+        return AppReadiness(name, pending=pending)
+    return AppReadiness(name, ready_at=max(results, default=time.monotonic()))
+
+
+async def wait_for_apps_async(apps, timeout=DEFAULT_TIMEOUT, cancel=None):
+    """apps: {naam: [(poort, soort), ...]} -> {naam: AppReadiness}."""
+    deadline = time.monotonic() + timeout
+    results = await asyncio.gather(*(
+        _wait_app(name, probes, deadline, cancel) for name, probes in apps.items()
+    ))
+    return {result.name: result for result in results}
+
+
+def wait_for_apps(apps, timeout=DEFAULT_TIMEOUT, cancel=None):
+    """Blokkerende variant voor achtergrond-threads (eigen event loop per aanroep)."""
+    if not apps:
+        return {}
+    return asyncio.run(wait_for_apps_async(apps, timeout, cancel))
+
+
+def app_probes(app):
+    """Probes voor een app uit de configuratie: `probe` is "tcp" (standaard) of "http"."""
+    kind = app.get("probe", "tcp")
+    return [(port, kind) for port in app.get("ports", [])]
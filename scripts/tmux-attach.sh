@@ -1,5 +1,6 @@
 #!/bin/bash
 # Script om te verbinden met een tmux sessie in de juiste terminal emulator
+# Dunne wrapper om cli.py zodat de logica op één plek staat
 
 SESSION_NAME="$1"
 
@@ -8,27 +9,5 @@ if [ -z "$SESSION_NAME" ]; then
     exit 1
 fi
 
-# Controleer of sessie bestaat
-if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
-    echo "Sessie '$SESSION_NAME' bestaat niet" >&2
-    exit 1
-fi
-
-# Detecteer terminal emulator (prioriteit: kitty > alacritty > foot > gnome-terminal > xterm)
-if command -v kitty &> /dev/null; then
-    kitty tmux attach-session -t "$SESSION_NAME" &
-elif command -v alacritty &> /dev/null; then
-    alacritty -e tmux attach-session -t "$SESSION_NAME" &
-elif command -v foot &> /dev/null; then
-    foot tmux attach-session -t "$SESSION_NAME" &
-elif command -v gnome-terminal &> /dev/null; then
-    gnome-terminal -- tmux attach-session -t "$SESSION_NAME" &
-elif command -v xterm &> /dev/null; then
-    xterm -e tmux attach-session -t "$SESSION_NAME" &
-else
-    # Fallback: gebruik standaard terminal
-    tmux attach-session -t "$SESSION_NAME"
-fi
-
-exit 0
-
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+exec python3 "${SCRIPT_DIR}/../cli.py" attach "$SESSION_NAME"
@@ -1,10 +1,11 @@
 #!/usr/bin/env bash
 set -u
 
-# Script om een tmux sessie te beëindigen
-# Optioneel met poort killing en cleanup
+# Script om een tmux sessie te beëindigen inclusief alle processen eronder
+# Optioneel met poorten die ook vrijgemaakt worden
+# Dunne wrapper om cli.py zodat de logica op één plek staat
 
-SESSION_NAME="$1"
+SESSION_NAME="${1:-}"
 PORTS=()
 
 # Parse optionele poorten (--ports 4200 8000 of --ports=4200,8000)
@@ -34,37 +35,8 @@ if [ -z "$SESSION_NAME" ]; then
     exit 1
 fi
 
-# Source shared functions als die bestaan
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-if [ -f "${SCRIPT_DIR}/.scripts-common.sh" ]; then
-    source "${SCRIPT_DIR}/.scripts-common.sh"
-    
-    # Gebruik shared functions
-    if [ ${#PORTS[@]} -gt 0 ]; then
-        kill_ports "${PORTS[@]}"
-    fi
-    
-    kill_tmux_session "$SESSION_NAME"
-    
-    # Optioneel: cleanup zombie processen
-    # cleanup_zombie_processes
-    
-    exit 0
-else
-    # Fallback: gebruik basis functionaliteit
-    if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
-        echo "Sessie '$SESSION_NAME' bestaat niet" >&2
-        exit 1
-    fi
-    
-    tmux kill-session -t "$SESSION_NAME"
-    
-    if [ $? -eq 0 ]; then
-        echo "Sessie '$SESSION_NAME' is beëindigd"
-        exit 0
-    else
-        echo "Fout bij beëindigen van sessie '$SESSION_NAME'" >&2
-        exit 1
-    fi
+if [ ${#PORTS[@]} -gt 0 ]; then
+    exec python3 "${SCRIPT_DIR}/../cli.py" stop "$SESSION_NAME" --ports "${PORTS[@]}"
 fi
-
+exec python3 "${SCRIPT_DIR}/../cli.py" stop "$SESSION_NAME"
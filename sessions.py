@@ -0,0 +1,119 @@
+"""
+Sessie-status voor de Tmux Manager applicatie.
+Eén `tmux list-panes -a` per verversing in plaats van één `has-session` per app.
+"""
+
+import threading
+import time
+
+import instances
+from tmux_control import TmuxError
+
+
+class SessionSnapshot:
+    """Momentopname van alle tmux sessies en hun panes."""
+    
+    # Formaat voor `tmux list-panes -a -F`: één regel per pane, met de session
+    # options van een app instance (leeg voor gewone sessies)
+    FORMAT = "\t".join([
+        "#{session_name}", "#{pane_pid}", "#{pane_index}", "#{pane_dead}", "#{pane_dead_status}",
+        f"#{{{instances.OPTION_APP}}}", f"#{{{instances.OPTION_INSTANCE}}}",
+        f"#{{{instances.OPTION_PORTS}}}", f"#{{{instances.OPTION_WORKTREE}}}",
+    ])
+    
+    def __init__(self, panes=None, taken_at=None, exits=None, instances=None):
+        # Sessienaam -> lijst met PIDs van levende panes
+        self.panes = panes or {}
+        # Sessienaam -> {pane index: exit code} voor panes waarvan het commando
+        # gestopt is (alleen zichtbaar met remain-on-exit)
+        self.exits = exits or {}
+        # Sessienaam -> (app, instance, poorten, worktree) voor instance sessies
+        self.instances = instances or {}
+        self.taken_at = taken_at if taken_at is not None else time.monotonic()
+    
+    @classmethod
+    def parse(cls, output, hidden=()):
+        """Parse de output van `tmux list-panes -a -F FORMAT`."""
+        panes = {}
+        exits = {}
+        tagged = {}
+        for line in output.splitlines():
+            (session_name, pane_pid, pane_index, pane_dead, dead_status,
+             app_name, instance, ports, worktree) = (line.split("\t") + [""] * 8)[:9]
+            if not session_name or session_name in hidden:
+                continue
+            if app_name and instance:
+                tagged[session_name] = (app_name, instance, instances.parse_ports(ports), worktree or None)
+            pids = panes.setdefault(session_name, [])
+            if pane_dead == "1":
+                status = int(dead_status) if dead_status.lstrip("-").isdigit() else None
+                exits.setdefault(session_name, {})[int(pane_index or 0)] = status
+            elif pane_pid.isdigit():
+                pids.append(int(pane_pid))
+        return cls(panes, exits=exits, instances=tagged)
+    
+    @property
+    def sessions(self):
+        """Namen van alle actieve sessies."""
+        return set(self.panes)
+    
+    def is_active(self, session_name):
+        """Exacte match op sessienaam (geen prefix-match zoals `has-session`)."""
+        return session_name in self.panes
+    
+    def pane_pids(self, session_name):
+        """PIDs van de panes in een sessie (leeg als de sessie niet bestaat)."""
+        return list(self.panes.get(session_name, []))
+    
+    def instance(self, session_name):
+        """(app, instance, poorten, worktree) van een instance sessie, of None."""
+        return self.instances.get(session_name)
+    
+    def exit_statuses(self, session_name):
+        """{pane index: exit code} van gestopte panes in een sessie (None: door signaal)."""
+        return dict(self.exits.get(session_name, {}))
+
+
+class SessionCache:
+    """Cachet de laatste SessionSnapshot met een korte TTL."""
+    
+    TTL = 1.0  # seconden
+    
+    def __init__(self, tmux, ttl=None):
+        self.tmux = tmux
+        self.ttl = self.TTL if ttl is None else ttl
+        self._snapshot = None
+        self._lock = threading.Lock()
+    
+    def _take_snapshot(self):
+        try:
+            result = self.tmux.run("list-panes", "-a", "-F", SessionSnapshot.FORMAT)
+        except (OSError, TmuxError):
+            return SessionSnapshot()
+        if not result.ok:
+            # Geen tmux server actief -> geen sessies
+            return SessionSnapshot()
+        # De eigen control-mode sessie hoort niet in het overzicht
+        return SessionSnapshot.parse(result.output, hidden=(self.tmux.SESSION,))
+    
+    def get(self, max_age=None):
+        """Geeft een snapshot die niet ouder is dan max_age (standaard de TTL)."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.taken_at > max_age:
+                snapshot = self._take_snapshot()
+                self._snapshot = snapshot
+            return snapshot
+    
+    def refresh(self):
+        """Forceer een nieuwe snapshot."""
+        return self.get(max_age=0)
+    
+    def invalidate(self):
+        """Gooi de cache weg, bijvoorbeeld na het starten of stoppen van een sessie."""
+        with self._lock:
+            self._snapshot = None
+    
+    def is_active(self, session_name):
+        return self.get().is_active(session_name)
@@ -26,6 +26,9 @@ class ColorScheme:
     # Statuskleuren
     STATUS_ACTIVE = "#2ecc71"
     STATUS_INACTIVE = "#8a8f98"
+    STATUS_CONFLICT = "#ea3734"
+    STATUS_EXITED = "#e5a50a"
+    STATUS_BUILDING = "#5e6ad2"
     
     # Status label kleuren
     STATUS_INFO = "#5e6ad2"
@@ -53,26 +56,47 @@ class Icons:
     # Status indicator iconen:
     STATUS_ACTIVE = "●"  # Black Circle (U+25CF)
     STATUS_INACTIVE = "○"  # White Circle (U+25CB)
+    STATUS_CONFLICT = "◉"  # Fisheye (U+25C9) - poort bezet terwijl app niet draait
+    STATUS_EXITED = "◐"  # Circle with Left Half Black (U+25D0) - commando in een pane gestopt
+    STATUS_BUILDING = "◌"  # Dotted Circle (U+25CC) - pane output meldt dat er gebouwd wordt
+    
+    LOGS = "≡"  # Identical To (U+2261) - logs van de panes
 
 
 class Styles:
-    """Stylesheet strings voor UI componenten."""
+    """Eén stylesheet voor de hele applicatie.
     
-    @staticmethod
-    def get_central_widget() -> str:
-        """Stylesheet voor central widget (hoofdachtergrond)."""
-        return f"background-color: {ColorScheme.BACKGROUND};"
+    Widgets worden geselecteerd op objectName; wisselende toestanden gaan via
+    dynamic properties (bijv. `level`). Qt parset de stylesheet één keer; een
+    widget die van toestand wisselt zet alleen een property en wordt opnieuw
+    gepolished (zie set_property). De app-rijen zijn geen widgets: kaart, hover
+    en selectie komen uit de ::item regels, kleuren en lettertypes per cel uit
+    de data roles die applist.AppListModel met ColorScheme vult.
+    """
+    
+    _application = None
     
     @staticmethod
-    def get_title_label() -> str:
-        """Stylesheet voor titel label."""
-        return f"color: {ColorScheme.TEXT_PRIMARY}; margin: 10px 15px;"
+    def get_application() -> str:
+        """Stylesheet voor QApplication.setStyleSheet (één keer opgebouwd)."""
+        if Styles._application is None:
+            Styles._application = Styles._build_application()
+        return Styles._application
     
     @staticmethod
-    def get_refresh_button() -> str:
-        """Stylesheet voor refresh knop."""
+    def _build_application() -> str:
         return f"""
-            QPushButton {{
+            /* Hoofdachtergrond */
+            QWidget#centralWidget {{
+                background-color: {ColorScheme.BACKGROUND};
+            }}
+            QLabel#titleLabel {{
+                color: {ColorScheme.TEXT_PRIMARY};
+                margin: 10px 15px;
+            }}
+            
+            /* Primaire knoppen (Vernieuwen, Start alle, New Branch) */
+            QPushButton#primaryButton {{
                 background-color: {ColorScheme.PRIMARY};
                 color: #ffffff;
                 border: none;
@@ -80,167 +104,72 @@ class Styles:
                 border-radius: 4px;
                 font-weight: bold;
             }}
-            QPushButton:hover {{
+            QPushButton#primaryButton:hover {{
                 background-color: {ColorScheme.PRIMARY_HOVER};
             }}
-        """
-    
-    @staticmethod
-    def get_scroll_area() -> str:
-        """Stylesheet voor scroll area."""
-        return "QScrollArea { border: none; padding: 0px; }"
-    
-    @staticmethod
-    def get_status_label(default_color: str = None) -> str:
-        """Stylesheet voor status label."""
-        color = default_color or ColorScheme.TEXT_SECONDARY
-        return f"""
-            color: {color};
-            font-size: 10pt;
-            padding: 4px;
-            margin-top: 5px;
-        """
-    
-    @staticmethod
-    def get_status_label_info() -> str:
-        """Status label met info kleur."""
-        return Styles.get_status_label(ColorScheme.STATUS_INFO)
-    
-    @staticmethod
-    def get_status_label_success() -> str:
-        """Status label met success kleur."""
-        return Styles.get_status_label(ColorScheme.STATUS_SUCCESS)
-    
-    @staticmethod
-    def get_status_label_error() -> str:
-        """Status label met error kleur."""
-        return Styles.get_status_label(ColorScheme.STATUS_ERROR)
-    
-    @staticmethod
-    def get_no_apps_label() -> str:
-        """Stylesheet voor 'geen apps' label."""
-        return f"""
-            color: {ColorScheme.TEXT_SECONDARY};
-            font-size: 12pt;
-            padding: 30px;
-            background-color: {ColorScheme.CARD_BACKGROUND};
-            border: 1px solid {ColorScheme.CARD_BORDER};
-            border-radius: 5px;
-        """
-    
-    @staticmethod
-    def get_app_widget() -> str:
-        """Stylesheet voor app widget container."""
-        return f"""
-            QWidget {{
-                background-color: {ColorScheme.CARD_BACKGROUND};
-                border: 1px solid {ColorScheme.CARD_BORDER};
-                border-radius: 8px;
-                padding: 0px;
+            
+            /* Status label onderaan; kleur via de property level */
+            QLabel#statusLabel {{
+                color: {ColorScheme.TEXT_SECONDARY};
+                font-size: 10pt;
+                padding: 4px;
+                margin-top: 5px;
             }}
-            QWidget:hover {{
-                background-color: {ColorScheme.CARD_HOVER};
-                border-color: {ColorScheme.CARD_BORDER_HOVER};
+            QLabel#statusLabel[level="info"] {{
+                color: {ColorScheme.STATUS_INFO};
             }}
-        """
-    
-    @staticmethod
-    def get_status_indicator(is_active: bool) -> str:
-        """Stylesheet voor status indicator (●/○)."""
-        color = ColorScheme.STATUS_ACTIVE if is_active else ColorScheme.STATUS_INACTIVE
-        return f"""
-            font-size: 16px;
-            color: {color};
-            padding: 0px 8px 0px 0px;
-            background-color: transparent;
-            border: none;
-            text-align: center;
-        """
-    
-    @staticmethod
-    def get_name_label() -> str:
-        """Stylesheet voor app naam label."""
-        return f"""
-            font-size: 13pt;
-            font-weight: 500;
-            color: {ColorScheme.TEXT_PRIMARY};
-            padding: 0px;
-            border: none;
-            background-color: transparent;
-        """
-    
-    @staticmethod
-    def get_attach_button() -> str:
-        """Stylesheet voor attach/verbinden knop."""
-        return f"""
-            QToolButton {{
-                background-color: transparent;
-                color: {ColorScheme.PRIMARY};
-                border: none;
-                border-radius: 16px;
-                font-size: 16px;
-                font-weight: bold;
+            QLabel#statusLabel[level="success"] {{
+                color: {ColorScheme.STATUS_SUCCESS};
             }}
-            QToolButton:hover {{
-                background-color: {ColorScheme.PRIMARY};
-                color: #ffffff;
+            QLabel#statusLabel[level="error"] {{
+                color: {ColorScheme.STATUS_ERROR};
             }}
-        """
-    
-    @staticmethod
-    def get_kill_button() -> str:
-        """Stylesheet voor kill/stop knop."""
-        return f"""
-            QToolButton {{
-                background-color: transparent;
+            
+            QLabel#noAppsLabel {{
                 color: {ColorScheme.TEXT_SECONDARY};
+                font-size: 12pt;
+                padding: 30px;
+                background-color: {ColorScheme.CARD_BACKGROUND};
+                border: 1px solid {ColorScheme.CARD_BORDER};
+                border-radius: 5px;
+            }}
+            
+            /* Lijst met apps; de standaard delegate tekent de cellen uit hun data roles (applist.py) */
+            QTreeView#appsList {{
+                background-color: {ColorScheme.BACKGROUND};
                 border: none;
-                border-radius: 16px;
-                font-size: 18px;
-                font-weight: bold;
+                outline: none;
+                selection-color: {ColorScheme.TEXT_PRIMARY};
             }}
-            QToolButton:hover {{
-                background-color: {ColorScheme.ERROR};
-                color: #ffffff;
+            QTreeView#appsList::item {{
+                background-color: {ColorScheme.CARD_BACKGROUND};
+                border-top: 1px solid {ColorScheme.CARD_BORDER};
+                border-bottom: 4px solid {ColorScheme.BACKGROUND};
             }}
-        """
-    
-    @staticmethod
-    def get_start_button() -> str:
-        """Stylesheet voor start knop."""
-        return f"""
-            QToolButton {{
-                background-color: transparent;
-                color: {ColorScheme.SUCCESS};
-                border: none;
-                border-radius: 16px;
-                font-size: 16px;
-                font-weight: bold;
+            QTreeView#appsList::item:hover {{
+                background-color: {ColorScheme.CARD_HOVER};
+                border-top-color: {ColorScheme.CARD_BORDER_HOVER};
             }}
-            QToolButton:hover {{
-                background-color: {ColorScheme.SUCCESS};
-                color: #ffffff;
+            QTreeView#appsList::item:selected {{
+                background-color: {ColorScheme.CARD_HOVER};
+                border-top-color: {ColorScheme.PRIMARY};
             }}
-        """
-    
-    @staticmethod
-    def get_separator() -> str:
-        """Stylesheet voor separator/HR lijn."""
-        return f"""
-            QLabel {{
+            
+            /* Separator/HR lijn */
+            QLabel#separator {{
                 background-color: {ColorScheme.CARD_BORDER};
                 border: none;
                 min-height: 1px;
                 max-height: 1px;
                 margin: 10px 0px;
             }}
-        """
-    
-    @staticmethod
-    def get_new_branch_input() -> str:
-        """Stylesheet voor new branch input field."""
-        return f"""
-            QLineEdit {{
+            
+            /* Filter boven de lijst en New Branch sectie */
+            QLabel#branchLabel {{
+                color: {ColorScheme.TEXT_PRIMARY};
+                font-size: 11pt;
+            }}
+            QLineEdit#branchInput, QLineEdit#filterInput {{
                 background-color: {ColorScheme.CARD_BACKGROUND};
                 color: {ColorScheme.TEXT_PRIMARY};
                 border: 1px solid {ColorScheme.CARD_BORDER};
@@ -248,25 +177,52 @@ class Styles:
                 padding: 8px;
                 font-size: 11pt;
             }}
-            QLineEdit:focus {{
+            QLineEdit#branchInput:focus, QLineEdit#filterInput:focus {{
                 border-color: {ColorScheme.PRIMARY};
             }}
-        """
-    
-    @staticmethod
-    def get_new_branch_button() -> str:
-        """Stylesheet voor new branch knop."""
-        return f"""
-            QPushButton {{
+            QCheckBox#worktreeCheckbox {{
+                color: {ColorScheme.TEXT_SECONDARY};
+                font-size: 10pt;
+            }}
+            
+            /* Worktrees venster, logviewer en debug paneel */
+            QDialog#worktreeDialog, QDialog#logViewer, QDialog#commandPanel {{
+                background-color: {ColorScheme.BACKGROUND};
+            }}
+            QListWidget#worktreeList, QComboBox#worktreeAppBox, QComboBox#logSelector,
+            QPlainTextEdit#logText, QTableWidget#commandTable, QPlainTextEdit#commandRecent {{
+                background-color: {ColorScheme.CARD_BACKGROUND};
+                color: {ColorScheme.TEXT_PRIMARY};
+                border: 1px solid {ColorScheme.CARD_BORDER};
+                border-radius: 4px;
+                padding: 4px;
+                font-size: 10pt;
+            }}
+            QListWidget#worktreeList::item:selected, QTableWidget#commandTable::item:selected {{
                 background-color: {ColorScheme.PRIMARY};
-                color: #ffffff;
+            }}
+            QTableWidget#commandTable {{
+                gridline-color: {ColorScheme.CARD_BORDER};
+            }}
+            QTableWidget#commandTable QHeaderView::section {{
+                background-color: {ColorScheme.BACKGROUND};
+                color: {ColorScheme.TEXT_SECONDARY};
                 border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-weight: bold;
+                padding: 4px;
             }}
-            QPushButton:hover {{
-                background-color: {ColorScheme.PRIMARY_HOVER};
+            QLabel#commandTotals {{
+                color: {ColorScheme.TEXT_SECONDARY};
+                font-size: 10pt;
             }}
         """
-
+    
+    @staticmethod
+    def set_property(widget, name, value) -> bool:
+        """Zet een dynamic property en polisht de widget alleen als de waarde wijzigt."""
+        if widget.property(name) == value:
+            return False
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        return True
@@ -0,0 +1,113 @@
+"""
+Procesboom-bewust opruimen van apps.
+Eerst SIGTERM naar de procesgroepen van de boom, dan begrensd wachten, dan SIGKILL voor wat over is.
+"""
+
+import os
+import signal
+import time
+
+import procfs
+
+
+class TeardownResult:
+    """Uitkomst van een teardown."""
+    
+    def __init__(self, targeted, survivors, killed, duration):
+        self.targeted = targeted
+        self.survivors = survivors
+        self.killed = killed
+        self.duration = duration
+    
+    @property
+    def reaped(self):
+        """Aantal processen dat na afloop weg is."""
+        return len(self.targeted) - len(self.survivors)
+    
+    def summary(self):
+        noun = "proces" if self.reaped == 1 else "processen"
+        text = f"{self.reaped} {noun} opgeruimd in {self.duration:.2f} s"
+        if self.killed:
+            text += f" ({len(self.killed)} met SIGKILL)"
+        if self.survivors:
+            text += f", {len(self.survivors)} overleefden"
+        return text
+
+
+class Teardown:
+    """Ruimt een set processen op: terminate() en daarna finish().
+    
+    Tussen beide stappen kan de aanroeper de tmux sessie killen, zodat pane
+    shells (die SIGTERM negeren) via SIGHUP verdwijnen.
+    """
+    
+    TIMEOUT = 3.0  # seconden tussen SIGTERM en SIGKILL
+    POLL_INTERVAL = 0.05
+    
+    def __init__(self, pids, table=None, foreign=()):
+        """pids: de procesboom onder de panes; foreign: overige processen (bv. op de poorten).
+        
+        Alleen procesgroepen waarvan de leider in de boom zit krijgen killpg;
+        foreign processen krijgen een signaal per pid, zodat hun (vreemde)
+        procesgroep heel blijft.
+        """
+        # Nooit onszelf of onze eigen procesgroep raken
+        own_pid = os.getpid()
+        own_pgid = os.getpgid(0)
+        tree = {pid for pid in pids if pid != own_pid and pid > 1}
+        self.pids = tree | {pid for pid in foreign if pid != own_pid and pid > 1}
+        table = table or procfs.ProcessTable.scan()
+        self.pgids = {
+            pgid for pgid in (table.pgid(pid) for pid in tree)
+            if pgid in tree and pgid != own_pgid
+        }
+        self.started = None
+    
+    @staticmethod
+    def _signal(pids, pgids, sig):
+        # killpg per groep: de signalen gaan vrijwel gelijktijdig de deur uit
+        for pgid in pgids:
+            try:
+                os.killpg(pgid, sig)
+            except OSError:
+                pass
+        # Losse signalen voor processen in een andere groep (setsid, poorteigenaren)
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except OSError:
+                pass
+    
+    def terminate(self):
+        """Stuurt SIGTERM naar de procesgroepen van de boom en alle processen."""
+        self.started = time.monotonic()
+        self._signal(self.pids, self.pgids, signal.SIGTERM)
+    
+    def finish(self, timeout=None):
+        """Wacht maximaal timeout seconden en stuurt daarna SIGKILL naar wat over is."""
+        if self.started is None:
+            self.terminate()
+        timeout = self.TIMEOUT if timeout is None else timeout
+        deadline = self.started + timeout
+        alive = {pid for pid in self.pids if procfs.is_alive(pid)}
+        while alive and time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            alive = {pid for pid in alive if procfs.is_alive(pid)}
+        
+        killed = set(alive)
+        if killed:
+            # Alleen groepen die nog levende leden hebben
+            table = procfs.ProcessTable.scan()
+            pgids = {table.pgid(pid) for pid in killed} & self.pgids
+            self._signal(killed, pgids, signal.SIGKILL)
+            kill_deadline = time.monotonic() + 1.0
+            while alive and time.monotonic() < kill_deadline:
+                time.sleep(self.POLL_INTERVAL)
+                alive = {pid for pid in alive if procfs.is_alive(pid)}
+        
+        return TeardownResult(
+            targeted=set(self.pids),
+            survivors=alive,
+            killed=killed,
+            duration=time.monotonic() - self.started,
+        )
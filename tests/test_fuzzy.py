@@ -0,0 +1,67 @@
+import random
+
+from fuzzy import FuzzyIndex
+
+
+def brute_force(entries, query):
+    """Referentie: dezelfde rangen, per entry zonder index berekend."""
+    ranked = []
+    for position, (name, text) in enumerate(entries):
+        name, text = name.lower(), text.lower()
+        worst = 0
+        for term in query.lower().split():
+            rest = iter(name)
+            if name.startswith(term):
+                tier = 0
+            elif term in name:
+                tier = 1
+            elif len(term) >= 3 and term in text:
+                tier = 2
+            elif len(term) > 1 and all(char in rest for char in term):
+                tier = 3
+            else:
+                break
+            worst = max(worst, tier)
+        else:
+            ranked.append((worst, position))
+    return [position for _, position in sorted(ranked)]
+
+
+def test_no_match_from_grams_or_pairs_alone():
+    index = FuzzyIndex([("baab", "x"), ("abba", "y"), ("xabax", "z")])
+    # "baab" bevat de tekenparen ab en ba, maar niet a-b-a in volgorde
+    assert index.search("aba") == [2, 1]
+    assert index.search("abab") == []
+
+
+def test_ranking():
+    index = FuzzyIndex([("avicii", "nx serve"), ("hakon", "nx run hakon-app:serve"), ("alice-hakon", "")])
+    assert index.search("hak") == [1, 2]
+    assert index.search("serve") == [0, 1]
+    assert index.search("hkn") == [1, 2]
+    assert index.search("") is None
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    entries = [
+        ("".join(rng.choice("abc-") for _ in range(rng.randint(1, 8))),
+         "".join(rng.choice("abc ") for _ in range(rng.randint(0, 12))))
+        for _ in range(300)
+    ]
+    index = FuzzyIndex(entries)
+    for _ in range(500):
+        query = " ".join(
+            "".join(rng.choice("abc") for _ in range(rng.randint(1, 5)))
+            for _ in range(rng.randint(1, 2))
+        )
+        assert index.search(query) == brute_force(entries, query), query
+
+
+def test_extending_query_matches_fresh_search():
+    entries = [(f"app-{word}", f"serve {word}") for word in ("hakon", "avicii", "hakon-enq", "alice")]
+    index = FuzzyIndex(entries)
+    typed = ""
+    for char in "hakon e":
+        typed += char
+        assert index.search(typed) == FuzzyIndex(entries).search(typed), typed
@@ -0,0 +1,38 @@
+import socket
+
+import pytest
+
+import instances
+
+
+def listen(family, host):
+    server = socket.socket(family, socket.SOCK_STREAM)
+    if family == socket.AF_INET6 and host == "::":
+        server.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+    server.bind((host, 0))
+    server.listen()
+    return server
+
+
+def test_port_free_sees_ipv4_listener():
+    with listen(socket.AF_INET, "127.0.0.1") as server:
+        port = server.getsockname()[1]
+        assert not instances.port_free(port)
+    assert instances.port_free(port)
+
+
+@pytest.mark.skipif(not socket.has_ipv6, reason="geen IPv6")
+@pytest.mark.parametrize("host", ["::1", "::"])
+def test_port_free_sees_ipv6_only_listener(host):
+    try:
+        server = listen(socket.AF_INET6, host)
+    except OSError:
+        pytest.skip(f"{host} niet beschikbaar")
+    with server:
+        assert not instances.port_free(server.getsockname()[1])
+
+
+def test_allocate_ports_skips_taken_block():
+    taken = {5200}
+    block = instances.allocate_ports([4200, 8000], reserved=set(), is_free=lambda port: port not in taken)
+    assert block == [6200, 10000]
@@ -0,0 +1,55 @@
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+import procfs
+
+pytestmark = pytest.mark.skipif(not procfs.available(), reason="geen /proc/net/tcp")
+
+
+def listen(family, host):
+    server = socket.socket(family, socket.SOCK_STREAM)
+    server.bind((host, 0))
+    server.listen()
+    return server
+
+
+def test_port_index_finds_ipv4_listener():
+    with listen(socket.AF_INET, "127.0.0.1") as server:
+        port = server.getsockname()[1]
+        index = procfs.PortIndex.scan([port])
+        assert index.pids_for([port]) == {os.getpid()}
+        assert index.conflicts([port]) == {port: {os.getpid()}}
+
+
+@pytest.mark.skipif(not socket.has_ipv6, reason="geen IPv6")
+def test_port_index_finds_ipv6_listener():
+    try:
+        server = listen(socket.AF_INET6, "::1")
+    except OSError:
+        pytest.skip("::1 niet beschikbaar")
+    with server:
+        port = server.getsockname()[1]
+        assert procfs.PortIndex.scan([port]).pids_for([port]) == {os.getpid()}
+
+
+def test_port_index_ignores_free_port():
+    with listen(socket.AF_INET, "127.0.0.1") as server:
+        port = server.getsockname()[1]
+    index = procfs.PortIndex.scan([port])
+    assert index.pids_for([port]) == set()
+    assert index.conflicts([port]) == {}
+
+
+def test_descendants_include_spawned_child():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        table = procfs.ProcessTable.scan()
+        assert child.pid in table.descendants([os.getpid()])
+        assert os.getpid() not in table.descendants([os.getpid()], include_roots=False)
+    finally:
+        child.kill()
+        child.wait()
@@ -0,0 +1,63 @@
+import socket
+import threading
+import time
+
+import readiness
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def listen_later(port, delay):
+    """Start na delay seconden een listener op port; geeft (thread, servers) terug."""
+    servers = []
+    
+    def run():
+        time.sleep(delay)
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("127.0.0.1", port))
+        server.listen()
+        servers.append(server)
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, servers
+
+
+def test_delayed_listener_is_ready():
+    port = free_port()
+    thread, servers = listen_later(port, 0.3)
+    try:
+        started = time.monotonic()
+        results = readiness.wait_for_apps({"web": [(port, "tcp")]}, timeout=10.0)
+        assert results["web"].ready
+        assert results["web"].pending == []
+        assert results["web"].ready_at - started >= 0.3
+    finally:
+        thread.join()
+        for server in servers:
+            server.close()
+
+
+def test_timeout_reports_pending_port():
+    port = free_port()
+    started = time.monotonic()
+    results = readiness.wait_for_apps({"web": [(port, "tcp")]}, timeout=0.5)
+    assert not results["web"].ready
+    assert results["web"].pending == [port]
+    assert time.monotonic() - started < 5.0
+
+
+def test_cancel_stops_waiting():
+    port = free_port()
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    started = time.monotonic()
+    results = readiness.wait_for_apps({"web": [(port, "tcp")]}, timeout=60.0, cancel=cancel)
+    assert not results["web"].ready
+    assert results["web"].pending == [port]
+    assert time.monotonic() - started < 5.0
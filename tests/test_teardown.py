@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import procfs
+from teardown import Teardown
+
+SLEEP = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def spawn(**kwargs):
+    return subprocess.Popen(SLEEP, **kwargs)
+
+
+def test_foreign_port_owner_keeps_its_process_group():
+    leader = spawn(process_group=0)
+    owner = spawn(process_group=leader.pid)
+    try:
+        result = Teardown(set(), foreign={owner.pid}).finish(timeout=2.0)
+        assert owner.wait(timeout=2.0) is not None
+        assert result.survivors == set()
+        # De rest van de vreemde procesgroep blijft leven
+        assert procfs.is_alive(leader.pid)
+    finally:
+        for process in (leader, owner):
+            process.kill()
+            process.wait()
+
+
+def test_tree_process_group_is_signalled():
+    leader = spawn(process_group=0)
+    member = spawn(process_group=leader.pid)
+    try:
+        # member is geen deel van de boom, maar zit in de groep van een boomproces
+        teardown = Teardown({leader.pid})
+        assert teardown.pgids == {leader.pid}
+        teardown.finish(timeout=2.0)
+        assert leader.wait(timeout=2.0) is not None
+        assert member.wait(timeout=2.0) is not None
+    finally:
+        for process in (leader, member):
+            process.kill()
+            process.wait()
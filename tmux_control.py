@@ -0,0 +1,228 @@
+"""
+Persistente tmux control-mode client (`tmux -C`).
+Commando's worden over één verbinding gepipelined in plaats van per commando te forken.
+"""
+
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque
+
+import commandlog
+import tracing
+
+
+class TmuxError(Exception):
+    """Fout bij communicatie met tmux."""
+
+
+class CommandResult:
+    """Resultaat van één tmux commando."""
+    
+    def __init__(self, ok, lines):
+        self.ok = ok
+        self.lines = lines
+    
+    @property
+    def output(self):
+        return "\n".join(self.lines)
+    
+    def __repr__(self):
+        return f"CommandResult(ok={self.ok}, lines={self.lines!r})"
+
+
+class _Request:
+    """Eén regel op de control-verbinding: een lijst commando's gescheiden door ';'."""
+    
+    def __init__(self, expected):
+        self.expected = expected
+        self.results = []
+        self.done = threading.Event()
+    
+    def add(self, result):
+        self.results.append(result)
+        # tmux stopt een commandolijst bij de eerste fout
+        if not result.ok or len(self.results) >= self.expected:
+            self.done.set()
+
+
+class TmuxControlClient:
+    """Langlevende `tmux -C` verbinding die eigendom is van de applicatie.
+    
+    De client hangt aan een eigen verborgen sessie zodat hij ook werkt als er
+    nog geen andere sessies zijn. Die sessie wordt opgeruimd zodra de client
+    loskoppelt (destroy-unattached).
+    """
+    
+    SESSION = "_woddex-control"
+    TIMEOUT = 10.0  # seconden
+    
+    def __init__(self):
+        self._proc = None
+        self._reader = None
+        self._pending = deque()
+        self._lock = threading.Lock()
+        # Commando's die na elke (her)verbinding opnieuw uitgevoerd worden (bijv. hooks)
+        self.startup_commands = []
+    
+    @staticmethod
+    def format_command(args):
+        """Zet een argumentenlijst om naar een tmux commandoregel."""
+        return " ".join(shlex.quote(str(arg)) for arg in args)
+    
+    def _start(self):
+        self._proc = commandlog.popen(
+            [
+                "tmux", "-C", "new-session", "-A", "-s", self.SESSION, "cat",
+                ";", "set-option", "-t", self.SESSION, "destroy-unattached", "on",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self._pending = deque()
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            args=(self._proc, self._pending),
+            name="tmux-control-reader",
+            daemon=True,
+        )
+        self._reader.start()
+        if self.startup_commands:
+            self._send([[args] for args in self.startup_commands])
+    
+    def _read_loop(self, proc, pending):
+        block = None
+        for raw_line in proc.stdout:
+            line = raw_line.rstrip("\n")
+            if block is not None:
+                if line.startswith(("%end ", "%error ")):
+                    parts = line.split(" ")
+                    if parts[1:3] == block[0]:
+                        ok = line.startswith("%end ")
+                        # Alleen blokken van onze eigen commando's (flags & 1)
+                        if block[1] and pending:
+                            request = pending[0]
+                            request.add(CommandResult(ok, block[2]))
+                            if request.done.is_set():
+                                pending.popleft()
+                        block = None
+                        continue
+                block[2].append(line)
+            elif line.startswith("%begin "):
+                parts = line.split(" ")
+                from_client = len(parts) > 3 and parts[3].isdigit() and int(parts[3]) & 1
+                block = (parts[1:3], from_client, [])
+            elif line.startswith("%exit"):
+                break
+        # Verbinding weg: laat wachtende aanvragers niet eeuwig hangen
+        while pending:
+            pending.popleft().done.set()
+    
+    def _alive(self):
+        return self._proc is not None and self._proc.poll() is None
+    
+    def _send(self, command_lists):
+        """Schrijft regels naar tmux en geeft de bijbehorende requests terug."""
+        requests = []
+        payload = []
+        for commands in command_lists:
+            request = _Request(len(commands))
+            requests.append(request)
+            self._pending.append(request)
+            payload.append(" ; ".join(self.format_command(args) for args in commands))
+        self._proc.stdin.write("\n".join(payload) + "\n")
+        self._proc.stdin.flush()
+        return requests
+    
+    def _run_fallback(self, command_lists):
+        """Zonder control-mode: één `tmux` proces per commandolijst."""
+        all_results = []
+        for commands in command_lists:
+            argv = ["tmux"]
+            for index, args in enumerate(commands):
+                if index:
+                    argv.append(";")
+                argv.extend(str(arg) for arg in args)
+            result = commandlog.run(argv, capture_output=True, text=True, check=False)
+            if result.returncode == 0:
+                # Output valt niet per commando te scheiden; hang hem aan het laatste
+                results = [CommandResult(True, []) for _ in commands[:-1]]
+                results.append(CommandResult(True, result.stdout.splitlines()))
+            else:
+                results = [CommandResult(False, result.stderr.splitlines())]
+            all_results.append(results)
+        return all_results
+    
+    def run_batch(self, command_lists):
+        """Voert meerdere commandolijsten in één round-trip uit.
+        
+        Elke commandolijst is een lijst van argumentenlijsten en wordt door tmux
+        als geheel uitgevoerd; bij een fout worden de resterende commando's in
+        die lijst overgeslagen. Geeft per commandolijst de resultaten terug.
+        """
+        if not command_lists:
+            return []
+        started = time.time()
+        start = time.perf_counter()
+        # Span per round-trip, genoemd naar het eerste commando ("tmux list-panes")
+        with tracing.span(f"tmux {command_lists[0][0][0]}", "tmux", commands=sum(map(len, command_lists))):
+            with self._lock:
+                try:
+                    if not self._alive():
+                        self._start()
+                    requests = self._send(command_lists)
+                except (OSError, ValueError):
+                    self.close()
+                    return self._run_fallback(command_lists)
+            for request in requests:
+                if not request.done.wait(self.TIMEOUT):
+                    self.close()
+                    raise TmuxError("Geen antwoord van tmux control-mode")
+        duration = time.perf_counter() - start
+        for commands, request in zip(command_lists, requests):
+            commandlog.record_control(commands, request.results, started, duration)
+        return [request.results for request in requests]
+    
+    def run_list(self, commands):
+        """Voert een commandolijst uit; stopt bij de eerste fout."""
+        return self.run_batch([commands])[0]
+    
+    @staticmethod
+    def list_ok(commands, results):
+        """True als alle commando's uit de lijst zijn gelukt."""
+        return len(results) == len(commands) and all(result.ok for result in results)
+    
+    @staticmethod
+    def list_error(results):
+        """Foutmelding van het commando waarop een lijst is gestopt."""
+        for result in results:
+            if not result.ok:
+                return result.output
+        return ""
+    
+    def run(self, *args):
+        """Voert één tmux commando uit."""
+        results = self.run_list([list(args)])
+        if not results:
+            return CommandResult(False, ["tmux control-mode verbinding verbroken"])
+        return results[0]
+    
+    def close(self):
+        """Sluit de verbinding; de verborgen sessie ruimt zichzelf op."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
@@ -0,0 +1,215 @@
+"""
+Spans voor het traceren van operaties (starten, stoppen, verversen, branch).
+span() meet een fase op de huidige thread; geneste spans vormen een stapel per
+thread. Afgeronde spans gaan in een ringbuffer en zijn te exporteren als Chrome
+trace_event JSON (te openen in chrome://tracing of ui.perfetto.dev).
+StallWatchdog meldt wanneer de GUI event loop langer dan een drempel niet aan
+de beurt komt, met de spans die op dat moment op de GUI thread actief waren.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Aantal bewaarde afgeronde spans
+MAX_SPANS = 20000
+
+# Standaard drempel voor een hapering van de event loop
+STALL_THRESHOLD_MS = 50
+
+MAX_STALLS = 200
+
+
+class Span:
+    """Eén gemeten fase; start en end in time.perf_counter seconden."""
+    
+    __slots__ = ("name", "category", "start", "end", "thread_id", "args")
+    
+    def __init__(self, name, category, start, thread_id, args):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.thread_id = thread_id
+        self.args = args
+    
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Stall:
+    """Periode waarin de event loop niet aan de beurt kwam."""
+    
+    __slots__ = ("start", "duration", "spans")
+    
+    def __init__(self, start, duration, spans):
+        self.start = start
+        self.duration = duration
+        # Namen van de actieve spans (buitenste eerst) tijdens de hapering
+        self.spans = spans
+    
+    def describe(self):
+        where = " › ".join(self.spans) if self.spans else "buiten een span"
+        return f"event loop {self.duration * 1000:.0f} ms geblokkeerd ({where})"
+
+
+class Tracer:
+    """Thread-safe verzameling van spans en haperingen."""
+    
+    def __init__(self, max_spans=MAX_SPANS):
+        self._lock = threading.Lock()
+        self.spans = deque(maxlen=max_spans)
+        self.stalls = deque(maxlen=MAX_STALLS)
+        # {thread ident: stapel actieve spans}; alleen de eigen thread wijzigt zijn stapel
+        self._active = {}
+        self._thread_names = {}
+        self.origin = time.perf_counter()
+    
+    @contextlib.contextmanager
+    def span(self, name, category="operation", **args):
+        """Meet het blok als span `name`; ook bruikbaar als decorator."""
+        thread = threading.current_thread()
+        stack = self._active.setdefault(thread.ident, [])
+        self._thread_names[thread.ident] = thread.name
+        span = Span(name, category, time.perf_counter(), thread.ident, args)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            if not stack:
+                self._active.pop(thread.ident, None)
+            with self._lock:
+                self.spans.append(span)
+    
+    def active(self, thread_id):
+        """Namen van de actieve spans van een thread, buitenste eerst."""
+        return [span.name for span in list(self._active.get(thread_id, ()))]
+    
+    def add_stall(self, stall):
+        with self._lock:
+            self.stalls.append(stall)
+    
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.stalls.clear()
+    
+    def chrome_trace(self):
+        """Alle spans en haperingen als Chrome trace_event JSON (dict)."""
+        with self._lock:
+            spans = list(self.spans)
+            stalls = list(self.stalls)
+        pid = os.getpid()
+        
+        def micros(moment):
+            return round((moment - self.origin) * 1e6, 1)
+        
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": name}}
+            for thread_id, name in list(self._thread_names.items())
+        ]
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": micros(span.start),
+                "dur": round(span.duration * 1e6, 1),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {key: str(value) for key, value in span.args.items()},
+            })
+        main_thread = threading.main_thread().ident
+        for stall in stalls:
+            events.append({
+                "name": "hapering",
+                "cat": "stall",
+                "ph": "X",
+                "ts": micros(stall.start),
+                "dur": round(stall.duration * 1e6, 1),
+                "pid": pid,
+                "tid": main_thread,
+                "args": {"spans": " › ".join(stall.spans)},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+TRACER = Tracer()
+
+
+def span(name, category="operation", **args):
+    """Contextmanager (of decorator) die een fase als span meet."""
+    return TRACER.span(name, category, **args)
+
+
+class StallWatchdog:
+    """Detecteert haperingen van de event loop van de thread die hem aanmaakt.
+    
+    De event loop roept beat() aan via een timer (elke interval_ms). Een eigen
+    thread kijkt of de laatste beat te lang geleden is en legt dan de actieve
+    spans van de bewaakte thread vast; die zijn na afloop van de hapering al
+    weg. beat() meldt de hapering zodra de event loop weer draait.
+    """
+    
+    def __init__(self, tracer=TRACER, threshold_ms=STALL_THRESHOLD_MS, on_stall=None):
+        self.tracer = tracer
+        self.threshold = threshold_ms / 1000
+        self.on_stall = on_stall or self.log_stall
+        self.thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        # Actieve spans tijdens de lopende hapering (gezet door de watchdog thread)
+        self._spans = []
+        self._spans_lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+    
+    @property
+    def interval_ms(self):
+        # Beats ruim binnen de drempel, zodat de timer zelf geen hapering lijkt
+        return max(5, int(self.threshold * 1000 / 2))
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        self._last_beat = time.perf_counter()
+        self._spans = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, args=(self._stop,), name="stall-watchdog", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread = None
+    
+    def beat(self):
+        now = time.perf_counter()
+        # Vertraging bovenop het verwachte interval
+        late = now - self._last_beat - self.interval_ms / 1000
+        with self._spans_lock:
+            spans, self._spans = self._spans, []
+        if late > self.threshold:
+            stall = Stall(now - late, late, spans)
+            self.tracer.add_stall(stall)
+            self.on_stall(stall)
+        self._last_beat = now
+    
+    def _watch(self, stop):
+        while not stop.wait(self.interval_ms / 1000):
+            if time.perf_counter() - self._last_beat - self.interval_ms / 1000 > self.threshold:
+                # Diepste stapel tijdens de hapering bewaren
+                spans = self.tracer.active(self.thread_id)
+                with self._spans_lock:
+                    if len(spans) >= len(self._spans):
+                        self._spans = spans
+    
+    @staticmethod
+    def log_stall(stall):
+        print(f"woddex-control: {stall.describe()}", file=sys.stderr, flush=True)
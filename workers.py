@@ -0,0 +1,52 @@
+"""
+Achtergrond-uitvoering voor de Tmux Manager applicatie.
+Blokkerende operaties (tmux, git, gh, lsof) draaien in een QThreadPool en
+melden voortgang en resultaat via signals terug aan de GUI thread.
+"""
+
+import contextlib
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+import commandlog
+import tracing
+
+# OperationError hoort bij de Qt-vrije kern; hier opnieuw geëxporteerd
+from core import OperationError
+
+
+class WorkerSignals(QObject):
+    """Signals van een Worker; worden op de GUI thread afgeleverd."""
+    progress = Signal(str)
+    finished = Signal(object)
+    failed = Signal(str)
+
+
+class Worker(QRunnable):
+    """Voert fn(*args, progress=callback) uit op een thread uit de pool.
+    
+    fn mag geen widgets aanraken: voortgang gaat via de progress callback en
+    fouten via een OperationError. Met trace=(naam, args) draait het werk binnen
+    een operatie-span met die naam (bijv. kill_app), op deze thread zodat alle
+    spans van fn eronder vallen.
+    """
+    
+    def __init__(self, fn, *args, trace=None):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.trace = trace
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        operation = tracing.span(self.trace[0], **self.trace[1]) if self.trace else contextlib.nullcontext()
+        try:
+            # Externe commando's tellen mee onder de naam van de operatie (zie commandlog.py)
+            with commandlog.operation(self.fn.__name__), operation, tracing.span(self.fn.__name__, "worker"):
+                result = self.fn(*self.args, progress=self.signals.progress.emit)
+        except OperationError as e:
+            self.signals.failed.emit(str(e))
+        except Exception as e:
+            self.signals.failed.emit(f"Onverwachte fout:\n{str(e)}")
+        else:
+            self.signals.finished.emit(result)
@@ -0,0 +1,143 @@
+"""
+Git worktrees voor nieuwe branches.
+Een branch krijgt een eigen map naast de repository, zodat de `nx serve` sessies
+in de hoofdmap niet door een branch-wissel opnieuw hoeven te bouwen.
+"""
+
+import os
+from pathlib import Path
+
+import commandlog
+
+# Paden uit de hoofdmap die in een nieuwe worktree als symlink gedeeld worden:
+# node_modules (anders moet elke worktree opnieuw installeren) en de nx cache
+SHARED_PATHS = ("node_modules", ".nx/cache")
+
+
+class WorktreeError(Exception):
+    """Git worktree commando mislukt."""
+
+
+class Worktree:
+    """Eén worktree uit `git worktree list --porcelain`."""
+    
+    def __init__(self, path, head=None, branch=None, is_main=False):
+        self.path = Path(path)
+        self.head = head
+        # Korte branchnaam (zonder refs/heads/), None bij een detached HEAD
+        self.branch = branch
+        self.is_main = is_main
+    
+    def describe(self):
+        return f"{self.branch or '(detached)'} — {self.path}"
+
+
+def _git(args, cwd, error_message):
+    result = commandlog.run(
+        ["git", *args],
+        cwd=str(cwd),
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise WorktreeError(f"{error_message}:\n{result.stderr}")
+    return result.stdout
+
+
+def parse_porcelain(output):
+    """Parse `git worktree list --porcelain`; de eerste worktree is de hoofdmap."""
+    worktrees = []
+    current = None
+    for line in output.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            current = Worktree(value, is_main=not worktrees)
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif key == "HEAD":
+            current.head = value
+        elif key == "branch":
+            current.branch = value.removeprefix("refs/heads/")
+    return worktrees
+
+
+def list_worktrees(repo_dir):
+    """Alle worktrees van de repository (hoofdmap eerst)."""
+    return parse_porcelain(_git(["worktree", "list", "--porcelain"], repo_dir, "Kon worktrees niet ophalen"))
+
+
+def worktrees_root(repo_dir):
+    """Map voor de worktrees: naast de repository (~/dev/nea -> ~/dev/nea-worktrees)."""
+    repo_dir = Path(repo_dir)
+    return repo_dir.parent / f"{repo_dir.name}-worktrees"
+
+
+def worktree_path(repo_dir, branch_name):
+    """Map van de worktree voor een branch (slashes in de naam worden '-')."""
+    return worktrees_root(repo_dir) / branch_name.replace("/", "-")
+
+
+def add_worktree(repo_dir, branch_name, base="origin/develop", share=True):
+    """Maakt branch_name vanaf base in een eigen worktree; geeft het pad terug.
+    
+    Met share worden SHARED_PATHS uit de hoofdmap gesymlinkt (als ze bestaan).
+    """
+    repo_dir = Path(repo_dir)
+    path = worktree_path(repo_dir, branch_name)
+    if path.exists():
+        raise WorktreeError(f"Worktree map bestaat al: {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _git(
+        ["worktree", "add", "-b", branch_name, str(path), base],
+        repo_dir,
+        f"Kon worktree voor '{branch_name}' niet aanmaken"
+    )
+    if share:
+        share_paths(repo_dir, path)
+    return path
+
+
+def share_paths(repo_dir, path):
+    """Symlinkt SHARED_PATHS uit de hoofdmap naar een worktree en sluit ze uit voor git."""
+    shared = []
+    for relative in SHARED_PATHS:
+        source = Path(repo_dir) / relative
+        target = Path(path) / relative
+        if not source.exists() or target.exists() or target.is_symlink():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.symlink(source, target, target_is_directory=True)
+        shared.append(relative)
+    if shared:
+        _exclude(repo_dir, shared)
+    return shared
+
+
+def _exclude(repo_dir, relatives):
+    # `node_modules/` in .gitignore matcht geen symlink: sluit de links expliciet uit
+    common_dir = Path(_git(["rev-parse", "--git-common-dir"], repo_dir, "Kon git map niet vinden").strip())
+    if not common_dir.is_absolute():
+        common_dir = Path(repo_dir) / common_dir
+    exclude = common_dir / "info" / "exclude"
+    existing = exclude.read_text().splitlines() if exclude.exists() else []
+    missing = [f"/{relative}" for relative in relatives if f"/{relative}" not in existing]
+    if missing:
+        exclude.parent.mkdir(parents=True, exist_ok=True)
+        with open(exclude, "a") as handle:
+            handle.write("".join(f"{line}\n" for line in missing))
+
+
+def rebase_dir(directory, repo_dir, worktree_dir):
+    """Zet een map binnen de repository om naar dezelfde map in een worktree.
+    
+    Mappen buiten de repository blijven ongewijzigd.
+    """
+    directory = Path(directory).expanduser().resolve()
+    repo_dir = Path(repo_dir).expanduser().resolve()
+    try:
+        relative = directory.relative_to(repo_dir)
+    except ValueError:
+        return str(directory)
+    return str(Path(worktree_dir) / relative)